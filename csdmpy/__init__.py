@@ -1,26 +1,47 @@
 """The data model build on the Core Scientific Dataset Model."""
+import asyncio
 import datetime
+import functools
 import json
+from concurrent import futures
 from urllib.parse import urlparse
 
 import numpy as np
 
+from .cache import DatasetCache  # lgtm [py/import-own-module] # NOQA
+from .catalog import Catalog  # lgtm [py/import-own-module] # NOQA
+from .compression import open_file  # lgtm [py/import-own-module] # NOQA
+from .container import is_container  # lgtm [py/import-own-module] # NOQA
+from .container import read_container  # lgtm [py/import-own-module] # NOQA
 from .csdm import as_dependent_variable  # lgtm [py/import-own-module] # NOQA
 from .csdm import as_dimension  # lgtm [py/import-own-module] # NOQA
 from .csdm import CSDM  # lgtm [py/import-own-module] # NOQA
 from .csdm import DependentVariable  # lgtm [py/import-own-module] # NOQA
 from .csdm import Dimension  # lgtm [py/import-own-module] # NOQA
+from .csdm import empty_dependent_variable  # lgtm [py/import-own-module] # NOQA
 from .csdm import LabeledDimension  # lgtm [py/import-own-module] # NOQA
 from .csdm import LinearDimension  # lgtm [py/import-own-module] # NOQA
 from .csdm import MonotonicDimension  # lgtm [py/import-own-module] # NOQA
 from .dependent_variable import download  # lgtm [py/import-own-module] # NOQA
+from .dependent_variable.virtual import (
+    VirtualComponents,
+)  # lgtm [py/import-own-module] # NOQA
 from .helper_functions import _preview  # lgtm [py/import-own-module] # NOQA
 from .numpy_wrapper import apodize  # lgtm [py/import-own-module] # NOQA
+from .scanner import scan  # lgtm [py/import-own-module] # NOQA
 from .tests import *  # lgtm [py/import-own-module] # NOQA
 from .units import ScalarQuantity  # lgtm [py/import-own-module] # NOQA
 from .units import string_to_quantity  # lgtm [py/import-own-module] # NOQA
+from .utils import _async_executor  # lgtm [py/import-own-module] # NOQA
 from .utils import QuantityType  # lgtm [py/import-own-module] # NOQA
 from .utils import validate  # lgtm [py/import-own-module] # NOQA
+from .writer import AppendWriter  # lgtm [py/import-own-module] # NOQA
+
+try:
+    from multiprocessing import resource_tracker
+    from multiprocessing import shared_memory
+except ImportError:  # python 3.7
+    shared_memory = None
 
 now = datetime.datetime.now()
 year = now.year
@@ -37,6 +58,10 @@ __version__ = "0.6.dev2"
 __all__ = [
     "parse_dict",
     "load",
+    "load_metadata",
+    "load_many",
+    "aload",
+    "open_virtual",
     "loads",
     "new",
     "as_csdm",
@@ -46,11 +71,16 @@ __all__ = [
 ]
 
 
-def _import_json(filename, verbose=False):
+def _import_json(filename, verbose=False, stream=False, components=True, mmap=False):
     res = urlparse(filename)
     if res[0] not in ["file", ""]:
         filename = download.download_file_from_url(filename, verbose)
-    with open(filename, "rb") as f:
+    if is_container(filename):
+        return read_container(filename, components, mmap)
+    if stream or not components:
+        with open_file(filename, "rt", encoding="UTF-8") as f:
+            return scan(f, components)
+    with open_file(filename, "rb") as f:
         content = f.read()
         return json.loads(str(content, encoding="UTF-8"))
 
@@ -112,10 +142,21 @@ def parse_dict(dictionary):
     return CSDM(filename=filename, **csdm_dict)
 
 
-def load(filename=None, application=False, verbose=False):
+def load(
+    filename=None,
+    application=False,
+    verbose=False,
+    mmap=False,
+    lazy=False,
+    stream=False,
+    region=None,
+    cache=False,
+):
     r"""Loads a .csdf/.csdfe file and returns an instance of the :ref:`csdm_api` class.
 
-    The file must be a JSON serialization of the CSD Model.
+    The file must be a JSON serialization of the CSD Model, or a `.csdfb` binary
+    container written by :meth:`~csdmpy.CSDM.save`. A file compressed with gzip,
+    xz, or bz2, for example, `file.csdf.gz`, is decompressed as it is read.
 
     Example:
         >>> data1 = cp.load('local_address/file.csdf') # doctest: +SKIP
@@ -127,6 +168,31 @@ def load(filename=None, application=False, verbose=False):
                 last serialized the file will be imported. Default is False.
         verbose (bool): If the filename is a URL, this option will show the progress
                 bar for the file download status, when True.
+        mmap (bool): If true, the components of the external dependent variables with
+                a local `file:` url are memory-mapped as read-only numpy arrays
+                instead of being read into memory. Only the pages of the binary file
+                that are accessed are read from the disk. The components of a binary
+                container are likewise memory-mapped. Default is False.
+        lazy (bool): If true, the components of the dependent variables are decoded
+                on their first access rather than at load. Loading the file then
+                only parses the metadata, and the external binary files are not opened
+                until the components are accessed. Default is False.
+        stream (bool): If true, the file is read in chunks, and the components of
+                the internal dependent variables are decoded as they are read,
+                without first loading the complete JSON document in memory. This
+                reduces the peak memory when loading large files. Default is False.
+        region (dict): An optional dictionary of the dimension index to an integer or
+                a slice, for example, ``{0: slice(1000, 2000), 2: 5}``, selecting a
+                sub-grid of the dataset. The returned CSDM object is the equivalent
+                of ``csdm[1000:2000, :, 5]``. The components of the external
+                dependent variables in local binary files are loaded lazily, and only
+                the bytes of the sub-grid are read from the file. Default is None.
+        cache: If true, the dataset is loaded through the in-process cache shared
+                by the loads, see :class:`~csdmpy.DatasetCache`, or through the given
+                DatasetCache instance. The cached dataset is fully decoded, and the
+                returned CSDM object shares its read-only components arrays. The
+                `lazy` argument is then ignored, and the `region` is sliced from the
+                cached dataset. Default is False.
 
     Returns:
         A CSDM instance.
@@ -134,10 +200,40 @@ def load(filename=None, application=False, verbose=False):
     if filename is None:
         raise Exception("Missing the value for the required `filename` attribute.")
 
-    dictionary = _import_json(filename, verbose)
+    if cache is not False:
+        cache = DatasetCache.default() if cache is True else cache
+        csdm_object = cache.load(
+            load, filename, verbose, application=application, mmap=mmap, stream=stream
+        )
+        return csdm_object if region is None else _load_region(csdm_object, region)
+    return _load(filename, filename, application, verbose, mmap, lazy, stream, region)
+
+
+def _load(
+    filename,
+    source,
+    application=False,
+    verbose=False,
+    mmap=False,
+    lazy=False,
+    stream=False,
+    region=None,
+):
+    """Return the CSDM object of the file at the source, that is, the filename or a
+    downloaded copy of the filename. The relative `components_url` of the external
+    dependent variables are resolved against the filename."""
+    dictionary = _import_json(source, verbose, stream, mmap=mmap)
     dictionary["filename"] = filename
+    # the components are decoded after parsing, see _decode_components.
+    for item in dictionary.get("csdm", {}).get("dependent_variables", []):
+        item.update({"mmap": mmap, "lazy": True})
     csdm_object = parse_dict(dictionary)
 
+    if region is not None:
+        csdm_object = _load_region(csdm_object, region)
+    elif not lazy:
+        _decode_components(csdm_object)
+
     if application is False:
         csdm_object.application = None
         for dim in csdm_object.dimensions:
@@ -154,6 +250,425 @@ def load(filename=None, application=False, verbose=False):
     return csdm_object
 
 
+def load_metadata(filename=None, verbose=False):
+    r"""Return the metadata of a .csdf/.csdfe file as a python dictionary.
+
+    The dictionary has the same layout as the :meth:`~csdmpy.CSDM.dict` method of a
+    :ref:`csdm_api` instance, without the `components` key of the dependent
+    variables. The components are skipped over while reading the file, without
+    decoding, and the files at the `components_url` of the external dependent
+    variables are not opened.
+
+    Example:
+        >>> meta = cp.load_metadata('local_address/file.csdf') # doctest: +SKIP
+        >>> [dim['count'] for dim in meta['csdm']['dimensions']] # doctest: +SKIP
+        [1024, 256]
+
+    Args:
+        filename (str): A local or a remote address to the `.csdf or `.csdfe` file.
+        verbose (bool): If the filename is a URL, this option will show the progress
+                bar for the file download status, when True.
+
+    Returns:
+        A python dictionary.
+    """
+    if filename is None:
+        raise Exception("Missing the value for the required `filename` attribute.")
+
+    dictionary = _import_json(filename, verbose, components=False)
+    _check_csdm_root_key_value(dictionary)
+    return dictionary
+
+
+def _decode_components(csdm_object):
+    """Decode the lazy components of the dependent variables. The components of
+    multiple dependent variables are decoded concurrently, such that the remote
+    `components_url` are fetched in parallel, with up to MAX_CONNECTIONS threads."""
+    variables = [item.subtype for item in csdm_object.dependent_variables]
+    variables = [item for item in variables if item.is_lazy()]
+    if len(variables) < 2:
+        for item in variables:
+            # accessing the components decodes them.
+            item._components
+        return
+
+    workers = min(download.MAX_CONNECTIONS, len(variables))
+    with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        _ = list(pool.map(lambda item: item._components, variables))
+
+
+def _load_region(csdm_object, region):
+    """Return the sub-grid of the CSDM object at the region, a dictionary of the
+    dimension index to an integer or slice."""
+    size = len(csdm_object.dimensions)
+    for i in region:
+        if not -size <= i < size:
+            raise IndexError(f"The dimension index {i} is out of range for {size}D.")
+    region = {i % size: item for i, item in region.items()}
+    indices = tuple(region.get(i, slice(None)) for i in range(size))
+    sub_csdm = csdm_object[indices]
+
+    # do not keep the components array of the whole grid alive through a view.
+    for variable in sub_csdm.dependent_variables:
+        base = variable.components.base
+        if base is not None and base.nbytes > variable.components.nbytes:
+            variable.components = variable.components.copy()
+    return sub_csdm
+
+
+async def aload(filename=None, executor=None, **kwargs):
+    r"""Coroutine of :func:`~csdmpy.load`.
+
+    A remote http or https file is downloaded to the download cache with
+    asynchronous http requests, which do not block the event loop or a thread, such
+    that the number of concurrent downloads is not bounded by the threads of the
+    executor. The file is then read and decoded in a thread of the executor. The
+    remote `components_url` of the external dependent variables, and the files
+    loaded through the `cache`, are fetched in the thread with blocking requests.
+    Many files are loaded by gathering the coroutines, which share the threads of
+    the default executor.
+
+    Example:
+        >>> data = await cp.aload('url_address/file.csdf') # doctest: +SKIP
+        >>> files = ['file1.csdf', 'file2.csdfe'] # doctest: +SKIP
+        >>> data1, data2 = await asyncio.gather(*map(cp.aload, files)) # doctest: +SKIP
+
+    Args:
+        filename (str): A local or a remote address to the `.csdf or `.csdfe` file.
+        executor: An optional `concurrent.futures` executor. The default is a thread
+                pool, shared by the coroutines of csdmpy, with at most ASYNC_WORKERS
+                threads.
+        kwargs: The keyword arguments of :func:`~csdmpy.load`.
+
+    Returns:
+        A CSDM instance.
+    """
+    executor = _async_executor() if executor is None else executor
+    remote = isinstance(filename, str) and urlparse(filename)[0] in ["http", "https"]
+    if remote and kwargs.get("cache", False) is False:
+        kwargs.pop("cache", None)
+        cache = download.DownloadCache()
+        source = await cache.aget(filename, kwargs.get("verbose", False))
+        task = functools.partial(_load, filename, source, **kwargs)
+    else:
+        task = functools.partial(load, filename, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(executor, task)
+
+
+# minimum size, in bytes, of the components returned by the worker processes of
+# `load_many` through shared memory, instead of pickling.
+SHARED_MEMORY_MIN_SIZE = 2**16
+
+
+def load_many(filenames, workers=None, executor="thread", as_completed=False, **kwargs):
+    r"""Load a list of .csdf/.csdfe files in parallel.
+
+    The files are loaded with :func:`~csdmpy.load` in a pool of threads or processes.
+    A file that fails to load does not stop the remaining files, instead, the
+    exception raised while loading the file is returned in place of the CSDM object.
+
+    With the ``process`` executor, the component arrays larger than
+    SHARED_MEMORY_MIN_SIZE bytes are handed back from the worker processes through
+    shared memory rather than being pickled (python 3.8 and later). The components
+    are always loaded in full by the worker processes, that is, the `lazy` and `mmap`
+    arguments have no effect.
+
+    Example:
+        >>> files = ['file1.csdf', 'file2.csdfe'] # doctest: +SKIP
+        >>> data1, data2 = cp.load_many(files, workers=4) # doctest: +SKIP
+
+    Args:
+        filenames (list): A list of local or remote addresses to the files.
+        workers (int): The maximum number of threads or processes. The default is
+                chosen by the `concurrent.futures` executor.
+        executor (str): The pool, either ``thread`` or ``process``. The default is
+                ``thread``.
+        as_completed (bool): If true, return a generator of `(index, result)`
+                tuples, in the order the files are loaded, where `index` is the
+                position of the file in `filenames`. The files are submitted on the
+                first iteration, and closing the generator, or breaking out of a
+                loop over it, cancels the remaining files. Default is False.
+        kwargs: The keyword arguments of :func:`~csdmpy.load`.
+
+    Returns:
+        A list of CSDM instances or exceptions, in the order of `filenames`, or a
+        generator when `as_completed` is true.
+    """
+    executors = {
+        "thread": futures.ThreadPoolExecutor,
+        "process": futures.ProcessPoolExecutor,
+    }
+    if executor not in executors:
+        raise ValueError(
+            f"The value, `{executor}`, is an invalid `executor`. The allowed values "
+            "are 'thread' and 'process'."
+        )
+    filenames = list(filenames)
+    shared = executor == "process" and shared_memory is not None
+    results = _load_many_results(
+        executors[executor], workers, filenames, shared, kwargs
+    )
+
+    if as_completed:
+        return results
+    csdm_objects = [None] * len(filenames)
+    for i, result in results:
+        csdm_objects[i] = result
+    return csdm_objects
+
+
+def _load_many_results(pool_class, workers, filenames, shared, kwargs):
+    """Yield the (index, result) tuples of the files as they are loaded.
+
+    The pool is created, and the files are submitted, on the first iteration. When
+    the generator is closed, including before it is exhausted, the pending jobs are
+    cancelled, the pool is shut down, and the shared memory of the loaded files that
+    were not yielded is released.
+
+    Args:
+        pool_class: The `concurrent.futures` executor class.
+        workers: The maximum number of workers of the pool.
+        filenames: The list of the files.
+        shared: If true, load the files with `_load_to_shared_memory`.
+        kwargs: The keyword arguments of :func:`~csdmpy.load`.
+    """
+    task = _load_to_shared_memory if shared else load
+    pool = pool_class(max_workers=workers)
+    jobs = {}
+    try:
+        for i, item in enumerate(filenames):
+            jobs[pool.submit(task, item, **kwargs)] = i
+        for job in futures.as_completed(list(jobs)):
+            index = jobs.pop(job)
+            try:
+                result = _from_shared_memory(*job.result()) if shared else job.result()
+            except Exception as error:
+                result = error
+            yield index, result
+    finally:
+        for job in jobs:
+            job.cancel()
+        pool.shutdown(wait=True)
+        for job in jobs:
+            if shared and not job.cancelled() and job.exception() is None:
+                _release_shared_memory(job.result()[1])
+
+
+def _load_to_shared_memory(filename, **kwargs):
+    """Load the file in a worker process and move the components larger than
+    SHARED_MEMORY_MIN_SIZE bytes to shared memory blocks.
+
+    Returns:
+        A tuple of the CSDM object, without the moved components, and a list of
+        `(index, name, shape, dtype)` tuples, one for each moved component array,
+        where `index` is the index of the dependent variable.
+    """
+    csdm_object = load(filename, **kwargs)
+    blocks, shared = [], []
+    try:
+        for i, variable in enumerate(csdm_object.dependent_variables):
+            components = variable.components
+            if components.nbytes < SHARED_MEMORY_MIN_SIZE:
+                continue
+            block = shared_memory.SharedMemory(create=True, size=components.nbytes)
+            blocks.append(block)
+            # the parent process owns and unlinks the block.
+            resource_tracker.unregister(block._name, "shared_memory")
+            array = np.ndarray(components.shape, components.dtype, buffer=block.buf)
+            array[...] = components
+            del array
+            shared.append((i, block.name, components.shape, components.dtype.str))
+            variable.subtype._components = np.empty(0, dtype=components.dtype)
+    except Exception:
+        for block in blocks:
+            block.close()
+            block.unlink()
+        raise
+
+    for block in blocks:
+        block.close()
+    return csdm_object, shared
+
+
+def _from_shared_memory(csdm_object, shared):
+    """Copy the components moved to shared memory by `_load_to_shared_memory` back
+    to the dependent variables of the CSDM object, and release the shared memory."""
+    error = None
+    for i, name, shape, dtype in shared:
+        block = shared_memory.SharedMemory(name=name)
+        try:
+            array = np.ndarray(shape, dtype, buffer=block.buf)
+            csdm_object.dependent_variables[i].subtype._components = array.copy()
+            del array
+        except Exception as exception:
+            error = exception
+        block.close()
+        block.unlink()
+    if error is not None:
+        raise error
+    return csdm_object
+
+
+def _release_shared_memory(shared):
+    """Release the shared memory blocks of the components moved by
+    `_load_to_shared_memory`, without reading them."""
+    for _, name, _, _ in shared:
+        try:
+            block = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            continue
+        block.close()
+        block.unlink()
+
+
+def open_virtual(paths, dimension, verbose=False):
+    r"""Return a CSDM object, concatenating the datasets of the files along a
+    dimension, without reading the components of the datasets.
+
+    The datasets must have identical dimensions, except for the concatenated
+    dimension, and identical dependent variables, except for the components. The
+    concatenated dimension is a linear dimension, when the datasets have linear
+    dimensions, and the spacing of the coordinates continues across the datasets,
+    otherwise, a monotonic dimension, or a labeled dimension for labeled
+    dimensions.
+
+    The datasets are loaded lazily. A slice of the CSDM object reads only the
+    sections of the files that the slice spans, and the `sum`, `prod`, `max`,
+    `min`, and `mean` reductions are computed one file at a time. Accessing the
+    components reads the concatenated components in memory.
+
+    Example:
+        >>> files = [f'scan_{i}.csdfe' for i in range(48)] # doctest: +SKIP
+        >>> data = cp.open_virtual(files, dimension=2) # doctest: +SKIP
+        >>> trace = data[:, 10, 500] # doctest: +SKIP
+
+    Args:
+        paths (list): A list of the local or remote addresses of the `.csdf` or
+                `.csdfe` files, in the order of the concatenation.
+        dimension (int): The index of the concatenated dimension.
+        verbose (bool): If a filename is a URL, this option will show the progress
+                bar for the file download status, when True.
+
+    Returns:
+        A CSDM instance.
+    """
+    paths = list(paths)
+    if paths == []:
+        raise ValueError("Expecting a list of at least one file.")
+    datasets = [load(item, verbose=verbose, lazy=True) for item in paths]
+    first = datasets[0]
+    count = len(first.dimensions)
+    if not -count <= dimension < count:
+        raise IndexError(
+            f"The dimension index {dimension} is out of range for a dataset with "
+            f"{count} dimensions."
+        )
+    dimension %= count
+    for path, item in zip(paths[1:], datasets[1:]):
+        _check_virtual_dimensions(first, item, dimension, path)
+        _check_virtual_dependent_variables(first, item, path)
+
+    csdm_object = CSDM()
+    csdm_object._dimensions += [item.copy() for item in first.dimensions]
+    csdm_object._dimensions[dimension] = _concatenate_dimensions(
+        [item.dimensions[dimension] for item in datasets]
+    )
+    for i, variable in enumerate(first.dependent_variables):
+        obj = empty_dependent_variable(variable.numeric_type, variable.quantity_type)
+        obj.copy_metadata(variable)
+        parts = [item.dependent_variables[i].subtype for item in datasets]
+        # the dimension k is the axis d - k of the (p, N_{d-1}, ..., N_0) array.
+        obj.subtype._components = VirtualComponents(parts, count - dimension)
+        csdm_object._dependent_variables += [obj]
+    csdm_object.copy_metadata(first)
+    return csdm_object
+
+
+def _check_virtual_dimensions(first, other, dimension, path):
+    """Raise a ValueError if the dimensions of the dataset `other`, from the file
+    at the path, cannot be concatenated with the dimensions of the `first`
+    dataset along the dimension."""
+    if len(other.dimensions) != len(first.dimensions):
+        raise ValueError(
+            f"Expecting {len(first.dimensions)} dimensions, found "
+            f"{len(other.dimensions)} dimensions in `{path}`."
+        )
+    for i, (dim, other_dim) in enumerate(zip(first.dimensions, other.dimensions)):
+        if i != dimension and dim != other_dim:
+            raise ValueError(
+                f"The dimension at index {i} of `{path}` is not identical to the "
+                "dimension of the first dataset."
+            )
+    dim, other_dim = first.dimensions[dimension], other.dimensions[dimension]
+    if (dim.type == "labeled") != (other_dim.type == "labeled"):
+        raise ValueError(
+            f"Cannot concatenate a `{other_dim.type}` dimension of `{path}` with a "
+            f"`{dim.type}` dimension."
+        )
+    if dim.type != "labeled" and not dim.coordinates.unit.is_equivalent(
+        other_dim.coordinates.unit
+    ):
+        raise ValueError(
+            f"The unit of the dimension at index {dimension} of `{path}` is not "
+            "consistent with the unit of the first dataset."
+        )
+
+
+def _check_virtual_dependent_variables(first, other, path):
+    """Raise a ValueError if the dependent variables of the dataset `other`, from
+    the file at the path, differ from the dependent variables of the `first`
+    dataset."""
+    if len(other.dependent_variables) != len(first.dependent_variables):
+        raise ValueError(
+            f"Expecting {len(first.dependent_variables)} dependent variables, found "
+            f"{len(other.dependent_variables)} dependent variables in `{path}`."
+        )
+    for i, (item, other_item) in enumerate(
+        zip(first.dependent_variables, other.dependent_variables)
+    ):
+        attributes = ["numeric_type", "quantity_type", "unit"]
+        for attribute in attributes:
+            if getattr(item, attribute) != getattr(other_item, attribute):
+                raise ValueError(
+                    f"The `{attribute}` of the dependent variable at index {i} of "
+                    f"`{path}` is not identical to the first dataset."
+                )
+
+
+def _concatenate_dimensions(dimensions):
+    """Return the dimension concatenating the coordinates, or labels, of the
+    dimensions."""
+    first = dimensions[0]
+    metadata = dict(label=first.label, description=first.description)
+    if first.type == "labeled":
+        labels = np.concatenate([item.labels for item in dimensions]).tolist()
+        return Dimension(type="labeled", labels=labels, **metadata)
+
+    unit = first.coordinates.unit
+    values = [item.coordinates.to(unit).value for item in dimensions]
+    values = np.concatenate(values)
+    steps = np.diff(values)
+    if all(item.type == "linear" for item in dimensions):
+        increment = first.increment.to(unit).value
+        if np.allclose(steps, increment, rtol=1e-9, atol=0):
+            dimension = first.copy()
+            dimension.count = values.size
+            # the coordinates of a complex_fft dimension are centred on the count,
+            # and do not continue from the first dimension.
+            dimension.complex_fft = False
+            dimension.coordinates_offset = values[0] * unit
+            coordinates = dimension.coordinates.to(unit).value
+            if np.allclose(coordinates, values, rtol=1e-9, atol=abs(increment) * 1e-9):
+                return dimension
+
+    if not (np.all(steps > 0) or np.all(steps < 0)):
+        raise ValueError(
+            "The coordinates of the concatenated dimension are not strictly "
+            "monotonic."
+        )
+    return Dimension(type="monotonic", coordinates=values * unit, **metadata)
+
+
 def loads(string):
     """Loads a JSON serialized string as a CSDM object.
 
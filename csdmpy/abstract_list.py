@@ -1,4 +1,5 @@
 from collections.abc import MutableSequence
+from copy import deepcopy
 
 import numpy as np
 
@@ -33,6 +34,13 @@ class AbstractList(MutableSequence):
         string = ",\n".join([item.__repr__() for item in self._list])
         return f"[{string}]"
 
+    def __deepcopy__(self, memo):
+        """Deep copy the list items"""
+        new = self.__class__.__new__(self.__class__)
+        memo[id(self)] = new
+        new._list = [deepcopy(item, memo) for item in self._list]
+        return new
+
     def __len__(self):
         """List length"""
         return len(self._list)
@@ -0,0 +1,165 @@
+"""An in-process cache of the loaded datasets."""
+import os
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import numpy as np
+
+from .dependent_variable import download  # lgtm [py/import-own-module]
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["DatasetCache"]
+
+# the default maximum size, in bytes, of the components of the cached datasets.
+MAX_SIZE = 2**30
+
+
+class DatasetCache:
+    """A least recently used cache of the CSDM objects loaded with
+    :func:`~csdmpy.load`, bounded by the total size of their components.
+
+    A local file is keyed by its absolute path, and its cached dataset is valid for
+    as long as the size and the modification time of the file, and of the local
+    binary files of its external dependent variables, are unchanged. A remote file
+    is keyed by its url and its ETag, Last-Modified, and Content-Length headers,
+    through the download cache.
+
+    Every hit returns a new CSDM object, with its own copy of the metadata, that
+    shares the components arrays of the cached dataset. The shared arrays are
+    read-only, such that the cached dataset cannot be modified through the returned
+    object. Assigning new components to a dependent variable of the returned object,
+    for example, ``data.y[0].components = data.y[0].components * 2``, replaces the
+    components of the returned object only.
+
+    Args:
+        max_size (int): The maximum total size, in bytes, of the components of the
+            cached datasets. The default is the `CSDMPY_MEMORY_CACHE_SIZE`
+            environment variable, or MAX_SIZE, if unset. A dataset larger than
+            `max_size` is not cached.
+
+    Example:
+        >>> data = cp.load('local_address/file.csdf', cache=True) # doctest: +SKIP
+        >>> cp.DatasetCache.default().clear() # doctest: +SKIP
+    """
+
+    __slots__ = ("max_size", "entries", "size", "lock")
+
+    _default = None
+
+    def __init__(self, max_size=None):
+        """Initialize."""
+        if max_size is None:
+            max_size = int(os.environ.get("CSDMPY_MEMORY_CACHE_SIZE", MAX_SIZE))
+        self.max_size = max_size
+        # the key to the (validators, paths, csdm_object, size) of a dataset.
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.RLock()
+
+    @classmethod
+    def default(cls):
+        """Return the cache shared by the loads with ``cache=True``."""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    def load(self, load, filename, verbose=False, **kwargs):
+        """Return the dataset of the file from the cache, or load and cache it with
+        the `load` function, called with the filename and the keyword arguments."""
+        key, local = cache_key(filename, verbose, **kwargs)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == validators(entry[1]):
+                self.entries.move_to_end(key)
+                return view(entry[2])
+
+        csdm_object = load(filename, verbose=verbose, **kwargs)
+        paths = [local] + binary_paths(csdm_object) if local is not None else []
+        self.insert(key, validators(paths), paths, csdm_object)
+        return view(csdm_object)
+
+    def insert(self, key, stats, paths, csdm_object):
+        """Insert the dataset, and evict the least recently used datasets beyond
+        `max_size`."""
+        arrays = components(csdm_object)
+        for array in arrays:
+            array.flags.writeable = False
+        size = sum(item.nbytes for item in arrays)
+
+        with self.lock:
+            self.remove(key)
+            if size > self.max_size:
+                return
+            self.entries[key] = (stats, paths, csdm_object, size)
+            self.size += size
+            while self.size > self.max_size:
+                self.remove(next(iter(self.entries)))
+
+    def remove(self, key):
+        """Remove the dataset of the key from the cache, if present."""
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.size -= entry[3]
+
+    def clear(self):
+        """Remove every dataset from the cache."""
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def cache_key(filename, verbose=False, **kwargs):
+    """Return the key of the file and the load options, along with the local path of
+    the file, or None for a remote file."""
+    options = tuple(sorted(kwargs.items()))
+    if urlparse(filename).scheme not in ["file", ""]:
+        # the cached download is named after the url and its headers.
+        local = download.download_file_from_url(filename, verbose)
+        return (filename, local) + options, None
+    local = os.path.abspath(url2pathname(urlparse(filename).path))
+    return (local,) + options, local
+
+
+def binary_paths(csdm_object):
+    """Return the local paths of the binary files of the external dependent
+    variables of the CSDM object."""
+    paths = []
+    for variable in csdm_object.dependent_variables:
+        url = getattr(variable.subtype, "_components_url", None)
+        if url is None:
+            continue
+        url = download.get_absolute_url_path(url, csdm_object.filename)
+        if urlparse(url).scheme == "file":
+            paths.append(url2pathname(urlparse(url).path))
+    return paths
+
+
+def validators(paths):
+    """Return the list of the size and the modification time of the files."""
+    stats = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        stats.append((stat.st_size, stat.st_mtime_ns))
+    return stats
+
+
+def components(csdm_object):
+    """Return the list of the components arrays of the CSDM object."""
+    arrays = [item.subtype._components for item in csdm_object.dependent_variables]
+    return [item for item in arrays if isinstance(item, np.ndarray)]
+
+
+def view(csdm_object):
+    """Return a copy of the CSDM object that shares its components arrays."""
+    return deepcopy(csdm_object, {id(item): item for item in components(csdm_object)})
@@ -0,0 +1,339 @@
+"""An index of the metadata of the datasets in a directory."""
+import json
+import os
+import sqlite3
+
+from .compression import open_file  # lgtm [py/import-own-module]
+from .compression import strip_compression  # lgtm [py/import-own-module]
+from .container import is_container  # lgtm [py/import-own-module]
+from .container import read_container  # lgtm [py/import-own-module]
+from .dimension import Dimension  # lgtm [py/import-own-module]
+from .scanner import scan  # lgtm [py/import-own-module]
+from .units import check_quantity_name  # lgtm [py/import-own-module]
+from .units import ScalarQuantity  # lgtm [py/import-own-module]
+from .utils import NumericType  # lgtm [py/import-own-module]
+from .utils import QuantityType  # lgtm [py/import-own-module]
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["Catalog"]
+
+# the name of the index file, in the root directory, when not given.
+INDEX_NAME = ".csdmpy-catalog.sqlite"
+EXTENSIONS = (".csdf", ".csdfe", ".csdfb")
+
+# the schema version of the index. An index of another version is rebuilt.
+VERSION = 1
+SCHEMA = """
+CREATE TABLE files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    error TEXT,
+    version TEXT,
+    description TEXT,
+    timestamp TEXT,
+    ndim INTEGER,
+    shape TEXT
+);
+CREATE TABLE dimensions (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    type TEXT,
+    count INTEGER,
+    unit TEXT,
+    quantity_name TEXT,
+    label TEXT,
+    description TEXT
+);
+CREATE TABLE dependent_variables (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT,
+    unit TEXT,
+    quantity_name TEXT,
+    quantity_type TEXT,
+    numeric_type TEXT,
+    description TEXT
+);
+CREATE TABLE tags (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    tag TEXT NOT NULL
+);
+CREATE INDEX dimensions_path ON dimensions(path);
+CREATE INDEX dimensions_quantity_name ON dimensions(quantity_name);
+CREATE INDEX dependent_variables_path ON dependent_variables(path);
+CREATE INDEX tags_tag ON tags(tag, path);
+"""
+
+
+class Catalog:
+    """A persistent index of the metadata of the `.csdf`, `.csdfe`, and `.csdfb`
+    files, including the compressed files, under a root directory.
+
+    The files are parsed for their metadata only, without the components, and the
+    facts of every file---the shape, the type, unit, and quantity name of every
+    dimension, the dependent variables, the tags, the description, and the
+    timestamp---are stored in a local SQLite database. The queries of
+    :meth:`find` are answered from the database, without opening the files.
+
+    A rescan with :meth:`scan` is incremental. Only the new files, and the files
+    whose size or modification time changed, are parsed again, and the removed
+    files are dropped from the index.
+
+    Args:
+        root (str): The root directory of the files.
+        index (str): The path of the SQLite database. The default is the
+            INDEX_NAME file in the root directory.
+
+    Example:
+        >>> catalog = cp.Catalog('datasets')  # doctest: +SKIP
+        >>> catalog.scan()  # doctest: +SKIP
+        12
+        >>> catalog.find(ndim=2, quantity_name='frequency', tags='13C') # doctest: +SKIP
+        ['datasets/ethanol.csdf', 'datasets/glycine.csdfe']
+    """
+
+    __slots__ = ("root", "index", "connection")
+
+    def __init__(self, root, index=None):
+        """Initialize."""
+        self.root = str(root)
+        if not os.path.isdir(self.root):
+            raise ValueError(f"The catalog root `{self.root}` is not a directory.")
+        self.index = str(index or os.path.join(self.root, INDEX_NAME))
+        self.connection = sqlite3.connect(self.index)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        (version,) = self.connection.execute("PRAGMA user_version").fetchone()
+        if version != VERSION:
+            self.create()
+
+    def create(self):
+        """Create an empty index, dropping the tables of an existing index."""
+        with self.connection:
+            tables = self.connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            ).fetchall()
+            for (name,) in tables:
+                self.connection.execute(f"DROP TABLE IF EXISTS {name}")
+            self.connection.executescript(SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {VERSION}")
+
+    def scan(self):
+        """Update the index with the files under the root directory.
+
+        Returns:
+            The number of files parsed, that is, the new and the changed files.
+        """
+        indexed = {
+            path: (size, mtime)
+            for path, size, mtime in self.connection.execute(
+                "SELECT path, size, mtime FROM files"
+            )
+        }
+        parsed = 0
+        with self.connection:
+            for path, stat in walk(self.root):
+                if indexed.pop(path, None) == (stat.st_size, stat.st_mtime_ns):
+                    continue
+                self.connection.execute("DELETE FROM files WHERE path = ?", (path,))
+                self.insert(path, stat)
+                parsed += 1
+            self.connection.executemany(
+                "DELETE FROM files WHERE path = ?", [(path,) for path in indexed]
+            )
+        return parsed
+
+    def insert(self, path, stat):
+        """Parse the metadata of the file at the path, relative to the root, and
+        insert its rows into the index."""
+        try:
+            dictionary = read_metadata(os.path.join(self.root, path))
+            csdm = dictionary["csdm"]
+            dimensions = [dimension_row(item) for item in csdm.get("dimensions", [])]
+            variables = [
+                variable_row(item) for item in csdm.get("dependent_variables", [])
+            ]
+        except Exception as error:
+            self.connection.execute(
+                "INSERT INTO files (path, size, mtime, error) VALUES (?, ?, ?, ?)",
+                (
+                    path,
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    f"{type(error).__name__}: {error}",
+                ),
+            )
+            return
+
+        shape = [item[1] for item in dimensions]
+        self.connection.execute(
+            "INSERT INTO files VALUES (?, ?, ?, NULL, ?, ?, ?, ?, ?)",
+            (
+                path,
+                stat.st_size,
+                stat.st_mtime_ns,
+                str(csdm.get("version", "")),
+                str(csdm.get("description", "")),
+                str(csdm.get("timestamp", "")),
+                len(shape),
+                json.dumps(shape),
+            ),
+        )
+        self.connection.executemany(
+            "INSERT INTO dimensions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(path, i) + item for i, item in enumerate(dimensions)],
+        )
+        self.connection.executemany(
+            "INSERT INTO dependent_variables VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(path, i) + item for i, item in enumerate(variables)],
+        )
+        self.connection.executemany(
+            "INSERT INTO tags VALUES (?, ?)",
+            [(path, str(tag)) for tag in dict.fromkeys(csdm.get("tags", []))],
+        )
+
+    def find(
+        self,
+        ndim=None,
+        shape=None,
+        type=None,
+        quantity_name=None,
+        unit=None,
+        tags=None,
+        description=None,
+    ):
+        """Return the sorted list of the paths of the indexed files that match all
+        the given criteria.
+
+        Args:
+            ndim (int): The number of dimensions.
+            shape: The list of the counts of the dimensions, in the order of the
+                dimensions.
+            type (str): The type of a dimension, `linear`, `monotonic`, or
+                `labeled`.
+            quantity_name (str): The quantity name of a dimension, such as
+                `frequency`.
+            unit (str): The unit of a dimension, such as `Hz`.
+            tags: A tag, or a list of tags. The files with all the tags match.
+            description (str): A case-insensitive substring of the description.
+
+        The `type`, `quantity_name`, and `unit` criteria must all match the same
+        dimension of a file.
+
+        Returns:
+            A list of the paths, joined with the root directory.
+        """
+        clauses, params = ["error IS NULL"], []
+        if ndim is not None:
+            clauses.append("ndim = ?")
+            params.append(int(ndim))
+        if shape is not None:
+            clauses.append("shape = ?")
+            params.append(json.dumps([int(item) for item in shape]))
+        if description is not None:
+            # the wildcards of LIKE in the description are matched literally.
+            for char in "\\%_":
+                description = description.replace(char, "\\" + char)
+            clauses.append("description LIKE ? ESCAPE '\\'")
+            params.append(f"%{description}%")
+
+        criteria = {"type": type, "quantity_name": quantity_name, "unit": unit}
+        criteria = {key: value for key, value in criteria.items() if value is not None}
+        if criteria != {}:
+            conditions = " AND ".join(f"d.{key} = ?" for key in criteria)
+            clauses.append(
+                "EXISTS (SELECT 1 FROM dimensions d WHERE d.path = files.path AND "
+                f"{conditions})"
+            )
+            params += [str(value) for value in criteria.values()]
+
+        tags = [tags] if isinstance(tags, str) else tags or []
+        for tag in tags:
+            clauses.append(
+                "EXISTS (SELECT 1 FROM tags t WHERE t.path = files.path AND t.tag = ?)"
+            )
+            params.append(str(tag))
+
+        rows = self.connection.execute(
+            f"SELECT path FROM files WHERE {' AND '.join(clauses)} ORDER BY path",
+            params,
+        )
+        return [os.path.join(self.root, path) for (path,) in rows]
+
+    def errors(self):
+        """Return a dictionary of the paths of the files that could not be parsed,
+        joined with the root directory, and their error messages."""
+        rows = self.connection.execute(
+            "SELECT path, error FROM files WHERE error IS NOT NULL ORDER BY path"
+        )
+        return {os.path.join(self.root, path): error for path, error in rows}
+
+    def __len__(self):
+        (count,) = self.connection.execute("SELECT COUNT(*) FROM files").fetchone()
+        return count
+
+    def close(self):
+        """Close the index."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def walk(root):
+    """Yield the paths, relative to the root, and the stat results of the dataset
+    files under the root directory."""
+    for directory, _, names in os.walk(root):
+        for name in sorted(names):
+            if not strip_compression(name).endswith(EXTENSIONS):
+                continue
+            path = os.path.join(directory, name)
+            yield os.path.relpath(path, root), os.stat(path)
+
+
+def read_metadata(filename):
+    """Return the dictionary of the local file, without the components."""
+    if is_container(filename):
+        return read_container(filename, components=False)
+    with open_file(filename, "rt", encoding="UTF-8") as file:
+        return scan(file, components=False)
+
+
+def dimension_row(dictionary):
+    """Return the (type, count, unit, quantity_name, label, description) row of the
+    dimension dictionary."""
+    dimension = Dimension(**dictionary)
+    unit, quantity_name = None, None
+    if dimension.type == "linear":
+        unit = dimension.increment.unit
+    if dimension.type == "monotonic":
+        unit = dimension.coordinates.unit
+    if dimension.type != "labeled":
+        unit, quantity_name = unit.to_string(), dimension.quantity_name
+    return (
+        dimension.type,
+        dimension.count,
+        unit,
+        quantity_name,
+        dimension.label,
+        dimension.description,
+    )
+
+
+def variable_row(dictionary):
+    """Return the (name, unit, quantity_name, quantity_type, numeric_type,
+    description) row of the dependent variable dictionary."""
+    unit = ScalarQuantity(f"1 {dictionary.get('unit', '')}").quantity.unit
+    quantity_name = check_quantity_name(dictionary.get("quantity_name"), unit)
+    return (
+        str(dictionary.get("name", "")),
+        unit.to_string(),
+        str(quantity_name),
+        str(QuantityType(dictionary["quantity_type"])),
+        str(NumericType(dictionary["numeric_type"])),
+        str(dictionary.get("description", "")),
+    )
@@ -0,0 +1,72 @@
+"""Transparent gzip, xz, and bz2 compression of the serialized files."""
+import bz2
+import gzip
+import lzma
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["detect_compression", "open_file", "strip_compression", "COMPRESSIONS"]
+
+# the file extension, the leading magic bytes, and the open function of every
+# compression format.
+COMPRESSIONS = {
+    ".gz": (b"\x1f\x8b", gzip.open),
+    ".xz": (b"\xfd7zXZ\x00", lzma.open),
+    ".bz2": (b"BZh", bz2.open),
+}
+
+
+def extension_of(filename):
+    """Return the compression extension of the filename, or None."""
+    for extension in COMPRESSIONS:
+        if str(filename).lower().endswith(extension):
+            return extension
+    return None
+
+
+def strip_compression(filename):
+    """Return the filename without the compression extension, for example,
+    `file.csdf` from `file.csdf.gz`."""
+    extension = extension_of(filename)
+    if extension is None:
+        return filename
+    filename = str(filename)
+    return filename[: len(filename) - len(extension)]
+
+
+def detect_compression(filename):
+    """Return the extension of the compression format of the file, detected from
+    its leading magic bytes, or None if the file is not compressed."""
+    size = max(len(magic) for magic, _ in COMPRESSIONS.values())
+    with open(filename, "rb") as file:
+        head = file.read(size)
+    for extension, (magic, _) in COMPRESSIONS.items():
+        if head.startswith(magic):
+            return extension
+    return None
+
+
+def open_file(filename, mode="rb", **kwargs):
+    """Open the file, transparently decompressing or compressing its content.
+
+    When reading, the compression format is detected from the leading bytes of the
+    file. When writing, the format is given by the extension of the filename,
+    `.gz`, `.xz`, or `.bz2`. The content is decompressed or compressed as it is
+    read or written, without a temporary file.
+
+    Args:
+        filename: The path of the file.
+        mode: The mode of the file, one of 'rb', 'rt', 'wb', and 'wt'.
+        kwargs: The additional keyword arguments of the open function, for example,
+            `encoding`.
+
+    Returns:
+        A file object.
+    """
+    if "r" in mode:
+        extension = detect_compression(filename)
+    else:
+        extension = extension_of(filename)
+    if extension is None:
+        return open(filename, mode, **kwargs)
+    return COMPRESSIONS[extension][1](filename, mode, **kwargs)
@@ -0,0 +1,126 @@
+"""Binary container of the CSD model, a JSON header followed by aligned blocks."""
+import json
+import struct
+
+import numpy as np
+
+from .compression import detect_compression  # lgtm [py/import-own-module]
+from .compression import open_file  # lgtm [py/import-own-module]
+from .dependent_variable.region import readinto  # lgtm [py/import-own-module]
+from .utils import NumericType  # lgtm [py/import-own-module]
+from .utils import QuantityType  # lgtm [py/import-own-module]
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["is_container", "read_container", "write_container"]
+
+EXTENSION = ".csdfb"
+MAGIC = b"CSDFB\x00\x00\x01"
+
+# alignment, in bytes, of the offset of every block.
+ALIGNMENT = 64
+
+# the magic bytes, the size of the JSON header, and the number of blocks.
+PREAMBLE = struct.Struct("<8sQQ")
+
+# the offset and the size of a block, in bytes.
+ENTRY = struct.Struct("<QQ")
+
+
+def is_container(filename):
+    """Return true if the file, or the decompressed content of a compressed file,
+    starts with the magic bytes of a binary container."""
+    with open_file(filename, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def write_container(dictionary, arrays, file):
+    """Write the CSDM dictionary and the component arrays as a binary container.
+
+    The container is laid out as
+
+    - the preamble, that is, the MAGIC bytes, and the size of the header and the
+      number of blocks as little-endian uint64,
+    - the offset table, with the offset and size of every block as little-endian
+      uint64,
+    - the JSON header, that is, the utf-8 serialization of the CSDM dictionary,
+      without the components of the dependent variables,
+    - the blocks, one for each dependent variable, in order, holding the raw
+      little-endian bytes of the C-ordered (p, N) components array. Every block
+      starts at a multiple of ALIGNMENT bytes.
+
+    Args:
+        dictionary: The CSDM dictionary, without the components.
+        arrays: The list of the C-contiguous components arrays of the dependent
+            variables.
+        file: A binary file object.
+    """
+    header = json.dumps(dictionary, ensure_ascii=False, allow_nan=False)
+    header = header.encode("utf-8")
+    position = PREAMBLE.size + ENTRY.size * len(arrays) + len(header)
+
+    table, offset = [], position
+    for array in arrays:
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        table.append((offset, array.nbytes))
+        offset += array.nbytes
+
+    file.write(PREAMBLE.pack(MAGIC, len(header), len(arrays)))
+    for entry in table:
+        file.write(ENTRY.pack(*entry))
+    file.write(header)
+    for (offset, size), array in zip(table, arrays):
+        file.write(bytes(offset - position))
+        file.write(np.ascontiguousarray(array).reshape(-1).view(np.uint8))
+        position = offset + size
+
+
+def read_container(filename, components=True, mmap=False):
+    """Return the CSDM dictionary of the binary container file.
+
+    Only the preamble, the offset table, and the header are parsed, the blocks are
+    read into the (p, N) `components` arrays of the dependent variables.
+
+    Args:
+        filename: The path of the container file.
+        components: If false, the blocks are not read, and the `components` keys are
+            omitted.
+        mmap: If true, the components arrays are read-only memory maps of the
+            blocks. A compressed container is never memory-mapped.
+
+    Returns:
+        A python dictionary.
+    """
+    mmap = mmap and detect_compression(filename) is None
+    with open_file(filename, "rb") as file:
+        magic, size, count = PREAMBLE.unpack(file.read(PREAMBLE.size))
+        if magic != MAGIC:
+            raise ValueError(f"'{filename}' is not a binary container file.")
+        table = [ENTRY.unpack(file.read(ENTRY.size)) for _ in range(count)]
+        dictionary = json.loads(file.read(size).decode("utf-8"))
+
+        variables = dictionary["csdm"].get("dependent_variables", [])
+        if len(variables) != count:
+            raise ValueError(
+                f"The container has {count} blocks for {len(variables)} dependent "
+                "variables."
+            )
+        if not components:
+            return dictionary
+
+        for variable, (offset, nbytes) in zip(variables, table):
+            dtype = NumericType(variable["numeric_type"]).dtype
+            shape = (QuantityType(variable["quantity_type"]).p, -1)
+            if nbytes % dtype.itemsize != 0:
+                raise ValueError("buffer size must be a multiple of element size")
+            length = nbytes // dtype.itemsize
+            if mmap and length != 0:
+                array = np.memmap(filename, dtype, "r", offset, shape=(length,))
+            else:
+                array = np.empty(length, dtype)
+                file.seek(offset)
+                readinto(file, array)
+            variable["components"] = array.reshape(shape)
+            # the numeric type is inferred from the array, without a copy.
+            del variable["numeric_type"]
+    return dictionary
@@ -1,5 +1,7 @@
 """THE CSDM object"""
+import asyncio
 import datetime
+import functools
 import json
 import warnings
 from copy import deepcopy
@@ -10,8 +12,23 @@ from astropy.units.quantity import Quantity
 from .abstract_list import __dimensions_list__  # lgtm [py/import-own-module]
 from .abstract_list import DependentVariableList  # lgtm [py/import-own-module]
 from .abstract_list import DimensionList  # lgtm [py/import-own-module]
+from .compression import open_file  # lgtm [py/import-own-module]
+from .compression import strip_compression  # lgtm [py/import-own-module]
+from .container import EXTENSION  # lgtm [py/import-own-module]
+from .container import write_container  # lgtm [py/import-own-module]
 from .dependent_variable import as_dependent_variable  # noqa: F401
 from .dependent_variable import DependentVariable  # lgtm [py/import-own-module]
+from .dependent_variable.base_class import (  # lgtm [py/import-own-module]
+    BaseDependentVariable,
+)
+from .dependent_variable.chunked import check_codec  # lgtm [py/import-own-module]
+from .dependent_variable.encoder import dump  # lgtm [py/import-own-module]
+from .dependent_variable.internal import InternalDataset  # lgtm [py/import-own-module]
+from .dependent_variable.tiled import check_tiles  # lgtm [py/import-own-module]
+from .dependent_variable.virtual import REDUCTIONS  # lgtm [py/import-own-module]
+from .dependent_variable.virtual import (  # lgtm [py/import-own-module]
+    VirtualComponents,
+)
 from .dimension import as_dimension  # lgtm [py/import-own-module]
 from .dimension import Dimension  # lgtm [py/import-own-module] # noqa: F401
 from .dimension import LabeledDimension  # lgtm [py/import-own-module] # noqa: F401
@@ -20,7 +37,9 @@ from .dimension import MonotonicDimension  # lgtm [py/import-own-module] # noqa:
 from .helper_functions import _preview  # lgtm [py/import-own-module]
 from .numpy_wrapper import fft
 from .units import string_to_quantity  # lgtm [py/import-own-module]
+from .utils import _async_executor  # lgtm [py/import-own-module]
 from .utils import _check_dimension_indices  # lgtm [py/import-own-module]
+from .utils import _deepcopy_slots  # lgtm [py/import-own-module]
 from .utils import _get_broadcast_shape  # lgtm [py/import-own-module]
 from .utils import check_scalar_object  # lgtm [py/import-own-module]
 from .utils import validate  # lgtm [py/import-own-module]
@@ -257,6 +276,12 @@ class CSDM:
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    def __deepcopy__(self, memo):
+        """Return a copy of the CSDM object, with one copy of every components array.
+        The units and quantities of the dimensions and dependent variables are
+        shared with the copy."""
+        return _deepcopy_slots(self, memo)
+
     def __neg__(self):
         """Return negative of self."""
         return np.negative(self)
@@ -489,21 +514,15 @@ class CSDM:
         """Return a csdm object corresponding to given indices."""
         indices = self._get_indices(indices)
         csdm = CSDM()
-        for i, dim in enumerate(self.dimensions):
-            dim_ = Dimension(**dim.dict()) if not hasattr(self, "subtype") else self
-            new_dim = dim_[indices[i]]
-            if new_dim.size > 1:
+        for dim, index in zip(self.dimensions, indices):
+            new_dim = _sub_dimension(dim, index)
+            if new_dim is not None:
                 csdm._dimensions += [new_dim]
 
         for variable in self.dependent_variables:
-            section = (slice(0, len(variable.components), 1),) + indices[::-1]
-            components = variable.components[section]
-            dv_obj = empty_dependent_variable(
-                variable.numeric_type, variable.quantity_type
-            )
-            dv_obj.subtype._components = components
-            dv_obj.copy_metadata(variable)
-            csdm._dependent_variables += [dv_obj]
+            section = (slice(0, variable.subtype._quantity_type.p, 1),) + indices[::-1]
+            components = variable.subtype._region(section)
+            csdm._dependent_variables += [_sub_dependent_variable(variable, components)]
 
         csdm.copy_metadata(self)
         return csdm
@@ -927,6 +946,10 @@ class CSDM:
         read_only=None,
         version=None,
         for_display=False,
+        stream=False,
+        components=True,
+        compression=None,
+        tiles=None,
     ):
         obj = {}
         obj["version"] = self.version if version is None else version
@@ -942,7 +965,15 @@ class CSDM:
         obj["application"] = self.application
         obj["dimensions"] = [dim.dict() for dim in self.dimensions]
         obj["dependent_variables"] = [
-            dv._dict(filename=filename, dataset_index=i, for_display=for_display)
+            dv._dict(
+                filename=filename,
+                dataset_index=i,
+                for_display=for_display,
+                stream=stream,
+                components=components,
+                compression=compression,
+                tiles=tiles,
+            )
             for i, dv in enumerate(self.dependent_variables)
         ]
 
@@ -969,7 +1000,15 @@ class CSDM:
             dict_, ensure_ascii=False, sort_keys=False, allow_nan=False, **kwargs
         )
 
-    def save(self, filename="", read_only=False, output_device=None, indent=0):
+    def save(
+        self,
+        filename="",
+        read_only=False,
+        output_device=None,
+        indent=0,
+        compression=None,
+        tiles=None,
+    ):
         """Serialize the :ref:`CSDM_api` instance as a JSON data-exchange file.
 
         There are two types of file serialization extensions, `.csdf` and
@@ -998,11 +1037,55 @@ class CSDM:
         .. note:: Only dependent variables with ``encoding="raw"`` will be
             serialized to a binary file.
 
+        The components are encoded and written to the file in chunks, without
+        building the complete JSON string, or the lists of the encoded components,
+        in memory.
+
+        A `filename` with the `.csdfb` extension is serialized as a single binary
+        container file, with a JSON header followed by the raw little-endian
+        components of every dependent variable, in 64-byte aligned blocks. The
+        binary container is loaded with :func:`~csdmpy.load`, and may be memory-mapped
+        with ``cp.load(filename, mmap=True)``.
+
+        With a `compression` codec, the binary files of the dependent variables with
+        ``encoding="raw"`` are written as chunked files, where the byte-shuffled
+        components are compressed in chunks, in parallel. The chunked files are
+        loaded with :func:`~csdmpy.load`, and a slice of the lazily loaded CSDM
+        object decompresses only the chunks of the slice. The codec is recorded
+        under the `csdmpy` key of the `application` metadata of the dependent
+        variables. The chunked files are specific to csdmpy, and are not read by
+        the other readers of the CSD model.
+
+        A `filename` ending with `.gz`, `.xz`, or `.bz2`, for example,
+        `file.csdf.gz`, is compressed with gzip, xz, or bz2, as the file is written.
+        The binary files of the ``raw`` encoded dependent variables are named after
+        the filename without the compression extension, and are not compressed by
+        the extension, see the `compression` argument.
+
+        With `tiles`, the binary files of the dependent variables with
+        ``encoding="raw"`` are written in a tiled layout, where the components are
+        split into blocks of the `tiles` shape, for example, ``tiles=64`` for blocks
+        of 64x64x64 points of a three-dimensional dataset. A slice of the lazily
+        loaded CSDM object reads only the tiles that the slice intersects, such that
+        a slice along any dimension reads a similar number of bytes. With a
+        `compression` codec, every tile is compressed. The dependent variables with
+        a sparse sampling are not tiled. Like the chunked files, the tiled files are
+        specific to csdmpy, and their layout is recorded in the `application`
+        metadata.
+
         Args:
             filename (str): The filename of the serialized file.
             read_only (bool): If true, the file is serialized as read_only.
             output_device(object): Object where the data is written. If provided,
                 the argument `filename` become irrelevant.
+            indent (int): The indent of the JSON serialization.
+            compression (str): The compression codec of the binary files, one of
+                ``zlib``, ``lzma``, and ``bz2``. Default is None, that is, the
+                binary files are not compressed.
+            tiles (int or list): The number of points of a tile along every
+                dimension, or a list with the number of points of a tile along each
+                dimension, in the order of the dimensions. Default is None, that is,
+                the binary files are not tiled.
 
         Example:
             >>> data.save('my_file.csdf')
@@ -1013,7 +1096,20 @@ class CSDM:
 
             os.remove("my_file.csdf")
         """
-        dictionary = self._dict(filename=filename, version=self.version)
+        if compression is not None:
+            check_codec(compression)
+        if tiles is not None:
+            tiles = check_tiles(tiles, len(self.dimensions))
+        base = strip_compression(filename)
+        container = output_device is None and str(base).endswith(EXTENSION)
+        dictionary = self._dict(
+            filename=base,
+            version=self.version,
+            stream=True,
+            components=not container,
+            compression=compression,
+            tiles=tiles,
+        )
 
         timestamp = datetime.datetime.utcnow().isoformat()[:-7] + "Z"
         dictionary["csdm"]["timestamp"] = timestamp
@@ -1021,14 +1117,59 @@ class CSDM:
         if read_only:
             dictionary["csdm"]["read_only"] = read_only
 
+        if container:
+            arrays = [item.subtype.ravel_data() for item in self.dependent_variables]
+            with open_file(filename, "wb") as outfile:
+                write_container(dictionary, arrays, outfile)
+            return
+
         kwargs = dict(
             ensure_ascii=False, sort_keys=False, indent=indent, allow_nan=False
         )
         if output_device is not None:
-            json.dump(dictionary, output_device, **kwargs)
+            dump(dictionary, output_device, **kwargs)
+            return
 
-        with open(filename, "w", encoding="utf8") as outfile:
-            json.dump(dictionary, outfile, **kwargs)
+        with open_file(filename, "wt", encoding="utf8") as outfile:
+            dump(dictionary, outfile, **kwargs)
+
+    async def asave(
+        self,
+        filename="",
+        read_only=False,
+        output_device=None,
+        indent=0,
+        compression=None,
+        tiles=None,
+        executor=None,
+    ):
+        """Coroutine of :meth:`~csdmpy.CSDM.save`.
+
+        The blocking :meth:`~csdmpy.CSDM.save` runs in a thread of the executor,
+        without blocking the event loop, and the number of concurrent saves is
+        bounded by the threads of the executor. The CSDM object must not be modified
+        until the coroutine returns.
+
+        Args:
+            filename (str): The filename of the serialized file.
+            read_only (bool): If true, the file is serialized as read_only.
+            output_device(object): Object where the data is written. If provided,
+                the argument `filename` become irrelevant.
+            indent (int): The indent of the JSON serialization.
+            compression (str): The compression codec of the binary files.
+            tiles (int or list): The tile shape of the binary files.
+            executor: An optional `concurrent.futures` executor. The default is a
+                thread pool, shared by the coroutines of csdmpy, with at most
+                ASYNC_WORKERS threads.
+
+        Example:
+            >>> asyncio.run(data.asave('my_file.csdf'))  # doctest: +SKIP
+        """
+        executor = _async_executor() if executor is None else executor
+        save = functools.partial(
+            self.save, filename, read_only, output_device, indent, compression, tiles
+        )
+        await asyncio.get_running_loop().run_in_executor(executor, save)
 
     def to_list(self):
         r"""Return the dimension coordinates and dependent variable components as
@@ -1458,6 +1599,10 @@ class CSDM:
                     array, unit = coords.value[::-1], coords.unit
                     new_axis = as_dimension(array=array, unit=str(unit))
                     new_axis.copy_metadata(dim)
+                    if new_axis.type == "linear" and new_axis.complex_fft:
+                        # the coordinates are shifted by half the count.
+                        shift = int(new_axis.count / 2) * new_axis.increment
+                        new_axis.coordinates_offset = coords[-1] + shift
                     new_dimensions.append(new_axis)
                 else:
                     new_dimensions.append(dim)
@@ -1649,7 +1794,7 @@ def _get_new_csdm_object_after_dimension_reduction_func(func, *args, **kwargs):
                 new.dimensions.append(variable.copy())
 
     for variable in csdm.dependent_variables:
-        components = func(variable.components, *args_, **kwargs)
+        components = _reduce_components(variable, func, args_, kwargs)
 
         if axis is not None:
             obj = empty_dependent_variable(
@@ -1673,6 +1818,54 @@ def _get_new_csdm_object_after_dimension_reduction_func(func, *args, **kwargs):
     return new
 
 
+def _reduce_components(variable, func, args_, kwargs):
+    """Return the reduction of the components of the dependent variable. The
+    supported reductions of virtual components are computed one dataset at a time,
+    without reading the complete components array."""
+    lazy = variable.subtype._array
+    virtual = isinstance(lazy, VirtualComponents) and func in REDUCTIONS
+    if virtual and len(args_) <= 1 and set(kwargs) <= {"axis"}:
+        return lazy.reduce(func, args_[0] if args_ else kwargs.get("axis"))
+    return func(variable.components, *args_, **kwargs)
+
+
+def _sub_dimension(dimension, index):
+    """Return the dimension at the index, or None, if the index selects at most one
+    coordinate. The linear dimensions are sliced without evaluating the
+    coordinates."""
+    if isinstance(index, slice):
+        if len(range(*index.indices(dimension.count))) <= 1:
+            return None
+        subtype = dimension.subtype if hasattr(dimension, "subtype") else dimension
+        if isinstance(subtype, LinearDimension):
+            return subtype._slice(index)
+    elif np.ndim(index) == 0:
+        if not -dimension.count <= index < dimension.count:
+            raise IndexError(
+                f"index {index} is out of bounds for a dimension with size "
+                f"{dimension.count}"
+            )
+        return None
+
+    new_dim = Dimension(**dimension.dict())[index]
+    return new_dim if new_dim.size > 1 else None
+
+
+def _sub_dependent_variable(variable, components):
+    """Return an internal dependent variable with the components and the metadata of
+    the dependent variable, without parsing the metadata again."""
+    subtype = InternalDataset.__new__(InternalDataset)
+    for name in BaseDependentVariable.__slots__:
+        setattr(subtype, name, getattr(variable.subtype, name))
+    subtype._sparse_sampling = {}
+    subtype._components = components
+
+    new = DependentVariable.__new__(DependentVariable)
+    new.subtype = subtype
+    new._type = variable._type
+    return new
+
+
 def empty_dependent_variable(numeric_type, quantity_type="scalar"):
     """Create an empty dependent variable object"""
     return DependentVariable(
@@ -1,13 +1,14 @@
 """Dependent variable object: attributes and methods."""
 import json
-import warnings
 from copy import deepcopy
 
 import numpy as np
 
+from csdmpy.dependent_variable.base_class import fill_sparse_space  # noqa: F401
 from csdmpy.dependent_variable.external import ExternalDataset
 from csdmpy.dependent_variable.internal import InternalDataset
 from csdmpy.utils import _axis_label  # lgtm [py/import-own-module]
+from csdmpy.utils import _deepcopy_slots  # lgtm [py/import-own-module]
 from csdmpy.utils import _get_dictionary  # lgtm [py/import-own-module]
 
 __author__ = "Deepansh J. Srivastava"
@@ -82,6 +83,8 @@ class DependentVariable:
             "filename": __file__,
             "application": None,
             "sparse_sampling": {},
+            "mmap": False,
+            "lazy": False,
         }
         input_dict = _get_dictionary(*args, **kwargs)
         self.__validate_key_value__(input_dict)
@@ -146,6 +149,10 @@ class DependentVariable:
             return False
         return self.subtype == other.subtype
 
+    def __deepcopy__(self, memo):
+        """Return a copy of the DependentVariable object."""
+        return _deepcopy_slots(self, memo)
+
     # ======================================================================= #
     #                      DependentVariable  Attributes                      #
     # ======================================================================= #
@@ -704,9 +711,26 @@ class DependentVariable:
         """
         return self.subtype.dict()
 
-    def _dict(self, filename=None, dataset_index=None, for_display=False):
+    def _dict(
+        self,
+        filename=None,
+        dataset_index=None,
+        for_display=False,
+        stream=False,
+        components=True,
+        compression=None,
+        tiles=None,
+    ):
         """Return DependentVariable object as a python dictionary."""
-        return self.subtype.dict(filename, dataset_index, for_display)
+        return self.subtype.dict(
+            filename,
+            dataset_index,
+            for_display,
+            stream,
+            components,
+            compression,
+            tiles,
+        )
 
     def copy(self):
         """Return a copy of the DependentVariable object."""
@@ -719,29 +743,7 @@ class DependentVariable:
         where :math:`p` is the number of components and :math:`N_k` is the number of
         points along the :math:`k^\mathrm{th}` dimension.
         """
-        # for item in self.dependent_variables:
-        item = self.subtype
-        sub_shape = (item.quantity_type.p,) + tuple(shape)
-        if item.components.shape == sub_shape:
-            return
-
-        dtype = item.numeric_type.dtype
-
-        grid_points = np.asarray(sub_shape).prod()
-        components_size = item._components.size
-
-        if grid_points != components_size and item._sparse_sampling == {}:
-            warnings.warn(
-                "The number of elements in the components array, "
-                f"{components_size}, is not consistent with the total "
-                f"number of grid points, {grid_points}."
-            )
-        if item._sparse_sampling == {}:
-            item._components = np.asarray(
-                item._components[:, :grid_points].reshape(sub_shape), dtype=dtype
-            )
-        else:
-            item._components = fill_sparse_space(item, sub_shape, dtype)
+        self.subtype._reshape(shape)
 
     def copy_metadata(self, obj, copy=False):
         """Copy DependentVariable metadata"""
@@ -758,26 +760,6 @@ class DependentVariable:
         self.subtype._application = obj.subtype._application
 
 
-def fill_sparse_space(item, shape, dtype):
-    """Fill sparse grid using numpy broadcasting."""
-    components = np.zeros(shape, dtype=dtype)
-    sparse_dimensions_indexes = item._sparse_sampling._sparse_dimensions_indexes
-    sgs = item._sparse_sampling._sparse_grid_vertexes.size
-    grid_vertexes = item._sparse_sampling._sparse_grid_vertexes.reshape(
-        int(sgs / len(sparse_dimensions_indexes)), len(sparse_dimensions_indexes)
-    ).T
-
-    vertexes = [slice(None) for i in range(len(shape))]
-    for i, sparse_index in enumerate(sparse_dimensions_indexes):
-        vertexes[sparse_index] = grid_vertexes[i]
-
-    vertexes = tuple(vertexes[::-1])
-    _new_shape = components[vertexes].shape
-
-    components[vertexes] = item.components.reshape(_new_shape)
-    return components
-
-
 def as_dependent_variable(array, **kwargs):
     """Generate and return a DependentVariable object from a 1D or 2D numpy array.
 
@@ -0,0 +1,199 @@
+"""A minimal asyncio http/1.1 client for the downloads of the coroutines."""
+import asyncio
+import ssl
+import zlib
+from urllib.parse import urljoin
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import requote_uri
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["request", "Response"]
+
+# maximum number of redirects followed by a request.
+MAX_REDIRECTS = 10
+
+# maximum size, in bytes, of a read of the response body.
+READ_SIZE = 2**16
+
+REDIRECTS = (301, 302, 303, 307, 308)
+
+
+class Response:
+    """The status and headers of an http response, along with the number of bytes
+    of the body written to the file of the request."""
+
+    __slots__ = ("url", "status_code", "reason", "headers", "size")
+
+    def __init__(self, url, status_code, reason, headers):
+        """Initialize."""
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.size = 0
+
+    @property
+    def ok(self):
+        """Return true if the status code is less than 400."""
+        return self.status_code < 400
+
+    def raise_for_status(self):
+        """Raise a requests.HTTPError for a status code of 400 or more."""
+        if not self.ok:
+            raise requests.HTTPError(
+                f"{self.status_code} Error: {self.reason} for url: {self.url}"
+            )
+
+
+async def request(method, url, file=None, timeout=None):
+    """Send the http request with asyncio streams, following the redirects, and
+    return the Response.
+
+    The body of a successful response is written to the binary file object, if
+    any. The request asks for the identity encoding, and a gzip or deflate encoded
+    body is decoded as it is written.
+
+    Args:
+        method: The http method, `GET` or `HEAD`.
+        url: The http or https url.
+        file: An optional binary file object of the body.
+        timeout: The timeout, in seconds, of the connection and of every read.
+
+    Raises:
+        requests.ConnectionError: When the connection fails.
+        requests.Timeout: When the connection or a read times out.
+        requests.TooManyRedirects: When the url redirects more than MAX_REDIRECTS
+            times.
+    """
+    url = requote_uri(url)
+    for _ in range(MAX_REDIRECTS + 1):
+        reader, writer = await connect(url, timeout)
+        try:
+            response = await send(reader, writer, method, url, timeout)
+            if response.status_code in REDIRECTS and "location" in response.headers:
+                url = urljoin(url, response.headers["location"])
+                continue
+            if method != "HEAD" and file is not None and response.ok:
+                response.size = await read_body(reader, response.headers, file, timeout)
+            return response
+        except asyncio.TimeoutError as error:
+            raise requests.ReadTimeout(f"Read timed out for url: {url}") from error
+        except OSError as error:
+            raise requests.ConnectionError(f"Connection to '{url}' failed, {error}.")
+        finally:
+            writer.close()
+    raise requests.TooManyRedirects(f"Exceeded {MAX_REDIRECTS} redirects for {url}.")
+
+
+async def connect(url, timeout):
+    """Return the (reader, writer) streams of a connection to the host of the url."""
+    res = urlparse(url)
+    if res.scheme not in ["http", "https"]:
+        raise ValueError(f"Expecting an http or https url, found '{url}'.")
+    https = res.scheme == "https"
+    port = res.port or (443 if https else 80)
+    context = ssl.create_default_context() if https else None
+    connection = asyncio.open_connection(res.hostname, port, ssl=context)
+    try:
+        return await asyncio.wait_for(connection, timeout)
+    except asyncio.TimeoutError as error:
+        raise requests.ConnectTimeout(f"Connection to '{url}' timed out.") from error
+    except OSError as error:
+        raise requests.ConnectionError(
+            f"Cannot connect to '{url}', {error}."
+        ) from error
+
+
+async def send(reader, writer, method, url, timeout):
+    """Send the request and return the Response with the status and headers."""
+    res = urlparse(url)
+    target = (res.path or "/") + (f"?{res.query}" if res.query else "")
+    host = res.hostname if res.port is None else f"{res.hostname}:{res.port}"
+    lines = [
+        f"{method} {target} HTTP/1.1",
+        f"Host: {host}",
+        "User-Agent: csdmpy",
+        "Accept-Encoding: identity",
+        "Connection: close",
+    ]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    await asyncio.wait_for(writer.drain(), timeout)
+
+    status = await readline(reader, timeout)
+    parts = status.decode("latin-1").split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/") or not parts[1].isdigit():
+        raise requests.ConnectionError(f"Invalid status line from '{url}': {status}")
+    headers = CaseInsensitiveDict()
+    while True:
+        line = await readline(reader, timeout)
+        if line.strip() == b"":
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip()] = value.strip()
+    reason = parts[2].strip() if len(parts) > 2 else ""
+    return Response(url, int(parts[1]), reason, headers)
+
+
+async def readline(reader, timeout):
+    """Return the next line of the stream."""
+    return await asyncio.wait_for(reader.readline(), timeout)
+
+
+async def read_body(reader, headers, file, timeout):
+    """Write the body of the response to the file object, and return the number of
+    bytes of the body, before decoding."""
+    encoding = headers.get("content-encoding", "identity").lower()
+    if encoding in ["gzip", "deflate"]:
+        file = DecodedFile(file)
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        count = 0
+        while True:
+            size = int((await readline(reader, timeout)).split(b";")[0], 16)
+            if size == 0:
+                break
+            count += await copy(reader, file, size, timeout)
+            await readline(reader, timeout)
+    else:
+        size = headers.get("content-length")
+        count = await copy(reader, file, None if size is None else int(size), timeout)
+    if isinstance(file, DecodedFile):
+        file.flush()
+    return count
+
+
+async def copy(reader, file, size, timeout):
+    """Copy `size` bytes, or the bytes up to the end of the stream when the size is
+    None, from the stream to the file object, and return the number of bytes."""
+    count = 0
+    while size is None or count < size:
+        length = READ_SIZE if size is None else min(READ_SIZE, size - count)
+        data = await asyncio.wait_for(reader.read(length), timeout)
+        if not data:
+            break
+        file.write(data)
+        count += len(data)
+    return count
+
+
+class DecodedFile:
+    """A file object writing the decompressed gzip or zlib data to the file."""
+
+    __slots__ = ("file", "decompressor")
+
+    def __init__(self, file):
+        """Initialize."""
+        self.file = file
+        # the window bits of the automatic gzip or zlib header detection.
+        self.decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+
+    def write(self, data):
+        """Write the decompressed data."""
+        self.file.write(self.decompressor.decompress(data))
+
+    def flush(self):
+        """Write the remaining decompressed data."""
+        self.file.write(self.decompressor.flush())
@@ -5,10 +5,18 @@ from copy import deepcopy
 
 import numpy as np
 
+from csdmpy.dependent_variable.chunked import write_chunked
+from csdmpy.dependent_variable.decoder import LazyComponents
+from csdmpy.dependent_variable.decoder import real_dtype
 from csdmpy.dependent_variable.download import get_relative_url_path
+from csdmpy.dependent_variable.encoder import StreamedBase64
+from csdmpy.dependent_variable.encoder import StreamedText
 from csdmpy.dependent_variable.sparse import SparseSampling
+from csdmpy.dependent_variable.tiled import write_tiled
+from csdmpy.dependent_variable.virtual import VirtualComponents
 from csdmpy.units import check_quantity_name
 from csdmpy.units import ScalarQuantity
+from csdmpy.utils import _deepcopy_slots
 from csdmpy.utils import check_encoding
 from csdmpy.utils import NumericType
 from csdmpy.utils import numpy_dtype_to_numeric_type
@@ -19,6 +27,10 @@ __author__ = "Deepansh J. Srivastava"
 __email__ = "srivastava.89@osu.edu"
 __all__ = ["BaseDependentVariable"]
 
+# the key of the `application` metadata with the layout of the binary file of a
+# chunked or tiled external dependent variable.
+LAYOUT_KEY = "csdmpy"
+
 
 class BaseDependentVariable:
     """BaseDependentVariable class."""
@@ -34,7 +46,7 @@ class BaseDependentVariable:
         "_application",
         "_description",
         "_sparse_sampling",
-        "_components",
+        "_array",
     )
 
     def __init__(
@@ -74,6 +86,70 @@ class BaseDependentVariable:
         check += [np.allclose(self._components, other._components)]
         return False if False in check else True
 
+    def __deepcopy__(self, memo):
+        """Return a copy with a copy of the components array. The unit, numeric type,
+        and quantity type are shared with the copy."""
+        return _deepcopy_slots(self, memo)
+
+    @property
+    def _components(self):
+        """Return the components array, decoding the lazy components, if any."""
+        if isinstance(self._array, LazyComponents):
+            lazy = self._array
+            self._array = lazy.decode(self)
+            if lazy.shape is not None:
+                self._reshape(lazy.shape)
+        return self._array
+
+    @_components.setter
+    def _components(self, value):
+        self._array = value
+
+    def is_lazy(self):
+        """Return True if the components are not yet decoded, otherwise False."""
+        return isinstance(self._array, LazyComponents)
+
+    def _region(self, section):
+        """Return the components array at the section, a tuple of indices. The
+        section of virtual components is read from the datasets it spans."""
+        if isinstance(self._array, VirtualComponents):
+            return self._array.region(section)
+        return self._components[section]
+
+    def _reshape(self, shape):
+        r"""Reshape the components array to the grid `shape`.
+
+        The array is reshaped to :math:`(p \times N_{d-1} \times ... N_1 \times N_0)`
+        where :math:`p` is the number of components and :math:`N_k` is the number of
+        points along the :math:`k^\mathrm{th}` dimension. For lazy components, the
+        shape is recorded and applied after decoding.
+        """
+        if self.is_lazy():
+            self._array.shape = tuple(shape)
+            return
+
+        sub_shape = (self._quantity_type.p,) + tuple(shape)
+        if self.components.shape == sub_shape:
+            return
+
+        dtype = self._numeric_type.dtype
+
+        grid_points = np.asarray(sub_shape).prod()
+        components_size = self._components.size
+
+        if grid_points != components_size and self._sparse_sampling == {}:
+            warnings.warn(
+                "The number of elements in the components array, "
+                f"{components_size}, is not consistent with the total "
+                f"number of grid points, {grid_points}."
+            )
+        if self._sparse_sampling == {}:
+            self._components = np.asarray(
+                self._components[:, :grid_points].reshape(sub_shape), dtype=dtype
+            )
+        else:
+            self._components = fill_sparse_space(self, sub_shape, dtype)
+
     def set_component_labels(self, component_labels):
         """Assign an array of strings, based on the number of components.
 
@@ -223,8 +299,25 @@ class BaseDependentVariable:
         """Alias to the `dict()` method of the class."""
         return self.dict(filename, dataset_index, for_display)
 
-    def dict(self, filename=None, dataset_index=None, for_display=False):
-        """Return a dictionary object of the base class."""
+    def dict(
+        self,
+        filename=None,
+        dataset_index=None,
+        for_display=False,
+        stream=False,
+        components=True,
+        compression=None,
+        tiles=None,
+    ):
+        """Return a dictionary object of the base class.
+
+        When stream is True, the components are placeholders that are encoded in
+        chunks by the `encoder.dump` function. When components is False, the
+        components are not encoded, and the `components` key is omitted. The
+        compression is the codec of the chunked binary file of the `raw` encoding,
+        and tiles is the tile shape, in the order of the dimensions, of the tiled
+        binary file of the `raw` encoding.
+        """
         obj = {}
         obj["description"] = self._description.strip()
         obj["name"] = self._name.strip()
@@ -253,30 +346,77 @@ class BaseDependentVariable:
             del obj["encoding"]
             return obj
 
-        self.get_proper_encoded_data(obj, filename, dataset_index)
+        if components:
+            self.get_proper_encoded_data(
+                obj, filename, dataset_index, stream, compression, tiles
+            )
         return obj
 
-    def get_proper_encoded_data(self, obj, filename=None, dataset_index=None):
-        """Encode dependent variables to encoding type."""
+    def get_proper_encoded_data(
+        self,
+        obj,
+        filename=None,
+        dataset_index=None,
+        stream=False,
+        compression=None,
+        tiles=None,
+    ):
+        """Encode dependent variables to encoding type. With the `raw` encoding and a
+        compression codec, the components are written as a chunked binary file, and
+        the codec is recorded under the LAYOUT_KEY of the `application`. With the
+        `raw` encoding and tiles, the components are written as a tiled binary file,
+        where the tiles are compressed with the compression codec, if any, and the
+        layout is likewise recorded."""
         data = self.ravel_data()
 
         if self.encoding == "none":
-            obj["components"] = data.tolist()
+            obj["components"] = (
+                [StreamedText(_) for _ in data] if stream else data.tolist()
+            )
 
         if self.encoding == "base64":
-            obj["components"] = [base64.b64encode(_).decode("utf-8") for _ in data]
+            obj["components"] = (
+                [StreamedBase64(_) for _ in data]
+                if stream
+                else [base64.b64encode(_).decode("utf-8") for _ in data]
+            )
 
         if self.encoding == "raw":
             url_relative_path, absolute_path = get_relative_url_path(
                 dataset_index, filename
             )
 
-            data.ravel().tofile(absolute_path)
-
+            layout = None
+            if tiles is not None and self._sparse_sampling == {}:
+                with open(absolute_path, "wb") as file:
+                    self.write_tiled(file, tiles, compression)
+                layout = {"layout": "tiled", "compression": compression}
+            elif compression is None:
+                data.ravel().tofile(absolute_path)
+            else:
+                with open(absolute_path, "wb") as file:
+                    write_chunked(data, file, compression)
+                layout = {"layout": "chunked", "compression": compression}
+
+            # the readers unaware of the layout read the binary file as raw values.
+            if layout is not None:
+                application = obj.get("application", {})
+                obj["application"] = {**application, LAYOUT_KEY: layout}
             obj["type"] = "external"
             obj["components_url"] = url_relative_path
             del obj["encoding"]
 
+    def write_tiled(self, file, tiles, codec=None):
+        """Write the components as a tiled binary file. The tiles span a single
+        component, and `tiles` is the tile shape in the order of the dimensions."""
+        components = np.ascontiguousarray(
+            self._components, dtype=self._numeric_type.dtype
+        )
+        if len(tiles) != components.ndim - 1:
+            components = components.reshape(self._quantity_type.p, -1)
+            tiles = [int(np.prod(tiles))]
+        write_tiled(components, file, [1] + list(tiles[::-1]), codec)
+
     def set_components(self, _components, _numeric_type=None):
         """Set dependent variable components."""
         if _numeric_type is None:
@@ -285,27 +425,36 @@ class BaseDependentVariable:
         self._components = np.asarray(_components, self._numeric_type.dtype)
 
     def ravel_data(self):
-        """Encode data based on the encoding key value."""
+        """Return the components as a C-contiguous (p, N) array for encoding.
+
+        Complex components are returned as a (p, 2N) float view of interleaved real
+        and imaginary values. No copy is made when the components array is already
+        C-contiguous.
+        """
         n_1 = self._quantity_type.p
-        size = self._components[0].size
-        if self._numeric_type.value in ["complex64", "complex128"]:
+        data = np.ascontiguousarray(self._components, dtype=self._numeric_type.dtype)
+        data = data.reshape(n_1, -1)
+        return data.view(real_dtype(data.dtype)) if data.dtype.kind == "c" else data
 
-            if self._numeric_type.value == "complex64":
-                data = np.empty((n_1, size * 2), dtype=np.float32)
 
-            if self._numeric_type.value == "complex128":
-                data = np.empty((n_1, size * 2), dtype=np.float64)
+def fill_sparse_space(item, shape, dtype):
+    """Fill sparse grid using numpy broadcasting."""
+    components = np.zeros(shape, dtype=dtype)
+    sparse_dimensions_indexes = item._sparse_sampling._sparse_dimensions_indexes
+    sgs = item._sparse_sampling._sparse_grid_vertexes.size
+    grid_vertexes = item._sparse_sampling._sparse_grid_vertexes.reshape(
+        int(sgs / len(sparse_dimensions_indexes)), len(sparse_dimensions_indexes)
+    ).T
 
-            for i in range(n_1):
-                data[i, 0::2] = self._components.real[i].ravel()
-                data[i, 1::2] = self._components.imag[i].ravel()
+    vertexes = [slice(None) for i in range(len(shape))]
+    for i, sparse_index in enumerate(sparse_dimensions_indexes):
+        vertexes[sparse_index] = grid_vertexes[i]
 
-        else:
-            data = np.empty((n_1, size), dtype=self._numeric_type.dtype)
-            for i in range(n_1):
-                data[i] = self._components[i].ravel()
+    vertexes = tuple(vertexes[::-1])
+    _new_shape = components[vertexes].shape
 
-        return data
+    components[vertexes] = item.components.reshape(_new_shape)
+    return components
 
 
 def reduced_display(_components):
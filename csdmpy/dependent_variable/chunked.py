@@ -0,0 +1,240 @@
+"""Chunked and compressed binary files of the components."""
+import bz2
+import json
+import lzma
+import struct
+import zlib
+from concurrent import futures
+
+import numpy as np
+
+from csdmpy.dependent_variable.region import readinto
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["ChunkedReader", "is_chunked", "write_chunked", "CODECS"]
+
+MAGIC = b"CSDFZ\x00\x00\x01"
+
+# the offset and the size of the chunk index, followed by the magic bytes.
+FOOTER = struct.Struct("<QQ8s")
+
+# uncompressed size, in bytes, of a chunk.
+CHUNK_SIZE = 2**20
+
+CODECS = {
+    "zlib": (zlib.compress, zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+    "bz2": (bz2.compress, bz2.decompress),
+}
+
+
+def is_chunked(file):
+    """Return true if the binary file object, or buffer, starts with the magic bytes
+    of a chunked file."""
+    if not hasattr(file, "readinto"):
+        return bytes(file[: len(MAGIC)]) == MAGIC
+    position = file.tell()
+    magic = bytearray(len(MAGIC))
+    size = file.readinto(magic)
+    file.seek(position)
+    return size == len(MAGIC) and bytes(magic) == MAGIC
+
+
+def read_footer(file, magic=MAGIC, name="chunk"):
+    """Return the offset and the size of the index from the footer at the end of
+    the binary file object, with the index of the `name` items. The size of the
+    file is the `size` attribute of the file object, if any."""
+    size = getattr(file, "size", None)
+    size = file.seek(0, 2) if size is None else size
+    footer = np.empty(FOOTER.size, dtype=np.uint8)
+    file.seek(size - FOOTER.size)
+    readinto(file, footer)
+    offset, length, found = FOOTER.unpack(footer.tobytes())
+    if found != magic:
+        raise ValueError(f"The binary file is missing the {name} index.")
+    return offset, length
+
+
+def check_codec(codec):
+    """Raise a ValueError if the codec is not one of CODECS."""
+    if codec not in CODECS:
+        allowed = ", ".join(f"'{item}'" for item in CODECS)
+        raise ValueError(
+            f"The value, `{codec}`, is an invalid `compression`. The allowed values "
+            f"are {allowed}."
+        )
+
+
+def shuffle(chunk, itemsize):
+    """Return the bytes of the uint8 chunk, grouped by their position within an
+    item, that is, all the first bytes of the items, then the second bytes, etc."""
+    return np.ascontiguousarray(chunk.reshape(-1, itemsize).T)
+
+
+def unshuffle(chunk, itemsize, out):
+    """Write the bytes of the shuffled uint8 chunk to the uint8 array `out` in their
+    original order."""
+    out.reshape(-1, itemsize)[...] = chunk.reshape(itemsize, -1).T
+
+
+def write_chunked(array, file, codec="zlib", chunk_size=None, workers=None):
+    """Write the array to the binary file object as a chunked and compressed file.
+
+    The bytes of the C-ordered array are split into chunks of `chunk_size` bytes,
+    which are byte-shuffled and compressed in parallel. The file is laid out as the
+    MAGIC bytes, the compressed chunks, the JSON chunk index, and the footer with
+    the offset and size of the index.
+
+    Args:
+        array: The numpy array.
+        file: A binary file object.
+        codec: The compression codec, one of 'zlib', 'lzma', and 'bz2'.
+        chunk_size: The uncompressed size of a chunk, in bytes, rounded down to a
+            multiple of the itemsize. The default is CHUNK_SIZE.
+        workers: The maximum number of compression threads.
+    """
+    check_codec(codec)
+    compress = CODECS[codec][0]
+    itemsize = array.dtype.itemsize
+    chunk_size = CHUNK_SIZE if chunk_size is None else chunk_size
+    chunk_size = max(chunk_size // itemsize, 1) * itemsize
+    buffer = np.ascontiguousarray(array).reshape(-1).view(np.uint8)
+
+    def task(start):
+        return compress(shuffle(buffer[start : start + chunk_size], itemsize))
+
+    file.write(MAGIC)
+    offset, chunks = len(MAGIC), []
+    with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        for data in pool.map(task, range(0, buffer.size, chunk_size)):
+            file.write(data)
+            chunks.append([offset, len(data)])
+            offset += len(data)
+
+    index = dict(
+        codec=codec,
+        itemsize=itemsize,
+        size=buffer.size,
+        chunk_size=chunk_size,
+        chunks=chunks,
+    )
+    index = json.dumps(index).encode("utf-8")
+    file.write(index)
+    file.write(FOOTER.pack(offset, len(index), MAGIC))
+
+
+class ChunkedReader:
+    """A read-only binary file object over the uncompressed bytes of a chunked file.
+
+    Only the chunks touched by a read are decompressed. The last decompressed chunk
+    is kept, such that consecutive reads within a chunk decompress it once.
+
+    Args:
+        file: The binary file object of the chunked file. The size of the file is
+            the `size` attribute of the file object, if any.
+    """
+
+    __slots__ = (
+        "file",
+        "codec",
+        "itemsize",
+        "size",
+        "chunk_size",
+        "chunks",
+        "position",
+        "cache",
+    )
+
+    def __init__(self, file):
+        """Initialize."""
+        offset, length = read_footer(file)
+        file.seek(offset)
+        index = np.empty(length, dtype=np.uint8)
+        readinto(file, index)
+        index = json.loads(index.tobytes().decode("utf-8"))
+        check_codec(index["codec"])
+
+        self.file = file
+        self.codec = index["codec"]
+        self.itemsize = index["itemsize"]
+        self.size = index["size"]
+        self.chunk_size = index["chunk_size"]
+        self.chunks = index["chunks"]
+        self.position = 0
+        self.cache = (None, None)
+
+    def seek(self, offset, whence=0):
+        """Move to the byte offset of the uncompressed bytes."""
+        if whence != 0:
+            raise ValueError("ChunkedReader only supports seeking from the start.")
+        self.position = offset
+        return offset
+
+    def tell(self):
+        """Return the current byte offset."""
+        return self.position
+
+    def readinto(self, buffer):
+        """Read the uncompressed bytes at the current offset into the buffer, and
+        return the number of bytes read."""
+        view = memoryview(buffer).cast("B")
+        count = 0
+        while count < len(view) and self.position < self.size:
+            i, start = divmod(self.position, self.chunk_size)
+            chunk = self.chunk(i)
+            size = min(len(view) - count, chunk.size - start)
+            view[count : count + size] = chunk[start : start + size]
+            count += size
+            self.position += size
+        return count
+
+    def chunk(self, i):
+        """Return the uncompressed chunk `i` as a uint8 array."""
+        if self.cache[0] != i:
+            offset, length = self.chunks[i]
+            data = np.empty(length, dtype=np.uint8)
+            self.file.seek(offset)
+            readinto(self.file, data)
+            size = min(self.chunk_size, self.size - i * self.chunk_size)
+            out = np.empty(size, dtype=np.uint8)
+            self.decompress(data, out)
+            self.cache = (i, out)
+        return self.cache[1]
+
+    def decompress(self, data, out):
+        """Decompress the chunk data into the uint8 array `out`."""
+        chunk = CODECS[self.codec][1](memoryview(data))
+        chunk = np.frombuffer(chunk, dtype=np.uint8)
+        if chunk.size != out.size:
+            raise ValueError(
+                f"Expecting {out.size} bytes from the compressed chunk, found "
+                f"{chunk.size}."
+            )
+        unshuffle(chunk, self.itemsize, out)
+
+    def read_array(self, dtype, workers=None):
+        """Return the uncompressed bytes as a 1D array of the dtype. The chunks are
+        decompressed in parallel."""
+        dtype = np.dtype(dtype)
+        if self.size % dtype.itemsize != 0:
+            raise ValueError("buffer size must be a multiple of element size")
+        array = np.empty(self.size // dtype.itemsize, dtype=dtype)
+        buffer = array.view(np.uint8)
+
+        def task(item):
+            i, data = item
+            start = i * self.chunk_size
+            self.decompress(data, buffer[start : start + self.chunk_size])
+
+        with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            _ = list(pool.map(task, enumerate(self.read_chunks())))
+        return array
+
+    def read_chunks(self):
+        """Yield the compressed data of every chunk."""
+        for offset, length in self.chunks:
+            data = np.empty(length, dtype=np.uint8)
+            self.file.seek(offset)
+            readinto(self.file, data)
+            yield data
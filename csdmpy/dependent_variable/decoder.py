@@ -1,12 +1,15 @@
 """Decoder for components' encoding types."""
-import base64
+import binascii
 
 import numpy as np
 
 
 __author__ = "Deepansh J. Srivastava"
 __email__ = "srivastava.89@osu.edu"
-__all__ = ["Decoder"]
+__all__ = ["Decoder", "LazyComponents"]
+
+# number of base64 characters decoded at once, a multiple of four.
+BASE64_CHUNK_SIZE = 4 * 2**18
 
 
 class Decoder:
@@ -25,26 +28,41 @@ class Decoder:
 
     @staticmethod
     def decode_base64(components, dtype, component_len=None):
-        """Read components form a base64 buffer"""
-        components = np.asarray(
-            [np.frombuffer(base64.b64decode(item), dtype=dtype) for item in components]
-        )
-        return components
+        """Read components form a base64 buffer.
+
+        The final array is allocated once, and each component is decoded in chunks
+        of BASE64_CHUNK_SIZE characters directly into its row. The whitespace, such
+        as the line breaks of a wrapped base64 string, is ignored.
+        """
+        dtype = np.dtype(dtype)
+        components = [strip_whitespace(item) for item in components]
+        sizes = {base64_decoded_length(item) for item in components}
+        if len(sizes) > 1:
+            raise ValueError(
+                "The base64 encoded components have different lengths, "
+                f"{sorted(sizes)} bytes."
+            )
+        size = sizes.pop() if sizes else 0
+        if size % dtype.itemsize != 0:
+            raise ValueError("buffer size must be a multiple of element size")
+
+        components_ = np.empty((len(components), size // dtype.itemsize), dtype=dtype)
+        buffer = components_.view(np.uint8).reshape(len(components), size)
+        for item, row in zip(components, buffer):
+            decode_base64_into(item, row)
+        return components_
 
     @staticmethod
     def decode_none(components, dtype, component_len=None):
-        """Read components form a text buffer"""
-        return (
-            np.asarray(
-                [
-                    np.asarray(item[0::2]) + 1j * np.asarray(item[1::2])
-                    for item in components
-                ],
-                dtype=dtype,
-            )
-            if dtype in ["<c8", "<c16", ">c8", ">c16"]
-            else np.asarray(components, dtype=dtype)
-        )
+        """Read components form a text buffer.
+
+        The interleaved real and imaginary values of complex components are read as
+        one contiguous float array, which is then viewed as a complex array.
+        """
+        dtype = np.dtype(dtype)
+        if dtype.kind == "c":
+            return np.asarray(components, dtype=real_dtype(dtype)).view(dtype)
+        return np.asarray(components, dtype=dtype)
 
     @staticmethod
     def decode_raw(components, dtype, component_len=None):
@@ -55,6 +73,66 @@ class Decoder:
         return components
 
 
+def real_dtype(dtype):
+    """Return the float dtype of the real and imaginary parts of a complex dtype."""
+    return np.dtype(f"{dtype.str[0]}f{dtype.itemsize // 2}")
+
+
+def strip_whitespace(string):
+    """Return the base64 `string` without the whitespace, or the `string` itself, if
+    it has no whitespace."""
+    if string.split(None, 1) == [string]:
+        return string
+    return "".join(string.split())
+
+
+def base64_decoded_length(string):
+    """Return the number of bytes encoded in the base64 `string`, without
+    whitespace."""
+    padding = len(string) - len(string.rstrip("="))
+    return len(string) * 3 // 4 - padding
+
+
+def decode_base64_into(string, buffer):
+    """Decode the base64 `string`, without whitespace, into the uint8 array `buffer`,
+    chunk by chunk."""
+    view = memoryview(buffer)
+    position = 0
+    for i in range(0, len(string), BASE64_CHUNK_SIZE):
+        chunk = binascii.a2b_base64(string[i : i + BASE64_CHUNK_SIZE])
+        view[position : position + len(chunk)] = chunk
+        position += len(chunk)
+    if position != buffer.size:
+        raise ValueError(
+            f"Expecting {buffer.size} bytes from the base64 string, found {position}."
+        )
+
+
+class LazyComponents:
+    """A deferred decoding of the components of a dependent variable.
+
+    The instance holds the encoding, quantity type, and dtype of the components along
+    with the source, that is, the encoded buffer or the url of the binary file. The
+    components are decoded with the `_decode` method of the dependent variable on the
+    first access of the components array. The grid `shape` is recorded when the
+    components are reshaped before decoding.
+    """
+
+    __slots__ = ("encoding", "quantity_type", "dtype", "source", "shape")
+
+    def __init__(self, encoding, quantity_type, dtype, source):
+        """Initialize."""
+        self.encoding = encoding
+        self.quantity_type = quantity_type
+        self.dtype = dtype
+        self.source = source
+        self.shape = None
+
+    def decode(self, variable):
+        """Return the components array decoded by the dependent variable."""
+        return variable._decode(self)
+
+
 def check_number_of_components_and_encoding_type(length, quantity_type):
     """Verify the consistency of encoding wrt the number of components."""
     if length != quantity_type.p:
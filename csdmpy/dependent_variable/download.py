@@ -1,15 +1,271 @@
 """Utility functions for the csdmpy module."""
+import hashlib
+import json
+import os
 import sys
+import tempfile
+import threading
+import time
+from bisect import bisect_right
+from concurrent import futures
+from contextlib import contextmanager
 from os import path
 from urllib.parse import quote
 from urllib.parse import urlparse
+from urllib.request import url2pathname
+from urllib.request import urlopen
 
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
 
+from . import async_http
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
 
 __author__ = "Deepansh J. Srivastava"
 __email__ = "srivastava.89@osu.edu"
-__all__ = ["parse_url", "download_file_from_url"]
+__all__ = [
+    "parse_url",
+    "download_file_from_url",
+    "DownloadCache",
+    "fetch",
+    "fetch_array",
+    "session",
+    "RemoteFile",
+]
+
+# default directory and maximum size, in bytes, of the download cache.
+CACHE_DIR = path.join(path.expanduser("~"), ".cache", "csdmpy")
+CACHE_MAX_SIZE = 2**32
+
+# timeout, in seconds, of the requests to validate a cached file.
+TIMEOUT = 10
+
+# number of bytes read at once from an http response into an array.
+READ_CHUNK_SIZE = 2**20
+
+# maximum number of pooled connections per host, and of concurrent fetches.
+MAX_CONNECTIONS = 8
+
+# minimum size, in bytes, of a file downloaded with parallel Range requests, and the
+# size of each range.
+PARALLEL_MIN_SIZE = 2**26
+PARALLEL_CHUNK_SIZE = 2**23
+
+# cost of an http request, as the equivalent number of bytes transferred. Byte runs
+# separated by fewer bytes are coalesced into a single Range request.
+RANGE_OVERHEAD = 2**18
+
+# interval, in seconds, between two attempts to take a lock without fcntl.
+LOCK_POLL_INTERVAL = 0.1
+
+_SESSION = {}
+
+
+def session():
+    """Return the requests Session shared by all the http requests of the process.
+
+    The session pools up to MAX_CONNECTIONS connections per host, such that the
+    repeated and concurrent requests to a host reuse the open connections.
+    """
+    pid = os.getpid()
+    # a forked process does not share the connections of its parent.
+    if pid not in _SESSION:
+        _SESSION.clear()
+        adapter = HTTPAdapter(pool_maxsize=MAX_CONNECTIONS)
+        _SESSION[pid] = requests.Session()
+        _SESSION[pid].mount("http://", adapter)
+        _SESSION[pid].mount("https://", adapter)
+    return _SESSION[pid]
+
+
+def fetch(url):
+    """Return the content of the url as bytes. The http urls are requested with the
+    shared session."""
+    if parse_url(url).scheme in ["http", "https"]:
+        response = session().get(url)
+        response.raise_for_status()
+        return response.content
+    with urlopen(url) as response:
+        return response.read()
+
+
+def fetch_array(url, dtype):
+    """Return the content of the url as a 1D numpy array of the dtype.
+
+    When the size of the content is known, that is, for local files and for http
+    responses with a Content-Length header and without a Content-Encoding, the
+    array is allocated once and the content is read directly into the array, without
+    an intermediate bytes object.
+
+    Args:
+        url: The url of the binary content.
+        dtype: The dtype of the array.
+    """
+    dtype = np.dtype(dtype)
+    scheme = parse_url(url).scheme
+    if scheme == "file":
+        with open(url2pathname(urlparse(url).path), "rb") as file:
+            return read_array(file, os.fstat(file.fileno()).st_size, dtype)
+
+    if scheme not in ["http", "https"]:
+        return np.frombuffer(fetch(url), dtype)
+
+    with session().get(url, stream=True) as response:
+        response.raise_for_status()
+        size = response.headers.get("content-length")
+        encoding = response.headers.get("content-encoding", "identity")
+        if size is not None and encoding == "identity":
+            return read_array(response.raw, int(size), dtype)
+        return np.frombuffer(response.content, dtype)
+
+
+def read_array(file, size, dtype):
+    """Read `size` bytes from the binary file object into a new 1D array of the
+    dtype, in chunks of at most READ_CHUNK_SIZE bytes."""
+    if size % dtype.itemsize != 0:
+        raise ValueError("buffer size must be a multiple of element size")
+    array = np.empty(size // dtype.itemsize, dtype=dtype)
+    buffer = memoryview(array.view(np.uint8))
+    count = 0
+    while count < size:
+        read = file.readinto(buffer[count : count + READ_CHUNK_SIZE])
+        if not read:
+            break
+        count += read
+    if count != size or file.read(1):
+        raise ValueError(
+            f"Expecting {size} bytes from the url, found a different number of bytes."
+        )
+    return array
+
+
+class RemoteFile:
+    """A read-only binary file object over an http url, which reads the bytes of
+    the url with Range requests.
+
+    The byte runs given to `prefetch` are coalesced into ranges and fetched
+    concurrently with the shared session, after which `seek` and `readinto` read
+    from the fetched ranges. A read outside the fetched ranges is a Range request.
+    When the server ignores the Range header, the full content of the url is kept.
+
+    Args:
+        url: The http url.
+        read_overhead: The cost of a request, as the equivalent number of bytes. The
+            default is RANGE_OVERHEAD.
+    """
+
+    __slots__ = ("url", "read_overhead", "size", "position", "starts", "chunks")
+
+    def __init__(self, url, read_overhead=None):
+        """Initialize."""
+        self.url = url
+        self.read_overhead = RANGE_OVERHEAD if read_overhead is None else read_overhead
+        self.position = 0
+        self.starts = []
+        self.chunks = []
+
+        response = session().head(url, allow_redirects=True, timeout=TIMEOUT)
+        size = response.headers.get("content-length")
+        self.size = int(size) if response.ok and size is not None else None
+
+    def seek(self, offset, whence=0):
+        """Move to the byte offset, relative to the start of the url content."""
+        if whence != 0:
+            raise ValueError("RemoteFile only supports seeking from the start.")
+        self.position = offset
+        return offset
+
+    def tell(self):
+        """Return the current byte offset."""
+        return self.position
+
+    def readinto(self, buffer):
+        """Read bytes at the current offset into the buffer, and return the number
+        of bytes read."""
+        view = memoryview(buffer).cast("B")
+        chunk = self.find(self.position, len(view))
+        if chunk is None:
+            self.prefetch([(self.position, len(view))], read_overhead=0)
+            # a short response covers the start of the bytes, and the remaining
+            # bytes are requested by the next read.
+            chunk = self.find(self.position, min(len(view), 1))
+        if chunk is None:
+            raise ValueError(
+                f"The server returned no bytes of '{self.url}' at the offset "
+                f"{self.position}."
+            )
+
+        start, content = chunk
+        data = content[self.position - start : self.position - start + len(view)]
+        view[: len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+    def find(self, offset, size):
+        """Return the (start, content) fetched range with the bytes from offset to
+        offset + size, if any. The range may end before offset + size at the end of
+        the url content."""
+        i = bisect_right(self.starts, offset) - 1
+        if i < 0:
+            return None
+        start, content = self.starts[i], self.chunks[i]
+        stop = start + len(content)
+        if offset + size <= stop or (stop == self.size and offset <= stop):
+            return start, content
+        return None
+
+    def prefetch(self, runs, read_overhead=None):
+        """Fetch the byte runs, a list of (offset, size) tuples, concurrently.
+
+        Runs separated by at most `read_overhead` bytes are fetched with a single
+        Range request, with up to MAX_CONNECTIONS concurrent requests. The default
+        `read_overhead` is the read_overhead of the instance.
+        """
+        if read_overhead is None:
+            read_overhead = self.read_overhead
+        runs = [item for item in runs if self.find(*item) is None]
+        ranges = coalesce(runs, read_overhead)
+        if len(ranges) < 2:
+            chunks = [self.fetch(*item) for item in ranges]
+        else:
+            workers = min(MAX_CONNECTIONS, len(ranges))
+            with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                chunks = list(pool.map(lambda item: self.fetch(*item), ranges))
+
+        for start, content in chunks:
+            if start == 0 and len(content) == self.size:
+                # the full content supersedes the other ranges.
+                self.starts, self.chunks = [0], [content]
+                return
+            i = bisect_right(self.starts, start)
+            self.starts.insert(i, start)
+            self.chunks.insert(i, content)
+
+    def fetch(self, start, stop):
+        """Return the (start, content) of the bytes from start to stop of the url."""
+        headers = {"Range": f"bytes={start}-{stop - 1}"}
+        response = session().get(self.url, headers=headers, timeout=TIMEOUT)
+        response.raise_for_status()
+        if response.status_code != 206:
+            return 0, response.content
+        return start, response.content
+
+
+def coalesce(runs, gap):
+    """Return the sorted list of the (start, stop) byte ranges that cover the
+    (offset, size) runs, merging the ranges separated by at most `gap` bytes."""
+    ranges = []
+    for offset, size in sorted(runs):
+        if ranges and offset - ranges[-1][1] <= gap:
+            ranges[-1][1] = max(ranges[-1][1], offset + size)
+            continue
+        ranges.append([offset, offset + size])
+    return [tuple(item) for item in ranges]
 
 
 def parse_url(url):
@@ -18,45 +274,492 @@ def parse_url(url):
     return res
 
 
-def download_file_from_url(url, verbose=False):
-    """Download file from url"""
-    res = parse_url(url)
-    filename = path.split(res[2])[1]
-    if path.isfile(filename):
+def download_file_from_url(url, verbose=False, cache=None):
+    """Download the file at the url to the download cache, and return the path of
+    the cached file.
+
+    Args:
+        url: The url of the file.
+        verbose: If true, show the progress bar of the download.
+        cache: The DownloadCache instance. The default is a DownloadCache at the
+            `CSDMPY_CACHE_DIR` environment variable, or CACHE_DIR, if unset.
+    """
+    cache = DownloadCache() if cache is None else cache
+    return cache.get(url, verbose)
+
+
+class DownloadCache:
+    """An on-disk cache of the downloaded files.
+
+    A file is cached under the sha256 key of its url and the validators, that is, the
+    ETag, Last-Modified, and Content-Length headers from a HEAD request to the url.
+    A change of the remote file, therefore, results in a new download. A url
+    without the ETag and Last-Modified headers, or whose HEAD request fails, cannot
+    be revalidated, and is downloaded again on every request. The files
+    are written to a temporary file and atomically moved into the cache, such that
+    concurrent processes share the cache safely. When the total size of the cached
+    files exceeds `max_size`, the least recently used files are removed.
+
+    A sidecar json file, with the key of the last download, is kept for every url,
+    and is used when the url is unreachable.
+
+    Args:
+        directory: The cache directory. The default is the `CSDMPY_CACHE_DIR`
+            environment variable, or CACHE_DIR, if unset.
+        max_size: The maximum size, in bytes, of the cache. The default is the
+            `CSDMPY_CACHE_MAX_SIZE` environment variable, or CACHE_MAX_SIZE, if
+            unset.
+    """
+
+    __slots__ = ("directory", "max_size")
+
+    def __init__(self, directory=None, max_size=None):
+        """Initialize."""
+        if directory is None:
+            directory = os.environ.get("CSDMPY_CACHE_DIR", CACHE_DIR)
+        if max_size is None:
+            max_size = int(os.environ.get("CSDMPY_CACHE_MAX_SIZE", CACHE_MAX_SIZE))
+        self.directory = directory
+        self.max_size = max_size
+
+    def get(self, url, verbose=False):
+        """Return the path of the cached file of the url, downloading the file if
+        it is not in the cache or if it has changed."""
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            validators = self.validators(url)
+        except requests.ConnectionError as error:
+            return self.offline(url, error, verbose)
+
+        filename = self.cache_path(url, validators)
+        if self.is_cached(filename, validators, verbose):
+            return self.touch(filename)
+        self.download(url, filename, verbose, validators)
+        return self.add(url, filename)
+
+    async def aget(self, url, verbose=False):
+        """Coroutine of `get`. The HEAD request and the download of the url are
+        asynchronous http requests, see `async_http`, which do not block the event
+        loop. The file is downloaded with a single request, without the parallel
+        Range requests of `download`."""
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            response = await async_http.request("HEAD", url, timeout=TIMEOUT)
+        except requests.ConnectionError as error:
+            return self.offline(url, error, verbose)
+
+        validators = select_validators(response)
+        filename = self.cache_path(url, validators)
+        if self.is_cached(filename, validators, verbose):
+            return self.touch(filename)
+        await self.adownload(url, filename)
+        return self.add(url, filename)
+
+    @staticmethod
+    def validators(url):
+        """Return the ETag, Last-Modified, and Content-Length headers of the url,
+        along with the Accept-Ranges and Content-Encoding headers, if any."""
+        response = session().head(url, allow_redirects=True, timeout=TIMEOUT)
+        return select_validators(response)
+
+    def cache_path(self, url, validators):
+        """Return the path of the cached file of the url and its validators."""
+        key = cache_key(url, validators)
+        return path.join(self.directory, key + path.splitext(url_basename(url))[1])
+
+    def is_cached(self, filename, validators, verbose=False):
+        """Return true if the file is in the cache, and can be revalidated."""
+        if path.isfile(filename) and revalidated(validators):
+            if verbose:
+                sys.stdout.write(f"Found '{filename}' in cache. Skipping download.\n")
+            return True
+        if path.isfile(filename):
+            # without the ETag and Last-Modified headers, for example, when the HEAD
+            # request fails, the cached file may be stale, and is downloaded again.
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                pass
+        return False
+
+    def offline(self, url, error, verbose=False):
+        """Return the path of the last download of the unreachable url, or raise the
+        connection error if there is none."""
+        filename = self.last_download(url)
+        if filename is None:
+            raise error
         if verbose:
-            sys.stdout.write(
-                f"Found a local file with the filename, {0}. Skipping download."
-            )
+            sys.stdout.write(f"The url is unreachable, using '{filename}'.\n")
+        return self.touch(filename)
+
+    def add(self, url, filename):
+        """Record the downloaded file as the last download of the url, evict the
+        least recently used files, and return the filename."""
+        key = path.splitext(path.basename(filename))[0]
+        self.write_sidecar(url, {"url": url, "key": key, "filename": filename})
+        self.evict(keep=filename)
         return filename
 
-    with open(filename, "wb") as file:
-        response = requests.get(url, stream=True)
-        total = response.headers.get("content-length")
+    def download(self, url, filename, verbose=False, validators=None):
+        """Download the url to filename.
 
-        if total is None:
-            file.write(response.content)
-        else:
-            downloaded = 0
-            total = int(total)
-            if verbose:
-                sys.stdout.write(
-                    "Downloading '{}' from '{}' to file '{}'.\n".format(
-                        res[2], res[1], filename
-                    )
+        A file of at least PARALLEL_MIN_SIZE bytes, from a server that accepts byte
+        ranges, is downloaded with parallel Range requests to the `filename.part`
+        file, see `download_ranges`. A download interrupted by an error is resumed
+        from the `.part` file. Other files are downloaded to a temporary file. The
+        file is moved to filename once its size is verified. The `.part` file is
+        written by one process at a time, see `lock`.
+
+        Args:
+            url: The url of the file.
+            filename: The path of the downloaded file.
+            verbose: If true, show the progress bar of the download.
+            validators: The dictionary of the headers of the url, see `validators`.
+        """
+        validators = {} if validators is None else validators
+        size = int(validators.get("Content-Length", -1))
+        ranges = validators.get("Accept-Ranges") == "bytes"
+        if ranges and "Content-Encoding" not in validators:
+            if size >= PARALLEL_MIN_SIZE:
+                part = filename + ".part"
+                with lock(part + ".lock"):
+                    # another process may have downloaded the file while waiting.
+                    if path.isfile(filename):
+                        return
+                    if download_ranges(url, part, size, verbose):
+                        check_download(url, part, size, validators)
+                        os.replace(part, filename)
+                        os.remove(part + ".json")
+                        return
+
+        descriptor, temp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                write_response(url, file, verbose)
+            os.replace(temp, filename)
+        except BaseException:
+            os.remove(temp)
+            raise
+
+    async def adownload(self, url, filename):
+        """Coroutine of `download`. The url is downloaded with a single asynchronous
+        http request to a temporary file, which is moved to filename once its size
+        is verified."""
+        descriptor, temp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                response = await async_http.request("GET", url, file, timeout=TIMEOUT)
+            response.raise_for_status()
+            total = response.headers.get("content-length")
+            if total is not None and response.size != int(total):
+                raise ValueError(
+                    f"The download of '{url}' is incomplete, {response.size} of "
+                    f"{total} bytes."
                 )
-            for data in response.iter_content(
-                chunk_size=max(int(total / 1000), 1024 * 1024)
-            ):
-                downloaded += len(data)
-                file.write(data)
-                if verbose:
-                    done = int(20 * downloaded / total)
-                    sys.stdout.write("\r[{}{}]".format("█" * done, "." * (20 - done)))
-                    sys.stdout.flush()
+            os.replace(temp, filename)
+        except BaseException:
+            os.remove(temp)
+            raise
+
+    def sidecar(self, url):
+        """Return the path of the sidecar json file of the url."""
+        name = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return path.join(self.directory, name + ".meta.json")
+
+    def write_sidecar(self, url, content):
+        """Atomically write the sidecar json file of the url."""
+        descriptor, temp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        with os.fdopen(descriptor, "w") as file:
+            json.dump(content, file)
+        os.replace(temp, self.sidecar(url))
+
+    def last_download(self, url):
+        """Return the path of the last cached download of the url, if any."""
+        try:
+            with open(self.sidecar(url)) as file:
+                filename = json.load(file)["filename"]
+        except (OSError, ValueError, KeyError):
+            return None
+        return filename if path.isfile(filename) else None
+
+    @staticmethod
+    def touch(filename):
+        """Mark the file as recently used and return its path."""
+        os.utime(filename)
+        return filename
+
+    def evict(self, keep=None):
+        """Remove the least recently used files until the total size of the cache is
+        within `max_size`. The file `keep` is never removed."""
+        files = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or entry.name.startswith(".tmp-"):
+                continue
+            if entry.name.endswith((".meta.json", ".part", ".part.json", ".lock")):
+                continue
+            stat = entry.stat()
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(item[1] for item in files)
+        for _, size, filename in sorted(files):
+            if total <= self.max_size:
+                return
+            if filename == keep:
+                continue
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+def select_validators(response):
+    """Return the validators, that is, the ETag, Last-Modified, and Content-Length
+    headers of the response to a HEAD request, along with the Accept-Ranges and
+    Content-Encoding headers, if any. A failed request has no validators."""
+    if not response.ok:
+        return {}
+    keys = ["ETag", "Last-Modified", "Content-Length"]
+    keys += ["Accept-Ranges", "Content-Encoding"]
+    return {k: response.headers[k] for k in keys if k in response.headers}
+
+
+def revalidated(validators):
+    """Return true if the validators identify the version of the remote file, that
+    is, if they include the ETag or the Last-Modified header."""
+    return "ETag" in validators or "Last-Modified" in validators
+
+
+def cache_key(url, validators):
+    """Return the sha256 key of the url and its validators."""
+    keys = ["ETag", "Last-Modified", "Content-Length"]
+    content = "\n".join([url] + [validators.get(k, "") for k in keys])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def url_basename(url):
+    """Return the basename of the path of the url."""
+    return path.split(parse_url(url)[2])[1]
+
+
+def write_response(url, file, verbose=False):
+    """Write the content of the url to the binary file object. The number of bytes
+    written is verified against the Content-Length header, if any."""
+    res = parse_url(url)
+    response = session().get(url, stream=True)
+    response.raise_for_status()
+    total = response.headers.get("content-length")
+
+    if total is None:
+        file.write(response.content)
+        return
+
+    downloaded = 0
+    total = int(total)
+    if verbose:
+        sys.stdout.write("Downloading '{}' from '{}'.\n".format(res[2], res[1]))
+    for data in response.iter_content(chunk_size=max(int(total / 1000), 1024 * 1024)):
+        downloaded += len(data)
+        file.write(data)
+        if verbose:
+            progress_bar(downloaded, total)
+    if verbose:
+        sys.stdout.write("\n")
+
+    # the Content-Length of an encoded response is the size before decoding.
+    if "content-encoding" not in response.headers and downloaded != total:
+        raise ValueError(
+            f"The download of '{url}' is incomplete, {downloaded} of {total} bytes."
+        )
+
+
+def download_ranges(url, part, size, verbose=False):
+    """Download the url to the `part` file with parallel Range requests.
+
+    The file is split into ranges of PARALLEL_CHUNK_SIZE bytes, which are fetched
+    with up to MAX_CONNECTIONS concurrent requests, and written in place to the
+    `part` file. The completed ranges are recorded in the `part.json` progress file,
+    such that an interrupted download fetches only the missing ranges.
+
+    Args:
+        url: The url of the file.
+        part: The path of the partially downloaded file.
+        size: The size, in bytes, of the file.
+        verbose: If true, show the progress bar of the download.
+
+    Returns:
+        True, if every range is downloaded, or false, if the server does not respond
+        to the Range requests with partial content. In the latter case, the `part`
+        and progress files are removed.
+    """
+    progress = part + ".json"
+    done = resume(part, size)
+    starts = range(0, size, PARALLEL_CHUNK_SIZE)
+    missing = [item for item in starts if item not in done]
+    lock = threading.Lock()
+
+    def fetch_range(start):
+        stop = min(start + PARALLEL_CHUNK_SIZE, size)
+        if not write_range(url, part, start, stop):
+            return False
+        with lock:
+            done.add(start)
+            write_progress(progress, size, done)
+            if verbose:
+                progress_bar(len(done), len(starts))
+        return True
+
+    if verbose:
+        sys.stdout.write(f"Downloading '{url}' with {MAX_CONNECTIONS} connections.\n")
+    results = []
+    if missing:
+        workers = min(MAX_CONNECTIONS, len(missing))
+        with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(fetch_range, missing))
     if verbose:
         sys.stdout.write("\n")
 
-    return filename
+    if not all(results):
+        for filename in [part, progress]:
+            if path.isfile(filename):
+                os.remove(filename)
+        return False
+    return True
+
+
+def resume(part, size):
+    """Return the set of the start offsets of the downloaded ranges of the `part`
+    file. If the download cannot be resumed, the `part` file is created, or resized,
+    to the size, and the set is empty. The caller holds the lock of the `part`
+    file."""
+    done = read_progress(part + ".json", size)
+    with open(part, "r+b" if path.isfile(part) else "xb") as file:
+        if done is None or os.fstat(file.fileno()).st_size != size:
+            file.truncate(size)
+            return set()
+    return done
+
+
+def check_download(url, part, size, validators):
+    """Raise a ValueError, and remove the `part` and progress files, if the size of
+    the `part` file is not the size, or if its md5 checksum is not the ETag of the
+    url, when the ETag is an md5 checksum."""
+    etag = validators.get("ETag", "").strip('"')
+    md5 = len(etag) == 32 and all(item in "0123456789abcdef" for item in etag)
+    error = None
+    if path.getsize(part) != size:
+        error = f"{path.getsize(part)} of {size} bytes"
+    elif md5 and file_md5(part) != etag:
+        error = "the md5 checksum differs from the ETag"
+    if error is None:
+        return
+    for filename in [part, part + ".json"]:
+        if path.isfile(filename):
+            os.remove(filename)
+    raise ValueError(f"The download of '{url}' is corrupt, {error}.")
+
+
+def file_md5(filename):
+    """Return the hex md5 checksum of the file."""
+    checksum = hashlib.md5()
+    with open(filename, "rb") as file:
+        for data in iter(lambda: file.read(READ_CHUNK_SIZE), b""):
+            checksum.update(data)
+    return checksum.hexdigest()
+
+
+@contextmanager
+def lock(filename):
+    """Hold an exclusive lock on the lock file `filename` within the context, across
+    the threads and the processes. The lock file is removed on release.
+
+    With fcntl, the lock is an flock of the lock file, which is released when the
+    process exits. A waiter that locked a lock file since removed retries with the
+    new lock file. Otherwise, the lock file is created exclusively, and the waiters
+    poll for its removal.
+    """
+    descriptor = acquire(filename) if fcntl is not None else acquire_exclusive(filename)
+    try:
+        yield
+    finally:
+        # an flocked lock file is removed before its release.
+        if fcntl is None:  # pragma: no cover
+            os.close(descriptor)
+        os.remove(filename)
+        if fcntl is not None:
+            os.close(descriptor)
+
+
+def acquire(filename):
+    """Return the descriptor of the lock file, once flocked."""
+    while True:
+        descriptor = os.open(filename, os.O_CREAT | os.O_RDWR)
+        fcntl.flock(descriptor, fcntl.LOCK_EX)
+        try:
+            if os.stat(filename).st_ino == os.fstat(descriptor).st_ino:
+                return descriptor
+        except FileNotFoundError:
+            pass
+        os.close(descriptor)
+
+
+def acquire_exclusive(filename):  # pragma: no cover
+    """Return the descriptor of the lock file, once created exclusively."""
+    while True:
+        try:
+            return os.open(filename, os.O_CREAT | os.O_EXCL | os.O_RDWR)
+        except FileExistsError:
+            time.sleep(LOCK_POLL_INTERVAL)
+
+
+def write_range(url, part, start, stop):
+    """Write the bytes from start to stop of the url to the same bytes of the `part`
+    file. Return false if the server does not respond with partial content."""
+    headers = {"Range": f"bytes={start}-{stop - 1}", "Accept-Encoding": "identity"}
+    with session().get(url, headers=headers, stream=True, timeout=TIMEOUT) as res:
+        res.raise_for_status()
+        if res.status_code != 206:
+            return False
+        count, size = 0, stop - start
+        with open(part, "r+b") as file:
+            file.seek(start)
+            for data in res.iter_content(chunk_size=READ_CHUNK_SIZE):
+                count += file.write(data[: size - count])
+    if count != size:
+        raise ValueError(
+            f"The range {start}-{stop - 1} of '{url}' is incomplete, {count} of "
+            f"{size} bytes."
+        )
+    return True
+
+
+def read_progress(progress, size):
+    """Return the set of the start offsets of the downloaded ranges from the progress
+    file, or None if the file is missing or inconsistent with the size."""
+    try:
+        with open(progress) as file:
+            content = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if content.get("size") != size or content.get("chunk") != PARALLEL_CHUNK_SIZE:
+        return None
+    return set(content.get("done", []))
+
+
+def write_progress(progress, size, done):
+    """Atomically write the progress file of a download."""
+    content = {"size": size, "chunk": PARALLEL_CHUNK_SIZE, "done": sorted(done)}
+    descriptor, temp = tempfile.mkstemp(dir=path.dirname(progress), prefix=".tmp-")
+    with os.fdopen(descriptor, "w") as file:
+        json.dump(content, file)
+    os.replace(temp, progress)
+
+
+def progress_bar(done, total):
+    """Write a progress bar of the fraction done / total to the stdout."""
+    done = int(20 * done / total)
+    sys.stdout.write("\r[{}{}]".format("█" * done, "." * (20 - done)))
+    sys.stdout.flush()
 
 
 def _get_absolute_data_address(data_path, file):
@@ -0,0 +1,101 @@
+"""Streaming encoder for components' encoding types."""
+import binascii
+import json
+import re
+import uuid
+
+import numpy as np
+
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["dump", "StreamedBase64", "StreamedText"]
+
+# number of bytes encoded to base64 at once, a multiple of three.
+BASE64_CHUNK_SIZE = 3 * 2**18
+
+# number of values converted to python objects at once.
+TEXT_CHUNK_SIZE = 2**16
+
+TOKEN_PREFIX = "csdmpy-base64-"
+TOKEN = re.compile(f'"({TOKEN_PREFIX}[0-9a-f]{{32}})"')
+
+
+class StreamedText(list):
+    """A component serialized as a JSON list of numbers.
+
+    The json encoder iterates over the instance, which converts the component
+    values to python numbers in chunks of TEXT_CHUNK_SIZE, so the full list is
+    never held in memory.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        super().__init__()
+        self.data = data
+
+    def __len__(self):
+        return self.data.size
+
+    def __iter__(self):
+        for i in range(0, self.data.size, TEXT_CHUNK_SIZE):
+            yield from self.data[i : i + TEXT_CHUNK_SIZE].tolist()
+
+
+class StreamedBase64(str):
+    """A component serialized as a base64 JSON string.
+
+    The instance is a unique placeholder token, which the `dump` function replaces
+    with the base64 encoding of the component, written in chunks of
+    BASE64_CHUNK_SIZE bytes.
+    """
+
+    def __new__(cls, data):
+        obj = super().__new__(cls, TOKEN_PREFIX + uuid.uuid4().hex)
+        obj.data = data
+        return obj
+
+    def write(self, fp):
+        """Write the base64 encoding of the component to the file object."""
+        buffer = np.ascontiguousarray(self.data).reshape(-1).view(np.uint8)
+        for i in range(0, buffer.size, BASE64_CHUNK_SIZE):
+            chunk = buffer[i : i + BASE64_CHUNK_SIZE]
+            fp.write(binascii.b2a_base64(chunk, newline=False).decode("ascii"))
+
+
+def dump(obj, fp, **kwargs):
+    """Serialize obj as a JSON formatted stream to the file object fp.
+
+    The output is identical to ``json.dump(obj, fp, **kwargs)``, where the streamed
+    components are replaced by their list or base64 serialization.
+    """
+    streams = {str(item): item for item in find_base64_streams(obj)}
+    for chunk in json.JSONEncoder(**kwargs).iterencode(obj):
+        if streams and TOKEN_PREFIX in chunk:
+            chunk = write_base64_streams(chunk, fp, streams)
+        fp.write(chunk)
+
+
+def write_base64_streams(chunk, fp, streams):
+    """Write the chunk up to the last placeholder token, replacing the tokens with
+    the base64 streams, and return the remainder of the chunk."""
+    index = 0
+    for match in TOKEN.finditer(chunk):
+        if match.group(1) not in streams:
+            continue
+        fp.write(chunk[index : match.start(1)])
+        streams[match.group(1)].write(fp)
+        index = match.end(1)
+    return chunk[index:]
+
+
+def find_base64_streams(obj):
+    """Return a list of the StreamedBase64 instances nested in obj."""
+    if isinstance(obj, StreamedBase64):
+        return [obj]
+    if isinstance(obj, dict):
+        return [item for value in obj.values() for item in find_base64_streams(value)]
+    if isinstance(obj, list) and not isinstance(obj, StreamedText):
+        return [item for value in obj for item in find_base64_streams(value)]
+    return []
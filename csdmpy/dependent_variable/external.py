@@ -1,11 +1,24 @@
 """The External DependentVariable SubType class."""
-from urllib.request import urlopen
+import io
+import os
+from urllib.parse import urlparse
+from urllib.request import url2pathname
 
 import numpy as np
 
 from csdmpy.dependent_variable.base_class import BaseDependentVariable
+from csdmpy.dependent_variable.base_class import LAYOUT_KEY
+from csdmpy.dependent_variable.chunked import ChunkedReader
+from csdmpy.dependent_variable.chunked import is_chunked
 from csdmpy.dependent_variable.decoder import Decoder
+from csdmpy.dependent_variable.decoder import LazyComponents
+from csdmpy.dependent_variable.download import fetch_array
 from csdmpy.dependent_variable.download import get_absolute_url_path
+from csdmpy.dependent_variable.download import RemoteFile
+from csdmpy.dependent_variable.region import read_region
+from csdmpy.dependent_variable.region import supported_section
+from csdmpy.dependent_variable.tiled import is_tiled
+from csdmpy.dependent_variable.tiled import TiledReader
 
 __author__ = "Deepansh J. Srivastava"
 __email__ = "srivastava.89@osu.edu"
@@ -15,7 +28,7 @@ __all__ = ["ExternalDataset"]
 class ExternalDataset(BaseDependentVariable):
     """ExternalDataset class."""
 
-    __slots__ = ["_components_url"]
+    __slots__ = ["_components_url", "_mmap"]
 
     def __init__(self, **kwargs):
         """Initialize."""
@@ -27,28 +40,160 @@ class ExternalDataset(BaseDependentVariable):
             )
 
         super().__init__(**kwargs)
+        # the layout of a chunked or tiled binary file is read from the file.
+        if self._application is not None and LAYOUT_KEY in self._application:
+            application = self._application.copy()
+            del application[LAYOUT_KEY]
+            self._application = application if application != {} else None
 
         components_url = kwargs["components_url"]
         filename = kwargs["filename"]
         absolute_url = get_absolute_url_path(components_url, filename)
         self._components_url = components_url
+        self._mmap = kwargs.get("mmap", False)
 
-        components = urlopen(absolute_url).read()
-        self._components = Decoder(
-            self._encoding, self._quantity_type, components, self._numeric_type.dtype
+        lazy = LazyComponents(
+            self._encoding,
+            self.quantity_type,
+            self._numeric_type.dtype,
+            absolute_url,
         )
+        self._components = lazy if kwargs.get("lazy", False) else self._decode(lazy)
 
-        if self._components.ndim == 1:
-            self._components = self._components[np.newaxis, :]
+    def _decode(self, lazy):
+        """Read the components from the url of the binary file. A chunked binary file
+        is decompressed in parallel, and a tiled binary file is assembled from its
+        tiles."""
+        components = None
+        if urlparse(lazy.source).scheme == "file":
+            with open(url2pathname(urlparse(lazy.source).path), "rb") as file:
+                components = read_packed(file, lazy.dtype)
+            if components is None and self._mmap:
+                return memmap_components(lazy.source, lazy.dtype, lazy.quantity_type.p)
+
+        if components is None:
+            components = fetch_array(lazy.source, np.uint8)
+            if is_chunked(components) or is_tiled(components):
+                components = read_packed(io.BytesIO(components), lazy.dtype)
+        components = Decoder(lazy.encoding, lazy.quantity_type, components, lazy.dtype)
+        if components.ndim == 1:
+            components = components[np.newaxis, :]
+        return components
+
+    def _reshape(self, shape):
+        """Reshape the components array to the grid `shape`. The components beyond
+        the grid, for example, the slices appended by an AppendWriter after its last
+        flush of the header, are ignored."""
+        if not self.is_lazy() and self._sparse_sampling == {}:
+            count = int(np.prod(shape))
+            if self._components.ndim == 2 and self._components.shape[1] > count:
+                self._components = self._components[:, :count]
+        super()._reshape(shape)
+
+    def _region(self, section):
+        """Return the components array at the section, a tuple of indices.
+
+        When the components are lazy and stored in a local binary file, only the bytes
+        of the section are read from the file, and the components remain lazy. For a
+        chunked binary file, only the chunks with the bytes of the section are
+        decompressed, and for a tiled binary file, only the tiles that intersect the
+        section are read. The bytes of the section of a binary file at an http url
+        are read with Range requests.
+        """
+        if not self.is_lazy() or self._array.shape is None:
+            return super()._region(section)
+        if self._sparse_sampling != {} or not supported_section(section):
+            return super()._region(section)
+
+        lazy = self._array
+        region = None
+        scheme = urlparse(lazy.source).scheme
+        if scheme in ["http", "https"]:
+            file = RemoteFile(lazy.source)
+            region = self._file_region(file, file.size, section, file.read_overhead)
+        elif scheme == "file":
+            with open(url2pathname(urlparse(lazy.source).path), "rb") as file:
+                size = os.fstat(file.fileno()).st_size
+                region = self._file_region(file, size, section)
+        return super()._region(section) if region is None else region
+
+    def _file_region(self, file, file_size, section, read_overhead=None):
+        """Return the components array at the section from the binary file object,
+        or None, when the file is inconsistent with the grid, or memory-mapped."""
+        lazy = self._array
+        shape = (lazy.quantity_type.p,) + lazy.shape
+        if file_size is None:
+            return None
+        # a remote file with the size of the grid is read without the additional
+        # request for the magic bytes.
+        plain = file_size == lazy.dtype.itemsize * np.prod(shape)
+        if plain and isinstance(file, RemoteFile):
+            return read_region(file, lazy.dtype, shape, section, read_overhead)
+        if is_tiled(file):
+            file = TiledReader(file)
+            if file.shape != shape or file.itemsize != lazy.dtype.itemsize:
+                return None
+            return file.region(lazy.dtype, section)
+
+        if self._mmap:
+            return None
+        if is_chunked(file):
+            file = ChunkedReader(file)
+            file_size = file.size
+        # a file smaller than the grid is handled by the full decode. The bytes
+        # beyond the grid, for example, of an AppendWriter, are ignored.
+        if file_size < lazy.dtype.itemsize * np.prod(shape):
+            return None
+        return read_region(file, lazy.dtype, shape, section, read_overhead)
 
     @property
     def components_url(self):
         """Return the components_url of the CSDM serialized file."""
         return self._components_url
 
-    def dict(self, filename=None, dataset_index=None, for_display=False):
+    def dict(
+        self,
+        filename=None,
+        dataset_index=None,
+        for_display=False,
+        stream=False,
+        components=True,
+        compression=None,
+        tiles=None,
+    ):
         """Return ExternalDataset object as a python dictionary."""
         dictionary = {}
         dictionary["type"] = "internal"
-        dictionary.update(super().dict(filename, dataset_index, for_display))
+        dictionary.update(
+            super().dict(
+                filename,
+                dataset_index,
+                for_display,
+                stream,
+                components,
+                compression,
+                tiles,
+            )
+        )
         return dictionary
+
+
+def read_packed(file, dtype):
+    """Return the components of a chunked or a tiled binary file object as a 1D
+    array of the dtype, or None, if the file is neither chunked nor tiled."""
+    if is_chunked(file):
+        return ChunkedReader(file).read_array(dtype)
+    if is_tiled(file):
+        return TiledReader(file).read_array(dtype)
+    return None
+
+
+def memmap_components(absolute_url, dtype, component_len):
+    """Return a read-only memory map of the binary file at the local `file:` url.
+
+    The map is reshaped to (component_len, size), so that only the pages touched
+    by a subsequent slice are read from the disk.
+    """
+    components = np.memmap(url2pathname(urlparse(absolute_url).path), dtype, "r")
+    size = int(components.size / component_len)
+    return components.reshape(component_len, size)
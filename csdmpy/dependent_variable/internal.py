@@ -3,6 +3,7 @@ import numpy as np
 
 from csdmpy.dependent_variable.base_class import BaseDependentVariable
 from csdmpy.dependent_variable.decoder import Decoder
+from csdmpy.dependent_variable.decoder import LazyComponents
 from csdmpy.utils import numpy_dtype_to_numeric_type
 
 
@@ -40,21 +41,49 @@ class InternalDataset(BaseDependentVariable):
         # the components array.
         super().__init__(**kwargs)
 
-        if not isinstance(components, np.ndarray):
-            self._components = Decoder(
-                self._encoding,
-                self._quantity_type,
-                components,
-                self._numeric_type.dtype,
-            )
+        if isinstance(components, np.ndarray):
+            size = self._components.size
+            p_1 = self.quantity_type.p
+            self._components = self._components.reshape(p_1, int(size / p_1))
+            return
 
-        size = self._components.size
-        p_1 = self.quantity_type.p
-        self._components = self._components.reshape(p_1, int(size / p_1))
+        lazy = LazyComponents(
+            self._encoding,
+            self.quantity_type,
+            self._numeric_type.dtype,
+            components,
+        )
+        self._components = lazy if kwargs.get("lazy", False) else self._decode(lazy)
 
-    def dict(self, filename=None, dataset_index=None, for_display=False):
+    def _decode(self, lazy):
+        """Decode the encoded components buffer."""
+        components = Decoder(lazy.encoding, lazy.quantity_type, lazy.source, lazy.dtype)
+        size = components.size
+        p_1 = lazy.quantity_type.p
+        return components.reshape(p_1, int(size / p_1))
+
+    def dict(
+        self,
+        filename=None,
+        dataset_index=None,
+        for_display=False,
+        stream=False,
+        components=True,
+        compression=None,
+        tiles=None,
+    ):
         """Return InternalDataset object as a python dictionary."""
         dictionary = {}
         dictionary["type"] = "internal"
-        dictionary.update(super().dict(filename, dataset_index, for_display))
+        dictionary.update(
+            super().dict(
+                filename,
+                dataset_index,
+                for_display,
+                stream,
+                components,
+                compression,
+                tiles,
+            )
+        )
         return dictionary
@@ -0,0 +1,168 @@
+"""Read a region of the components array from a binary file."""
+from operator import index as as_index
+
+import numpy as np
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["read_region", "supported_section"]
+
+# cost of a single seek and read, as the equivalent number of bytes read.
+READ_OVERHEAD = 2**14
+
+# maximum size, in bytes, of the intermediate buffer of a coalesced read.
+MAX_BUFFER_SIZE = 2**26
+
+
+def supported_section(section):
+    """Return true if every index of the section is an integer or a slice."""
+    for item in section:
+        if isinstance(item, slice):
+            continue
+        try:
+            as_index(item)
+        except TypeError:
+            return False
+    return True
+
+
+def read_region(file, dtype, shape, section, read_overhead=None):
+    """Return the section of a C-ordered array stored in the binary file object.
+
+    The array is read with one seek and readinto per run of bytes. Contiguous runs
+    are read directly into the output array. Strided runs along an axis are coalesced
+    into a single read of their span, which is then sliced, when the bytes skipped
+    over cost less than the additional reads, see READ_OVERHEAD.
+
+    If the file object has a `prefetch` method, the method is called with the list
+    of the (offset, size) byte runs before the runs are read.
+
+    Args:
+        file: A binary file object, where the array starts at the first byte.
+        dtype: The dtype of the array.
+        shape: The shape of the array.
+        section: A tuple of integers and slices, one for each axis of the array.
+        read_overhead: The cost of a read, as the equivalent number of bytes. The
+            default is READ_OVERHEAD.
+
+    Returns:
+        A numpy array, identical to ``array[section]``.
+    """
+    dtype = np.dtype(dtype)
+    ranges, squeeze, flip = normalize_section(shape, section)
+
+    out = np.empty([len(item) for item in ranges], dtype=dtype)
+    if out.size != 0:
+        overhead = READ_OVERHEAD if read_overhead is None else read_overhead
+        axis = read_axis(shape, ranges, dtype.itemsize, overhead)
+        read_runs(file, out, shape, ranges, axis)
+    return squeeze_and_flip(out, squeeze, flip)
+
+
+def normalize_section(shape, section):
+    """Return the section as a list of ascending ranges, along with the list of the
+    integer indexed axes, and the list of the axes with a negative step."""
+    ranges, squeeze, flip = [], [], []
+    for item, size in zip(section, shape):
+        if isinstance(item, slice):
+            item = range(*item.indices(size))
+            ranges.append(item[::-1] if item.step < 0 else item)
+            squeeze.append(False)
+            flip.append(item.step < 0)
+            continue
+
+        i = as_index(item)
+        if not -size <= i < size:
+            raise IndexError(
+                f"index {i} is out of bounds for axis {len(ranges)} with size {size}"
+            )
+        i = i + size if i < 0 else i
+        ranges.append(range(i, i + 1))
+        squeeze.append(True)
+        flip.append(False)
+    return ranges, squeeze, flip
+
+
+def squeeze_and_flip(out, squeeze, flip):
+    """Return the view of the array read at the ascending ranges, with the integer
+    indexed axes removed, and the axes with a negative step reversed."""
+    index = tuple(
+        0 if sq else slice(None, None, -1 if fl else None)
+        for sq, fl in zip(squeeze, flip)
+    )
+    return out[index]
+
+
+def is_full(item, size):
+    """Return true if the range selects every index of an axis of the given size."""
+    return len(item) == size and item.step == 1
+
+
+def read_axis(shape, ranges, itemsize, read_overhead):
+    """Return the axis, `a`, with the least cost of reading the region as one run
+    for every index of the axes before `a`. A run spans the selected indices of the
+    axis `a`, and every index of the axes after `a`."""
+    costs = []
+    for a in range(len(shape) + 1):
+        reads = int(np.prod([len(item) for item in ranges[:a]]))
+        span = itemsize
+        if a < len(shape):
+            span *= (ranges[a][-1] - ranges[a][0] + 1) * int(np.prod(shape[a + 1 :]))
+        if is_direct(shape, ranges, a) or span <= MAX_BUFFER_SIZE:
+            costs.append((reads * (read_overhead + span), a))
+    return min(costs)[1]
+
+
+def is_direct(shape, ranges, axis):
+    """Return true if the runs at the axis are contiguous in the file."""
+    if axis == len(shape):
+        return True
+    return ranges[axis].step == 1 and all(
+        is_full(item, size) for item, size in zip(ranges[axis + 1 :], shape[axis + 1 :])
+    )
+
+
+def read_runs(file, out, shape, ranges, axis):
+    """Read the runs at the axis from the file into the output array."""
+    strides = [int(np.prod(shape[i + 1 :])) for i in range(len(shape))]
+
+    # offset, in number of elements, of the start of every run.
+    offsets = np.zeros(1, dtype=np.int64)
+    for item, stride in zip(ranges[:axis], strides[:axis]):
+        offsets = np.add.outer(offsets, np.asarray(item, dtype=np.int64) * stride)
+        offsets = offsets.ravel()
+
+    blocks = out.reshape(offsets.size, -1)
+    direct = is_direct(shape, ranges, axis)
+    if axis < len(shape):
+        offsets += ranges[axis][0] * strides[axis]
+        span = ranges[axis][-1] - ranges[axis][0] + 1
+        span_shape = (span,) + tuple(shape[axis + 1 :])
+        index = (slice(None, None, ranges[axis].step),) + tuple(
+            slice(item.start, item.stop, item.step) for item in ranges[axis + 1 :]
+        )
+        run_shape = out.shape[axis:]
+
+    itemsize = out.dtype.itemsize
+    buffer = None if direct else np.empty(span_shape, dtype=out.dtype)
+    if hasattr(file, "prefetch"):
+        size = blocks[0].nbytes if direct else buffer.nbytes
+        file.prefetch([(item * itemsize, size) for item in offsets.tolist()])
+    for offset, block in zip(offsets.tolist(), blocks):
+        file.seek(offset * itemsize)
+        if direct:
+            readinto(file, block)
+            continue
+        readinto(file, buffer)
+        block.reshape(run_shape)[...] = buffer[index]
+
+
+def readinto(file, array):
+    """Fill the contiguous array with the bytes at the current position of the
+    file."""
+    buffer = array.reshape(-1).view(np.uint8)
+    size = file.readinto(buffer)
+    if size != buffer.size:
+        raise ValueError(
+            f"Expecting {buffer.size} bytes from the binary file, found {size}."
+        )
@@ -0,0 +1,228 @@
+"""Tiled binary files of the components, for fast slicing along any axis."""
+import itertools
+import json
+from concurrent import futures
+from operator import index as as_index
+
+import numpy as np
+
+from csdmpy.dependent_variable.chunked import check_codec
+from csdmpy.dependent_variable.chunked import CODECS
+from csdmpy.dependent_variable.chunked import FOOTER
+from csdmpy.dependent_variable.chunked import read_footer
+from csdmpy.dependent_variable.chunked import shuffle
+from csdmpy.dependent_variable.chunked import unshuffle
+from csdmpy.dependent_variable.region import normalize_section
+from csdmpy.dependent_variable.region import readinto
+from csdmpy.dependent_variable.region import squeeze_and_flip
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["check_tiles", "is_tiled", "TiledReader", "write_tiled"]
+
+MAGIC = b"CSDFT\x00\x00\x01"
+
+
+def is_tiled(file):
+    """Return true if the binary file object, or buffer, starts with the magic bytes
+    of a tiled file."""
+    if not hasattr(file, "readinto"):
+        return bytes(file[: len(MAGIC)]) == MAGIC
+    position = file.tell()
+    magic = bytearray(len(MAGIC))
+    size = file.readinto(magic)
+    file.seek(position)
+    return size == len(MAGIC) and bytes(magic) == MAGIC
+
+
+def check_tiles(tiles, ndim):
+    """Return the tile shape as a list of `ndim` positive integers. An integer
+    `tiles` is the tile size along every dimension."""
+    try:
+        tiles = [as_index(tiles)] * ndim
+    except TypeError:
+        tiles = [as_index(item) for item in tiles]
+    if len(tiles) != ndim or any(item < 1 for item in tiles):
+        raise ValueError(
+            f"The value, `{tiles}`, is an invalid `tiles`. Expecting a positive "
+            f"integer, or a list of {ndim} positive integers, one for each dimension."
+        )
+    return tiles
+
+
+def tile_grid(shape, tiles):
+    """Return the number of tiles along every axis."""
+    return [-(-size // tile) for size, tile in zip(shape, tiles)]
+
+
+def write_tiled(array, file, tiles, codec=None, workers=None):
+    """Write the array to the binary file object as a tiled file.
+
+    The array is split into blocks of the `tiles` shape, which are clipped at the
+    end of every axis. Every tile is stored as a C-ordered block of bytes, such that
+    a slice along any axis of the array reads only the tiles that the slice
+    intersects. The file is laid out as the MAGIC bytes, the tiles, in the C order
+    of the grid of tiles, the JSON tile index, and the footer with the offset and
+    size of the index.
+
+    Args:
+        array: The numpy array.
+        file: A binary file object.
+        tiles: The shape of a tile, one integer for each axis of the array.
+        codec: An optional compression codec of the tiles, one of 'zlib', 'lzma',
+            and 'bz2'. The tiles are byte-shuffled and compressed in parallel.
+        workers: The maximum number of compression threads.
+    """
+    if codec is not None:
+        check_codec(codec)
+    tiles = [max(min(tile, size), 1) for tile, size in zip(tiles, array.shape)]
+    itemsize = array.dtype.itemsize
+    grid = tile_grid(array.shape, tiles)
+
+    def task(index):
+        section = tuple(slice(i * t, (i + 1) * t) for i, t in zip(index, tiles))
+        data = np.ascontiguousarray(array[section]).reshape(-1).view(np.uint8)
+        if codec is None:
+            return data
+        return CODECS[codec][0](shuffle(data, itemsize))
+
+    file.write(MAGIC)
+    offset, offsets = len(MAGIC), []
+    with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        jobs = itertools.product(*[range(item) for item in grid])
+        for data in map(task, jobs) if codec is None else pool.map(task, jobs):
+            file.write(data)
+            offsets.append([offset, len(data)])
+            offset += len(data)
+
+    index = dict(
+        codec=codec,
+        itemsize=itemsize,
+        shape=list(array.shape),
+        tiles=tiles,
+        offsets=offsets,
+    )
+    index = json.dumps(index).encode("utf-8")
+    file.write(index)
+    file.write(FOOTER.pack(offset, len(index), MAGIC))
+
+
+class TiledReader:
+    """A reader of the regions of the array stored in a tiled file.
+
+    A region is assembled from the tiles it intersects, and the other tiles are not
+    read. If the file object has a `prefetch` method, the method is called with the
+    list of the (offset, size) byte runs of the intersected tiles before the tiles
+    are read.
+
+    Args:
+        file: The binary file object of the tiled file. The size of the file is the
+            `size` attribute of the file object, if any.
+    """
+
+    __slots__ = ("file", "codec", "itemsize", "shape", "tiles", "offsets")
+
+    def __init__(self, file):
+        """Initialize."""
+        offset, length = read_footer(file, MAGIC, "tile")
+        file.seek(offset)
+        index = np.empty(length, dtype=np.uint8)
+        readinto(file, index)
+        index = json.loads(index.tobytes().decode("utf-8"))
+        if index["codec"] is not None:
+            check_codec(index["codec"])
+
+        self.file = file
+        self.codec = index["codec"]
+        self.itemsize = index["itemsize"]
+        self.shape = tuple(index["shape"])
+        self.tiles = index["tiles"]
+        self.offsets = index["offsets"]
+
+    def region(self, dtype, section, workers=None):
+        """Return the section of the array, a tuple of integers and slices, one for
+        each axis. Compressed tiles are decompressed in parallel.
+
+        Returns:
+            A numpy array, identical to ``array[section]``.
+        """
+        dtype = np.dtype(dtype)
+        if dtype.itemsize != self.itemsize:
+            raise ValueError(
+                f"Expecting a dtype of {self.itemsize} bytes, found {dtype.itemsize}."
+            )
+        ranges, squeeze, flip = normalize_section(self.shape, section)
+        out = np.empty([len(item) for item in ranges], dtype=dtype)
+        if out.size == 0:
+            return squeeze_and_flip(out, squeeze, flip)
+
+        # for every axis, the map of the tile index to the positions along the
+        # output axis, and the positions within the tile.
+        axes = [self.intersect(item, tile) for item, tile in zip(ranges, self.tiles)]
+        jobs = list(itertools.product(*[sorted(item) for item in axes]))
+        grid = tile_grid(self.shape, self.tiles)
+        numbers = [int(np.ravel_multi_index(item, grid)) for item in jobs]
+        if hasattr(self.file, "prefetch"):
+            self.file.prefetch([tuple(self.offsets[i]) for i in numbers])
+
+        def task(job):
+            index, data = job
+            tile = self.decode(data, index, dtype)
+            target = np.ix_(*[item[i][0] for item, i in zip(axes, index)])
+            source = np.ix_(*[item[i][1] for item, i in zip(axes, index)])
+            out[target] = tile[source]
+
+        tiles = zip(jobs, map(self.read, numbers))
+        if self.codec is None:
+            _ = list(map(task, tiles))
+        else:
+            with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                _ = list(pool.map(task, tiles))
+        return squeeze_and_flip(out, squeeze, flip)
+
+    def read_array(self, dtype, workers=None):
+        """Return the complete array as a 1D array of the dtype, in C order."""
+        section = tuple(slice(None) for _ in self.shape)
+        return self.region(dtype, section, workers).reshape(-1)
+
+    @staticmethod
+    def intersect(item, tile):
+        """Return a dictionary of the index of every tile intersected by the
+        ascending range, to the positions of the range within the output axis, and
+        the positions within the tile."""
+        values = np.asarray(item, dtype=np.int64)
+        numbers = values // tile
+        result = {}
+        for i in np.unique(numbers).tolist():
+            positions = np.flatnonzero(numbers == i)
+            result[i] = (positions, values[positions] - i * tile)
+        return result
+
+    def read(self, number):
+        """Return the bytes of the tile `number`, in the C order of the grid of
+        tiles."""
+        offset, length = self.offsets[number]
+        data = np.empty(length, dtype=np.uint8)
+        self.file.seek(offset)
+        readinto(self.file, data)
+        return data
+
+    def decode(self, data, index, dtype):
+        """Return the tile at the grid `index` as an array of the dtype, from the
+        bytes of the tile."""
+        shape = [
+            min(tile, size - i * tile)
+            for i, tile, size in zip(index, self.tiles, self.shape)
+        ]
+        if self.codec is None:
+            return data.view(dtype).reshape(shape)
+        out = np.empty(shape, dtype=dtype)
+        chunk = CODECS[self.codec][1](memoryview(data))
+        chunk = np.frombuffer(chunk, dtype=np.uint8)
+        if chunk.size != out.nbytes:
+            raise ValueError(
+                f"Expecting {out.nbytes} bytes from the compressed tile, found "
+                f"{chunk.size}."
+            )
+        unshuffle(chunk, self.itemsize, out.reshape(-1).view(np.uint8))
+        return out
@@ -0,0 +1,157 @@
+"""Virtual components, concatenated from the components of several datasets."""
+from operator import index as as_index
+
+import numpy as np
+
+from csdmpy.dependent_variable.decoder import LazyComponents
+from csdmpy.dependent_variable.region import supported_section
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["VirtualComponents"]
+
+# the reductions computed one dataset at a time, with the function that combines
+# the partial results.
+REDUCTIONS = {
+    np.sum: np.sum,
+    np.prod: np.prod,
+    np.max: np.max,
+    np.min: np.min,
+    np.mean: np.sum,
+}
+
+
+class VirtualComponents(LazyComponents):
+    """The components of a dependent variable, concatenated along an axis from the
+    components of the dependent variables of several datasets.
+
+    The components are not read until accessed. A section is read from the
+    datasets that the section spans, without decoding the other datasets, and the
+    reductions of REDUCTIONS are computed one dataset at a time. After a read, the
+    lazy components of a dataset are not kept in memory.
+
+    Args:
+        parts: The list of the dependent variable subtypes, one for each dataset.
+        axis: The axis of the (p, N_{d-1}, ..., N_0) components array along which
+            the components are concatenated.
+    """
+
+    __slots__ = ("parts", "axis")
+
+    def __init__(self, parts, axis):
+        """Initialize."""
+        first = parts[0]
+        super().__init__(
+            first._encoding, first._quantity_type, first._numeric_type.dtype, None
+        )
+        self.parts = parts
+        self.axis = axis
+        shape = list(grid_shape(first))
+        shape[axis - 1] = int(sum(self.sizes))
+        self.shape = tuple(shape)
+
+    @property
+    def sizes(self):
+        """Return the number of points of every dataset along the axis."""
+        return [grid_shape(item)[self.axis - 1] for item in self.parts]
+
+    def decode(self, variable=None):
+        """Return the concatenated components array."""
+        full = (slice(None),) * (len(self.shape) + 1)
+        return np.concatenate(
+            [self.read(i, full) for i in range(len(self.parts))], axis=self.axis
+        )
+
+    def read(self, i, section):
+        """Return the section of the components of the dataset `i`. The components of
+        the dataset remain lazy, if they were lazy."""
+        part = self.parts[i]
+        lazy = part._array
+        try:
+            return part._region(section)
+        finally:
+            if isinstance(lazy, LazyComponents):
+                part._array = lazy
+
+    def region(self, section):
+        """Return the components array at the section, a tuple of indices."""
+        section = tuple(section)
+        section += (slice(None),) * (len(self.shape) + 1 - len(section))
+        if not supported_section(section):
+            return self.decode()[section]
+
+        item = section[self.axis]
+        offsets = np.cumsum([0] + self.sizes)
+        if not isinstance(item, slice):
+            i = as_index(item)
+            if not -offsets[-1] <= i < offsets[-1]:
+                raise IndexError(
+                    f"index {i} is out of bounds for axis {self.axis} with size "
+                    f"{offsets[-1]}"
+                )
+            i = i + offsets[-1] if i < 0 else i
+            part = int(np.searchsorted(offsets, i, side="right")) - 1
+            return self.read(part, replace(section, self.axis, i - offsets[part]))
+
+        # the consecutive runs of the indices within a dataset.
+        values = np.arange(*item.indices(int(offsets[-1])), dtype=np.int64)
+        parts = np.searchsorted(offsets, values, side="right") - 1
+        starts = np.flatnonzero(np.diff(parts, prepend=-1) != 0).tolist()
+        stops = starts[1:] + [values.size]
+        step = item.indices(int(offsets[-1]))[2]
+
+        blocks = []
+        for start, stop in zip(starts, stops):
+            part = int(parts[start])
+            first = int(values[start] - offsets[part])
+            last = int(values[stop - 1] - offsets[part]) + step
+            local = slice(first, None if last < 0 else last, step)
+            blocks.append(self.read(part, replace(section, self.axis, local)))
+        if blocks == []:
+            return self.read(0, replace(section, self.axis, slice(0, 0)))
+
+        # the integer indexed axes before the axis are removed from the blocks.
+        axis = self.axis
+        axis -= sum(not isinstance(item, slice) for item in section[:axis])
+        return np.concatenate(blocks, axis=axis)
+
+    def reduce(self, func, axis=None):
+        """Return the reduction of the components with the function `func` of
+        REDUCTIONS, computed one dataset at a time.
+
+        Args:
+            func: The numpy reduction function.
+            axis: None, or an integer or a tuple of integers, the axes of the
+                components array along which the reduction is performed.
+        """
+        ndim = len(self.shape) + 1
+        axes = range(ndim) if axis is None else np.atleast_1d(axis).tolist()
+        axes = [item % ndim for item in axes]
+        full = (slice(None),) * ndim
+        partial = REDUCTIONS[func]
+        results = [
+            partial(self.read(i, full), axis=axis) for i in range(len(self.parts))
+        ]
+
+        if self.axis in axes:
+            result = partial(np.stack(results), axis=0)
+        else:
+            index = self.axis - sum(item < self.axis for item in axes)
+            result = np.concatenate(results, axis=index)
+        if func is np.mean:
+            shape = (self.quantity_type.p,) + self.shape
+            result = result / int(np.prod([shape[item] for item in axes]))
+        return result
+
+
+def grid_shape(variable):
+    """Return the grid shape, (N_{d-1}, ..., N_0), of the dependent variable
+    subtype."""
+    if variable.is_lazy():
+        return tuple(variable._array.shape)
+    return variable._array.shape[1:]
+
+
+def replace(section, axis, item):
+    """Return the section with the index at the axis replaced by the item."""
+    return section[:axis] + (item,) + section[axis + 1 :]
@@ -8,6 +8,7 @@ from csdmpy.dimension.labeled import LabeledDimension
 from csdmpy.dimension.linear import LinearDimension
 from csdmpy.dimension.monotonic import MonotonicDimension
 from csdmpy.units import string_to_quantity  # lgtm [py/import-own-module]
+from csdmpy.utils import _deepcopy_slots  # lgtm [py/import-own-module]
 from csdmpy.utils import _get_dictionary  # lgtm [py/import-own-module]
 from csdmpy.utils import validate  # lgtm [py/import-own-module]
 
@@ -174,6 +175,10 @@ class Dimension:
         other = other.subtype if isinstance(other, Dimension) else other
         return True if self.subtype == other else False
 
+    def __deepcopy__(self, memo):
+        """Return a copy of the Dimension object."""
+        return _deepcopy_slots(self, memo)
+
     def __mul__(self, other):
         """Multiply the Dimension object by a right scalar."""
         return self.subtype.__mul__(other)
@@ -198,6 +203,10 @@ class Dimension:
         """Return a dimension object corresponding to given indices."""
         dim_ = self.subtype if hasattr(self, "subtype") else self
 
+        if isinstance(dim_, LinearDimension) and isinstance(indices, slice):
+            if len(range(*indices.indices(dim_.count))) > 1:
+                return dim_._slice(indices)
+
         length_ = self.coordinates[indices].size
         if length_ <= 1:
             return self.coordinates[indices]
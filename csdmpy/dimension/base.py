@@ -3,6 +3,7 @@ import json
 import warnings
 from copy import deepcopy
 
+from csdmpy.utils import _deepcopy_slots
 from csdmpy.utils import validate
 
 
@@ -25,6 +26,11 @@ class BaseDimension:
         check = [getattr(self, _) == getattr(other, _) for _ in __class__.__slots__]
         return False if False in check else True
 
+    def __deepcopy__(self, memo):
+        """Return a copy of the dimension. The units and quantities are shared with
+        the copy."""
+        return _deepcopy_slots(self, memo)
+
     @property
     def label(self):
         """Label associated with the dimension."""
@@ -138,4 +144,6 @@ def _copy_core_metadata(obj1, obj2, dimension_type):
         return
 
     obj1._complex_fft = obj2._complex_fft
+    # the coordinates are re-evaluated with the complex_fft of obj2.
+    obj1._coordinates = None
     return
@@ -1,4 +1,7 @@
 """The LinearDimension sub type class."""
+from copy import copy
+from copy import deepcopy
+
 import numpy as np
 from astropy.units import Quantity
 
@@ -55,7 +58,7 @@ class LinearDimension(BaseQuantitativeDimension):
         # create a reciprocal dimension
         r_unit = self._unit**-1
         self.reciprocal = ReciprocalDimension(unit=r_unit, **kwargs["reciprocal"])
-        self._get_coordinates()
+        self._coordinates = None
 
     def __repr__(self):
         meta = [f"{k}={v}" for k, v in self.dict().items() if k != "type"]
@@ -114,9 +117,14 @@ class LinearDimension(BaseQuantitativeDimension):
             setattr(self.reciprocal, item, val)
 
     def _get_coordinates(self):
-        index = np.arange(self._count, dtype=np.float64)
-        index -= int(self._count / 2) if self._complex_fft else 0
-        self._coordinates = index * self._increment.to(self._unit)
+        """Return the coordinates without the coordinates offset. The coordinates are
+        evaluated on the first access after a change of the count, increment, or
+        complex_fft attributes."""
+        if self._coordinates is None:
+            index = np.arange(self._count, dtype=np.float64)
+            index -= int(self._count / 2) if self._complex_fft else 0
+            self._coordinates = index * self._increment.to(self._unit)
+        return self._coordinates
 
     # ----------------------------------------------------------------------- #
     #                                  Attributes                             #
@@ -135,19 +143,19 @@ class LinearDimension(BaseQuantitativeDimension):
     def count(self, value):
         value = validate(value, "count", int)
         self._count = value
-        self._get_coordinates()
+        self._coordinates = None
 
     @property
     def increment(self):
         """Increment along the linear dimension."""
-        return self._increment
+        return deepcopy(self._increment)
 
     @increment.setter
     def increment(self, value):
         allowed_types = (Quantity, str, ScalarQuantity)
         value = validate(value, "increment", allowed_types)
         self._increment = ScalarQuantity(value, self._unit).quantity
-        self._get_coordinates()
+        self._coordinates = None
 
     @property
     def complex_fft(self):
@@ -157,12 +165,12 @@ class LinearDimension(BaseQuantitativeDimension):
     @complex_fft.setter
     def complex_fft(self, value):
         self._complex_fft = validate(value, "complex_fft", bool)
-        self._get_coordinates()
+        self._coordinates = None
 
     @property
     def coordinates(self):
         """Return the coordinates along the dimensions."""
-        coordinates = self._coordinates[: self._count] + self.coordinates_offset
+        coordinates = self._get_coordinates()[: self._count] + self.coordinates_offset
 
         equivalent_fn = self._equivalencies
         equivalent_unit = self._equivalent_unit
@@ -212,6 +220,27 @@ class LinearDimension(BaseQuantitativeDimension):
         if isinstance(obj, LinearDimension):
             _copy_core_metadata(self, obj, "linear")
 
+    def _slice(self, index):
+        """Return the LinearDimension at the slice `index`. The count, increment,
+        and coordinates offset of the new dimension are computed from the slice,
+        without evaluating the coordinates of the dimension."""
+        start, stop, step = index.indices(self._count)
+        shift = int(self._count / 2) if self._complex_fft else 0
+
+        new = copy(self)
+        new._count = len(range(start, stop, step))
+        new._increment = self._increment * step
+        new._coordinates_offset = (
+            self._coordinates_offset + (start - shift) * self._increment
+        ).to(self._unit)
+        new._complex_fft = False
+        new._origin_offset = self._origin_offset.copy()
+        new._period = self._period.copy()
+        new._application = deepcopy(self._application)
+        new.reciprocal = deepcopy(self.reciprocal)
+        new._coordinates = None
+        return new
+
     def dict(self):
         """Return the LinearDimension as a python dictionary."""
         obj = {}
@@ -255,19 +284,21 @@ def _update_linear_dimension_object_by_scalar(object_, other, type_="mul"):
     """Update object by multiplying by a scalar."""
     other = check_scalar_object(other)
 
+    # the quantities are replaced, rather than updated in place, as they are shared
+    # with the copies of the object.
     if type_ == "mul":
-        object_._increment *= other
-        object_._coordinates *= other
-        object_._coordinates_offset *= other
-        object_._origin_offset *= other
-        object_._period *= other
+        object_._increment = object_._increment * other
+        object_._coordinates_offset = object_._coordinates_offset * other
+        object_._origin_offset = object_._origin_offset * other
+        object_._period = object_._period * other
 
     if type_ == "truediv":
-        object_._increment /= other
-        object_._coordinates /= other
-        object_._coordinates_offset /= other
-        object_._origin_offset /= other
-        object_._period /= other
+        object_._increment = object_._increment / other
+        object_._coordinates_offset = object_._coordinates_offset / other
+        object_._origin_offset = object_._origin_offset / other
+        object_._period = object_._period / other
+
+    object_._coordinates = None
 
     object_._unit = object_._increment._unit
     object_._quantity_name = object_._unit.physical_type
@@ -193,17 +193,19 @@ def _update_monotonic_dimension_object_by_scalar(object_, other, type_):
     """Update object by multiplying by a scalar."""
     other = check_scalar_object(other)
 
+    # the quantities are replaced, rather than updated in place, as they are shared
+    # with the copies of the object.
     if type_ == "mul":
-        object_._coordinates *= other
-        object_._coordinates_offset *= other
-        object_._origin_offset *= other
-        object_._period *= other
+        object_._coordinates = object_._coordinates * other
+        object_._coordinates_offset = object_._coordinates_offset * other
+        object_._origin_offset = object_._origin_offset * other
+        object_._period = object_._period * other
 
     if type_ == "truediv":
-        object_._coordinates /= other
-        object_._coordinates_offset /= other
-        object_._origin_offset /= other
-        object_._period /= other
+        object_._coordinates = object_._coordinates / other
+        object_._coordinates_offset = object_._coordinates_offset / other
+        object_._origin_offset = object_._origin_offset / other
+        object_._period = object_._period / other
 
     object_._values = [str(item) for item in object_._coordinates]
     object_._unit = object_._coordinates.unit
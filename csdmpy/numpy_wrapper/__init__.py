@@ -24,7 +24,7 @@ def fft(csdm, axis=0):
     unit_in = dimension_object._unit
     # the following coordinates does not include the coordinates offset and have are
     # given in the base unit of the dimension.
-    coordinates = dimension_object._coordinates.to(unit_in).value
+    coordinates = dimension_object._get_coordinates().to(unit_in).value
     coordinates_offset = dimension_object._coordinates_offset.to(unit_in).value
 
     unit_out = (1 / unit_in).unit
@@ -72,7 +72,7 @@ def fft(csdm, axis=0):
     # get the coordinates of the reciprocal dimension.
     dimension_object._swap()
     dimension_object._increment = dimension_object.reciprocal_increment()
-    dimension_object._get_coordinates()
+    dimension_object._coordinates = None
     return csdm_new
 
 
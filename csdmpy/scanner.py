@@ -0,0 +1,408 @@
+"""Incremental reader for the JSON serialization of the CSD model."""
+import binascii
+import json
+import re
+
+import numpy as np
+
+from .dependent_variable.decoder import (  # lgtm [py/import-own-module]
+    check_number_of_components_and_encoding_type,
+)
+from .dependent_variable.decoder import real_dtype  # lgtm [py/import-own-module]
+from .dependent_variable.decoder import (  # lgtm [py/import-own-module]
+    strip_whitespace,
+)
+from .utils import NumericType  # lgtm [py/import-own-module]
+from .utils import QuantityType  # lgtm [py/import-own-module]
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["scan", "Scanner"]
+
+# number of characters read from the file at once.
+READ_SIZE = 2**20
+
+WHITESPACE = " \t\n\r"
+DECODER = json.JSONDecoder()
+DELIMITERS = re.compile(r'["\[\]{}]')
+# an incomplete \uXXXX escape sequence at the end of a JSON string chunk.
+PARTIAL_ESCAPE = re.compile(r"\\u[0-9a-fA-F]{0,3}\Z")
+
+
+def scan(file, components=True):
+    """Parse the JSON serialization of a CSDM object from the text file object.
+
+    The document is read in chunks of READ_SIZE characters. The components of the
+    internal dependent variables are decoded to numpy arrays as they are read, without
+    creating the intermediate python strings or lists of the encoded components.
+
+    Args:
+        file: A text file object.
+        components: If false, the components of the dependent variables are skipped
+            over without decoding, and the `components` keys are omitted.
+
+    Returns:
+        A python dictionary.
+    """
+    scanner = Scanner(file, components)
+    obj = scanner.value(())
+    if scanner.peek() != "":
+        scanner.error("Extra data")
+    return obj
+
+
+class Scanner:
+    """A JSON reader over a text file object.
+
+    The values along the path `csdm` -> `dependent_variables` -> `[i]` are walked
+    key by key, such that the `components` of each dependent variable are decoded
+    in chunks. Every other value is parsed with the `json` module.
+    """
+
+    __slots__ = ("file", "buffer", "index", "eof", "decode")
+
+    def __init__(self, file, decode=True):
+        """Initialize."""
+        self.file = file
+        self.buffer = ""
+        self.index = 0
+        self.eof = False
+        self.decode = decode
+
+    def read(self, size=READ_SIZE):
+        """Discard the consumed characters and append the next `size` characters
+        from the file to the buffer."""
+        chunk = self.file.read(size)
+        self.buffer = self.buffer[self.index :] + chunk
+        self.index = 0
+        self.eof = chunk == ""
+
+    def peek(self):
+        """Return the next non-whitespace character, or an empty string at the end
+        of the file."""
+        while True:
+            while self.index < len(self.buffer):
+                if self.buffer[self.index] not in WHITESPACE:
+                    return self.buffer[self.index]
+                self.index += 1
+            if self.eof:
+                return ""
+            self.read()
+
+    def expect(self, characters):
+        """Consume the next non-whitespace character, which must be one of the
+        `characters`, and return it."""
+        char = self.peek()
+        if char == "" or char not in characters:
+            self.error(f"Expecting one of '{characters}'")
+        self.index += 1
+        return char
+
+    def error(self, message):
+        """Raise a JSONDecodeError at the current position."""
+        raise json.JSONDecodeError(message, self.buffer, self.index)
+
+    def value(self, path=None):
+        """Parse and return the JSON value at the current position.
+
+        Args:
+            path: The tuple of keys from the root of the document to the value, or
+                None if the value is not on the path to the dependent variables.
+        """
+        if path == () or path == ("csdm",) or path_to_dv(path):
+            if self.peek() == "{":
+                return self.object(path)
+        if path == ("csdm", "dependent_variables") and self.peek() == "[":
+            return self.array(path)
+        return self.json_value()
+
+    def json_value(self):
+        """Parse the JSON value at the current position with the `json` module."""
+        self.peek()
+        size = READ_SIZE
+        while True:
+            try:
+                obj, end = DECODER.raw_decode(self.buffer, self.index)
+                # a value ending at the end of the buffer may be a truncated number.
+                if end < len(self.buffer) or self.eof:
+                    self.index = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.read(size)
+            size = max(size, len(self.buffer))
+
+    def object(self, path):
+        """Parse the JSON object at the current position."""
+        self.expect("{")
+        obj = {}
+        if self.peek() == "}":
+            self.index += 1
+            return obj
+
+        while True:
+            if self.peek() != '"':
+                self.error("Expecting property name enclosed in double quotes")
+            key = self.json_value()
+            self.expect(":")
+            if path_to_dv(path) and key == "components" and not self.decode:
+                self.skip_value()
+            elif path_to_dv(path) and key == "components" and streamable(obj):
+                self.components(obj)
+            else:
+                obj[key] = self.value(path + (key,))
+            if self.expect(",}") == "}":
+                return obj
+
+    def array(self, path):
+        """Parse the JSON array at the current position."""
+        self.expect("[")
+        obj = []
+        if self.peek() == "]":
+            self.index += 1
+            return obj
+
+        while True:
+            obj.append(self.value(path + (len(obj),)))
+            if self.expect(",]") == "]":
+                return obj
+
+    def components(self, dv):
+        """Decode the components of the dependent variable dictionary `dv` to a
+        (p, N) numpy array.
+
+        The `numeric_type` key is removed from `dv` such that the type is inferred
+        from the dtype of the array, and the array is not copied.
+        """
+        if self.peek() != "[":
+            dv["components"] = self.json_value()
+            return
+
+        quantity_type = QuantityType(dv["quantity_type"])
+        dtype = NumericType(dv["numeric_type"]).dtype
+        read_row = self.base64_row if dv["encoding"] == "base64" else self.text_row
+
+        self.expect("[")
+        if self.peek() == "]":
+            self.index += 1
+            dv["components"] = []
+            return
+
+        components, count = None, 0
+        while True:
+            # the rows after the first are decoded in place.
+            out = None
+            if components is not None and count < components.shape[0]:
+                out = components[count]
+            row = read_row(dtype, out)
+            if components is None and quantity_type.p == 1:
+                components = row[np.newaxis]
+            elif components is None:
+                components = np.empty((quantity_type.p, row.size), dtype)
+                components[0] = row
+            row = None
+            count += 1
+            if self.expect(",]") == "]":
+                break
+
+        check_number_of_components_and_encoding_type(count, quantity_type)
+        dv["components"] = components
+        del dv["numeric_type"]
+
+    def string_chunks(self):
+        """Yield the characters of the JSON string at the current position, in
+        chunks of at most READ_SIZE characters, without unescaping."""
+        self.expect('"')
+        start = self.index
+        while True:
+            end = self.buffer.find('"', start)
+            if end != -1 and escaped(self.buffer, end, self.index):
+                start = end + 1
+                continue
+
+            # trailing backslashes may escape a quote in the next chunk.
+            stop = end
+            if end == -1:
+                stop = len(self.buffer)
+                while stop > self.index and self.buffer[stop - 1] == "\\":
+                    stop -= 1
+            if stop > self.index:
+                yield self.buffer[self.index : stop]
+            if end != -1:
+                self.index = end + 1
+                return
+            if self.eof:
+                self.error("Unterminated string starting at")
+            self.index = stop
+            self.read()
+            start = 0
+
+    def skip_value(self):
+        """Move past the JSON value at the current position without parsing it."""
+        if self.peek() not in "[{":
+            self.json_value()
+            return
+
+        depth = 0
+        while True:
+            match = DELIMITERS.search(self.buffer, self.index)
+            if match is None:
+                if self.eof:
+                    self.error("Expecting a closing bracket")
+                self.index = len(self.buffer)
+                self.read()
+                continue
+
+            char = match.group()
+            if char == '"':
+                self.index = match.start()
+                for _ in self.string_chunks():
+                    pass
+                continue
+
+            self.index = match.end()
+            depth += 1 if char in "[{" else -1
+            if depth == 0:
+                return
+
+    def base64_row(self, dtype, out=None):
+        """Decode the base64 JSON string at the current position to a 1D array.
+
+        Args:
+            dtype: The dtype of the array.
+            out: An optional 1D array where the decoded values are written.
+        """
+        if self.peek() != '"':
+            self.error("Expecting a base64 encoded string")
+        writer = RowWriter(np.uint8, None if out is None else out.view(np.uint8))
+        carry, rest = "", ""
+        for chunk in self.string_chunks():
+            # the escape sequences, such as `\/` and `\n`, and the whitespace are
+            # removed before the chunk is split on a multiple of four characters.
+            chunk, rest = unescape(rest + chunk)
+            chunk = carry + strip_whitespace(chunk)
+            size = len(chunk) // 4 * 4
+            writer.write(np.frombuffer(binascii.a2b_base64(chunk[:size]), np.uint8))
+            carry = chunk[size:]
+        if rest != "":
+            self.error("Invalid \\uXXXX escape")
+        writer.write(np.frombuffer(binascii.a2b_base64(carry), np.uint8))
+        if out is not None:
+            return writer.result(out)
+        if writer.size % dtype.itemsize != 0:
+            raise ValueError("buffer size must be a multiple of element size")
+        return writer.result().view(dtype)
+
+    def text_row(self, dtype, out=None):
+        """Decode the JSON array of numbers at the current position to a 1D array.
+
+        The interleaved real and imaginary values of complex components are read as
+        a float array, which is then viewed as a complex array.
+
+        Args:
+            dtype: The dtype of the array.
+            out: An optional 1D array where the decoded values are written.
+        """
+        real = real_dtype(dtype) if dtype.kind == "c" else dtype
+        writer = RowWriter(real, None if out is None else out.view(real))
+        self.expect("[")
+        while True:
+            end = self.buffer.find("]", self.index)
+            if end == -1:
+                # parse up to the last complete number in the buffer.
+                end = self.buffer.rfind(",", self.index)
+                if end == -1:
+                    if self.eof:
+                        self.error("Expecting ',' delimiter")
+                    self.read()
+                    continue
+            writer.write(
+                np.asarray(json.loads(f"[{self.buffer[self.index : end]}]"), real)
+            )
+            self.index = end + 1
+            if self.buffer[end] == "]":
+                break
+            self.read()
+        return writer.result().view(dtype) if out is None else writer.result(out)
+
+
+class RowWriter:
+    """Collect the decoded chunks of a component into a 1D array.
+
+    When the `out` array is given, the chunks are written in place, otherwise the
+    chunks are concatenated.
+    """
+
+    __slots__ = ("dtype", "out", "chunks", "size")
+
+    def __init__(self, dtype, out=None):
+        """Initialize."""
+        self.dtype = dtype
+        self.out = out
+        self.chunks = []
+        self.size = 0
+
+    def write(self, chunk):
+        """Append the 1D array `chunk`."""
+        if self.out is None:
+            self.chunks.append(chunk)
+        elif self.size + chunk.size <= self.out.size:
+            self.out[self.size : self.size + chunk.size] = chunk
+        self.size += chunk.size
+
+    def result(self, out=None):
+        """Return the row. The size of the row must match the size of `out`."""
+        if out is None:
+            return np.concatenate(self.chunks)
+        if self.size != self.out.size:
+            raise ValueError(
+                "The encoded components have different lengths, "
+                f"{sorted({self.size, self.out.size})} values."
+            )
+        return out
+
+
+def escaped(string, index, start):
+    """Return true if the character at `index` is escaped by the backslashes that
+    precede it, after the `start` index."""
+    i = index
+    while i > start and string[i - 1] == "\\":
+        i -= 1
+    return (index - i) % 2 == 1
+
+
+def unescape(chunk):
+    """Return the characters of the chunk of a JSON string, unescaped, along with the
+    incomplete escape sequence at the end of the chunk, if any."""
+    if "\\" not in chunk:
+        return chunk, ""
+    rest = ""
+    match = PARTIAL_ESCAPE.search(chunk)
+    if match is not None and not escaped(chunk, match.start(), 0):
+        start = match.start()
+        chunk, rest = chunk[:start], chunk[start:]
+    return json.loads(f'"{chunk}"'), rest
+
+
+def path_to_dv(path):
+    """Return true if the path is to a dependent variable object."""
+    return (
+        path is not None
+        and len(path) == 3
+        and path[:2] == ("csdm", "dependent_variables")
+    )
+
+
+def streamable(dv):
+    """Return true if the components of the dependent variable dictionary `dv` can
+    be decoded as they are read. This requires the `type`, `encoding`,
+    `numeric_type`, and `quantity_type` keys to precede the `components` key."""
+    if dv.get("type") != "internal" or dv.get("encoding") not in ["base64", "none"]:
+        return False
+    try:
+        NumericType(dv["numeric_type"])
+        QuantityType(dv["quantity_type"])
+    except Exception:
+        return False
+    return True
@@ -1,7 +1,12 @@
 """Helper methods for CSDM class."""
+import functools
+import os
+from concurrent import futures
 from copy import deepcopy
 
 import numpy as np
+from astropy.units import PhysicalType
+from astropy.units import UnitBase
 from astropy.units.quantity import Quantity
 
 from .units import ScalarQuantity
@@ -199,6 +204,23 @@ class NumericType:
         self.dtype = np.dtype(lst[element])
 
 
+# the types of the attributes that are never modified in place, and are shared
+# between an object and its copy. The quantities of the dimensions, for example, the
+# increment and the coordinates offset, are replaced rather than updated in place.
+IMMUTABLE_TYPES = (
+    str,
+    bytes,
+    int,
+    float,
+    complex,
+    bool,
+    type(None),
+    UnitBase,
+    PhysicalType,
+    Quantity,
+)
+
+
 def validate(value, attr, types, method=None):
     if isinstance(value, types):
         if method is None:
@@ -234,6 +256,32 @@ def _get_dictionary(*arg, **kwargs):
     return kwargs
 
 
+def _deepcopy_slots(obj, memo):
+    """Return a deep copy of an object of a class with __slots__. The attributes of
+    the IMMUTABLE_TYPES are shared with the copy, and the other attributes, such as
+    the lists, dictionaries, and numpy arrays, are deep copied."""
+    cls = obj.__class__
+    new = cls.__new__(cls)
+    memo[id(obj)] = new
+    for name in _slot_names(cls):
+        try:
+            value = getattr(obj, name)
+        except AttributeError:
+            continue
+        if not isinstance(value, IMMUTABLE_TYPES):
+            value = deepcopy(value, memo)
+        setattr(new, name, value)
+    return new
+
+
+@functools.lru_cache(maxsize=None)
+def _slot_names(cls):
+    """Return the names of the __slots__ of the class and its base classes."""
+    return tuple(
+        name for base in cls.__mro__ for name in base.__dict__.get("__slots__", ())
+    )
+
+
 def check_encoding(element):
     """Validate the encoding string value.
 
@@ -345,6 +393,31 @@ def _get_broadcast_shape(array, ndim, axis):
     return array[tuple(s)]
 
 
+# maximum number of threads running the blocking work of the coroutines,
+# `cp.aload` and `CSDM.asave`.
+ASYNC_WORKERS = 16
+
+_ASYNC_EXECUTOR = {}
+
+
+def _async_executor():
+    """Return the thread pool shared by the coroutines of the process.
+
+    The pool runs at most ASYNC_WORKERS blocking calls at once, and queues the
+    remaining calls, such that many concurrent coroutines share a fixed number of
+    threads. The calls are blocking; the downloads of the remote files of
+    `cp.aload` run on the event loop instead, see `DownloadCache.aget`.
+    """
+    pid = os.getpid()
+    # a forked process does not share the threads of its parent.
+    if pid not in _ASYNC_EXECUTOR:
+        _ASYNC_EXECUTOR.clear()
+        _ASYNC_EXECUTOR[pid] = futures.ThreadPoolExecutor(
+            max_workers=ASYNC_WORKERS, thread_name_prefix="csdmpy"
+        )
+    return _ASYNC_EXECUTOR[pid]
+
+
 def _check_dimension_indices(d, index=-1):
     """Check the list of indexes to ensure that each index is an integer
     and within the counts of dimensions.
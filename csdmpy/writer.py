@@ -0,0 +1,286 @@
+"""Append the slices of a dataset along its last dimension."""
+import datetime
+import json
+import os
+import tempfile
+import time
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import numpy as np
+from astropy.units import Quantity
+
+from .dependent_variable.chunked import is_chunked  # lgtm [py/import-own-module]
+from .dependent_variable.download import (  # lgtm [py/import-own-module]
+    get_absolute_url_path,
+)
+from .dependent_variable.tiled import is_tiled  # lgtm [py/import-own-module]
+from .dimension import Dimension  # lgtm [py/import-own-module]
+from .scanner import scan  # lgtm [py/import-own-module]
+from .utils import NumericType  # lgtm [py/import-own-module]
+from .utils import QuantityType  # lgtm [py/import-own-module]
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["AppendWriter"]
+
+# minimum interval, in seconds, between two writes of the header.
+FLUSH_INTERVAL = 1.0
+
+
+class AppendWriter:
+    """Append slices along the last dimension of a `.csdfe` dataset.
+
+    The components of every dependent variable are stored in an external binary
+    file, where the slices along the last dimension, that is, the slowest varying
+    dimension, are contiguous runs of bytes at the end of the file. An append,
+    therefore, writes only the bytes of the new slices, and grows the `count` of a
+    linear dimension, the `coordinates` of a monotonic dimension, or the `labels`
+    of a labeled dimension.
+
+    The header, that is, the `.csdfe` file, is rewritten at most every
+    `flush_interval` seconds, and on :meth:`flush` and :meth:`close`. The binary
+    files are first flushed to the disk, after which the header is written to a
+    temporary file that atomically replaces the header. A reader of the dataset,
+    therefore, always finds a complete dataset, with the slices up to the last
+    header flush, and ignores the bytes of the binary files after them. The bytes
+    after the last header flush, for example, after a crash, are discarded when the
+    dataset is next opened for appending.
+
+    Only the dependent variables with a single component, such as scalar
+    dependent variables, are supported, and their binary files must be neither
+    chunked nor tiled.
+
+    Args:
+        filename (str): The path of the `.csdfe` file.
+        csdm_object: An optional CSDM object with the initial slices of the dataset.
+            When given, the dataset is saved to the `filename`, with every dependent
+            variable in a binary file, replacing the existing file, if any.
+            Otherwise, the slices are appended to the existing dataset.
+        flush_interval (float): The minimum interval, in seconds, between two
+            writes of the header. The default is FLUSH_INTERVAL.
+
+    Example:
+        >>> with cp.AppendWriter('live.csdfe', data) as writer:  # doctest: +SKIP
+        ...     writer.append(trace)
+    """
+
+    __slots__ = (
+        "filename",
+        "flush_interval",
+        "header",
+        "files",
+        "dtypes",
+        "size",
+        "count",
+        "flushed",
+    )
+
+    def __init__(self, filename, csdm_object=None, flush_interval=None):
+        """Initialize."""
+        if csdm_object is not None:
+            save_external(csdm_object, filename)
+
+        self.filename = str(filename)
+        self.flush_interval = (
+            FLUSH_INTERVAL if flush_interval is None else flush_interval
+        )
+        with open(self.filename, "r", encoding="UTF-8") as file:
+            self.header = scan(file, components=False)
+
+        dimensions = self.header["csdm"].get("dimensions", [])
+        if dimensions == []:
+            raise ValueError(
+                "Appending requires a dataset with at least one dimension."
+            )
+        variables = self.header["csdm"].get("dependent_variables", [])
+        self.dtypes = [check_variable(item) for item in variables]
+
+        # the number of points of a slice, and the number of slices.
+        counts = [Dimension(**item).count for item in dimensions]
+        self.size = int(np.prod(counts[:-1]))
+        self.count = counts[-1]
+        self.files = []
+        try:
+            for variable, dtype in zip(variables, self.dtypes):
+                path = self.binary_path(variable["components_url"])
+                self.files.append(
+                    open_binary(path, self.size * self.count * dtype.itemsize)
+                )
+        except Exception:
+            for file in self.files:
+                file.close()
+            raise
+        self.flushed = time.monotonic()
+
+    def binary_path(self, components_url):
+        """Return the local path of the binary file at the components_url."""
+        url = get_absolute_url_path(components_url, self.filename)
+        if urlparse(url).scheme != "file":
+            raise ValueError(
+                f"Appending requires a local binary file, found `{components_url}`."
+            )
+        return url2pathname(urlparse(url).path)
+
+    def append(self, components, coordinates=None, labels=None):
+        """Append slices along the last dimension of the dataset.
+
+        Args:
+            components: An array of the components of a slice, or a stack of `k`
+                slices, along the last dimension. For multiple dependent variables,
+                a list of the arrays, one for each dependent variable.
+            coordinates: The `k` coordinates of the new slices, when the last
+                dimension is a monotonic dimension, as a Quantity array, a list of
+                strings, or an array of numbers in the unit of the dimension.
+            labels: The `k` labels of the new slices, when the last dimension is a
+                labeled dimension.
+
+        Returns:
+            The number of slices along the last dimension.
+        """
+        if len(self.files) == 1 and not isinstance(components, (list, tuple)):
+            components = [components]
+        if len(components) != len(self.files):
+            raise ValueError(
+                f"Expecting the components of {len(self.files)} dependent "
+                f"variables, found {len(components)}."
+            )
+
+        arrays = [
+            np.ascontiguousarray(item, dtype=dtype).reshape(-1)
+            for item, dtype in zip(components, self.dtypes)
+        ]
+        sizes = {item.size for item in arrays}
+        if len(sizes) != 1 or sizes.pop() % max(self.size, 1) != 0:
+            raise ValueError(
+                f"Expecting components with a multiple of {self.size} points, found "
+                f"{[item.size for item in arrays]} points."
+            )
+        count = arrays[0].size // max(self.size, 1)
+        self.grow(count, coordinates, labels)
+
+        for file, array in zip(self.files, arrays):
+            file.write(array.view(np.uint8).data)
+        self.count += count
+
+        if time.monotonic() - self.flushed >= self.flush_interval:
+            self.flush()
+        return self.count
+
+    def grow(self, count, coordinates=None, labels=None):
+        """Grow the last dimension of the header by `count` slices."""
+        dimension = self.header["csdm"]["dimensions"][-1]
+        if dimension["type"] == "linear":
+            dimension["count"] += count
+            return
+
+        key = "labels" if dimension["type"] == "labeled" else "coordinates"
+        values = labels if dimension["type"] == "labeled" else coordinates
+        if values is None or len(values) != count:
+            raise ValueError(
+                f"Expecting {count} {key} of the new slices along the last dimension."
+            )
+        if key == "coordinates":
+            values = as_coordinates(values, Dimension(**dimension).coordinates.unit)
+        dimension[key] = list(dimension[key]) + list(values)
+
+    def flush(self):
+        """Flush the binary files to the disk, and atomically replace the header."""
+        for file in self.files:
+            file.flush()
+            os.fsync(file.fileno())
+
+        timestamp = datetime.datetime.utcnow().isoformat()[:-7] + "Z"
+        self.header["csdm"]["timestamp"] = timestamp
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf8", dir=directory, suffix=".tmp", delete=False
+        ) as file:
+            try:
+                json.dump(
+                    self.header, file, ensure_ascii=False, indent=0, allow_nan=False
+                )
+                file.flush()
+                os.fsync(file.fileno())
+            except Exception:
+                file.close()
+                os.remove(file.name)
+                raise
+        os.replace(file.name, self.filename)
+        self.flushed = time.monotonic()
+
+    def close(self):
+        """Flush the dataset and close the binary files."""
+        if self.files == []:
+            return
+        try:
+            self.flush()
+        finally:
+            for file in self.files:
+                file.close()
+            self.files = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def save_external(csdm_object, filename):
+    """Save the CSDM object with every dependent variable in a binary file."""
+    encodings = [item.encoding for item in csdm_object.dependent_variables]
+    try:
+        for item in csdm_object.dependent_variables:
+            item.encoding = "raw"
+        csdm_object.save(filename)
+    finally:
+        for item, encoding in zip(csdm_object.dependent_variables, encodings):
+            item.encoding = encoding
+
+
+def check_variable(variable):
+    """Return the dtype of the external, single component, dependent variable
+    dictionary."""
+    if variable.get("type") != "external":
+        raise ValueError(
+            "Appending requires the components of every dependent variable in a "
+            "binary file, that is, an `external` dependent variable."
+        )
+    if QuantityType(variable["quantity_type"]).p != 1:
+        raise ValueError(
+            "Appending requires dependent variables with a single component, found "
+            f"`{variable['quantity_type']}`."
+        )
+    if "sparse_sampling" in variable:
+        raise ValueError("Appending to a sparse dependent variable is not supported.")
+    return NumericType(variable["numeric_type"]).dtype
+
+
+def open_binary(path, size):
+    """Open the binary file for appending at the byte offset `size`. The bytes after
+    the offset, written after the last flush of the header, are discarded."""
+    file = open(path, "r+b")
+    try:
+        if is_chunked(file) or is_tiled(file):
+            raise ValueError(f"Appending to the chunked or tiled `{path}` file.")
+        if os.fstat(file.fileno()).st_size < size:
+            raise ValueError(
+                f"The binary file `{path}` is smaller than the dataset, {size} bytes."
+            )
+        file.truncate(size)
+        file.seek(size)
+    except Exception:
+        file.close()
+        raise
+    return file
+
+
+def as_coordinates(values, unit):
+    """Return the coordinates as a list of strings of a monotonic dimension. Numbers
+    are in the unit of the dimension."""
+    if not isinstance(values, Quantity) and not isinstance(values[0], str):
+        values = np.asarray(values, dtype=float) * unit
+    if isinstance(values, Quantity):
+        values = values.to(unit)
+    return Dimension(type="monotonic", coordinates=values).dict()["coordinates"]
@@ -0,0 +1,51 @@
+import asyncio
+import threading
+from concurrent import futures
+
+import numpy as np
+
+import csdmpy as cp
+from csdmpy import utils
+
+
+def test_aload_asave(tmp_path):
+    data = [cp.as_csdm(np.arange(10.0) * i) for i in range(20)]
+    files = [str(tmp_path / f"{i}.csdf") for i in range(20)]
+
+    async def main():
+        await asyncio.gather(*[item.asave(f) for item, f in zip(data, files)])
+        return await asyncio.gather(*[cp.aload(f) for f in files])
+
+    new = asyncio.run(main())
+    for item, expected in zip(new, data):
+        assert np.array_equal(item.y[0].components, expected.y[0].components)
+
+
+def test_aload_executor(tmp_path, monkeypatch):
+    data = cp.as_csdm(np.arange(10.0))
+    filename = str(tmp_path / "test.csdf")
+    data.save(filename)
+
+    threads = set()
+    original = cp.load
+
+    def load(*args, **kwargs):
+        threads.add(threading.current_thread().name)
+        return original(*args, **kwargs)
+
+    async def main(executor=None):
+        new = await asyncio.gather(
+            *[cp.aload(filename, executor=executor, lazy=True) for _ in range(50)]
+        )
+        return [item.y[0].subtype.is_lazy() for item in new]
+
+    monkeypatch.setattr(cp, "load", load)
+    assert asyncio.run(main()) == [True] * 50
+    assert 0 < len(threads) <= utils.ASYNC_WORKERS
+    assert all(name.startswith("csdmpy") for name in threads)
+
+    threads.clear()
+    with futures.ThreadPoolExecutor(2, thread_name_prefix="test") as executor:
+        asyncio.run(main(executor))
+    assert len(threads) <= 2
+    assert all(name.startswith("test") for name in threads)
@@ -0,0 +1,100 @@
+import os
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+
+
+def setup(tmp_path, encoding="raw"):
+    data = cp.as_csdm(np.arange(24.0).reshape(4, 6), unit="T")
+    data.y[0].encoding = encoding
+    filename = str(tmp_path / "cache_test.csdfe")
+    data.save(filename)
+    return data, filename
+
+
+def test_cache(tmp_path, monkeypatch):
+    data, filename = setup(tmp_path)
+    cache = cp.DatasetCache()
+    loads = []
+    read = cp._import_json
+
+    def spy(*args, **kwargs):
+        loads.append(args[0])
+        return read(*args, **kwargs)
+
+    monkeypatch.setattr(cp, "_import_json", spy)
+    first = cp.load(filename, cache=cache)
+    second = cp.load(filename, cache=cache)
+    assert len(loads) == 1
+    assert len(cache) == 1
+    assert cache.size == 24 * 8
+    assert np.array_equal(first.y[0].components, data.y[0].components)
+    assert first is not second
+    # the components are shared, read-only arrays.
+    assert first.y[0].components is second.y[0].components
+    with pytest.raises(ValueError, match="read-only"):
+        second.y[0].components[0, 0] = 1
+
+    # the metadata and the assigned components are not shared.
+    second.description = "changed"
+    second.y[0].components = second.y[0].components * 2
+    third = cp.load(filename, cache=cache)
+    assert third.description == ""
+    assert np.array_equal(third.y[0].components, data.y[0].components)
+
+    # the region is sliced from the cached dataset.
+    new = cp.load(filename, cache=cache, region={0: slice(1, 3)})
+    assert np.array_equal(new.y[0].components, data.y[0].components[:, :, 1:3])
+    assert len(loads) == 1
+
+    # other load options are cached separately.
+    new = cp.load(filename, cache=cache, application=True)
+    assert not new.y[0].components.flags.writeable
+    assert len(loads) == 2 and len(cache) == 2
+
+
+def test_cache_invalidation(tmp_path):
+    data, filename = setup(tmp_path)
+    cache = cp.DatasetCache()
+    cp.load(filename, cache=cache)
+
+    # a change of the binary file invalidates the cached dataset.
+    binary = str(tmp_path / "cache_test_0.dat")
+    data.y[0].components = data.y[0].components + 1
+    data.save(filename)
+    stat = os.stat(binary)
+    os.utime(binary, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert np.array_equal(
+        cp.load(filename, cache=cache).y[0].components, data.y[0].components
+    )
+    assert len(cache) == 1
+
+    os.remove(binary)
+    with pytest.raises(Exception):
+        cp.load(filename, cache=cache)
+
+
+def test_cache_eviction(tmp_path):
+    _, filename = setup(tmp_path, "base64")
+    cache = cp.DatasetCache(max_size=24 * 8 * 2)
+    names = []
+    for i in range(3):
+        names.append(str(tmp_path / f"cache_test_{i}.csdf"))
+        cp.load(filename).save(names[-1])
+
+    cp.load(names[0], cache=cache)
+    cp.load(names[1], cache=cache)
+    cp.load(names[0], cache=cache)
+    cp.load(names[2], cache=cache)
+    # the least recently used dataset is evicted.
+    assert [key[0] for key in cache.entries] == [names[0], names[2]]
+    assert cache.size == 24 * 8 * 2
+
+    cache.max_size = 10
+    cp.load(names[1], cache=cache)
+    assert len(cache) == 2
+    cache.clear()
+    assert len(cache) == 0 and cache.size == 0
+    assert cp.DatasetCache.default() is cp.DatasetCache.default()
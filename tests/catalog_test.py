@@ -0,0 +1,98 @@
+import os
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+
+
+def write(directory, name, dimensions, tags=(), description=""):
+    data = cp.CSDM(
+        dimensions=dimensions,
+        dependent_variables=[
+            cp.as_dependent_variable(
+                np.zeros(int(np.prod([item.count for item in dimensions]))),
+                unit="T",
+            )
+        ],
+        tags=list(tags),
+        description=description,
+    )
+    data.save(str(directory / name))
+
+
+def setup(directory):
+    frequency = cp.Dimension(type="linear", count=4, increment="1 Hz")
+    time = cp.Dimension(type="linear", count=3, increment="1 s")
+    labeled = cp.Dimension(type="labeled", labels=["a", "b"])
+    (directory / "sub").mkdir()
+    write(directory, "a.csdf", [frequency, time], ["13C"], "A 2D spectrum")
+    write(directory, "b.csdfe", [time, frequency], ["1H"])
+    write(directory, "sub/c.csdf.gz", [frequency], ["13C", "1D"])
+    write(directory, "d.csdf", [labeled, time, time], ["13C"], "phase_1 at 100%")
+    (directory / "notes.txt").write_text("not a dataset")
+
+
+def test_catalog(tmp_path):
+    setup(tmp_path)
+    with cp.Catalog(tmp_path) as catalog:
+        assert catalog.scan() == 4
+        assert len(catalog) == 4
+
+        def find(*names, **kwargs):
+            expected = [str(tmp_path / item) for item in names]
+            assert catalog.find(**kwargs) == expected
+
+        find("a.csdf", "b.csdfe", "d.csdf", "sub/c.csdf.gz")
+        find("a.csdf", ndim=2, quantity_name="frequency", tags="13C")
+        find("a.csdf", "b.csdfe", ndim=2)
+        find("b.csdfe", shape=[3, 4])
+        find("d.csdf", type="labeled")
+        find("a.csdf", "b.csdfe", "sub/c.csdf.gz", unit="Hz")
+        find("sub/c.csdf.gz", tags=["13C", "1D"])
+        find("a.csdf", description="2d SPECTRUM")
+        # the wildcards of LIKE are matched literally.
+        find("d.csdf", description="%")
+        find("d.csdf", description="e_1")
+        find(description="e_ ")
+        find(description="\\")
+        # the criteria of a dimension must match the same dimension.
+        find(type="labeled", unit="s")
+
+        rows = catalog.connection.execute(
+            "SELECT name, unit, quantity_name, numeric_type FROM dependent_variables"
+        ).fetchall()
+        assert set(rows) == {("", "T", "magnetic flux density", "float64")}
+
+    # the index is persistent, and a rescan parses only the changed files.
+    catalog = cp.Catalog(tmp_path)
+    assert len(catalog) == 4
+    assert catalog.scan() == 0
+    write(
+        tmp_path,
+        "b.csdfe",
+        [cp.Dimension(type="linear", count=5, increment="1 s")],
+        ["1H"],
+    )
+    os.remove(tmp_path / "d.csdf")
+    write(tmp_path, "e.csdf", [cp.Dimension(type="linear", count=2, increment="1 s")])
+    assert catalog.scan() == 2
+    assert catalog.find(tags="1H", ndim=1) == [str(tmp_path / "b.csdfe")]
+    assert catalog.find(type="labeled") == []
+    assert len(catalog) == 4
+    catalog.close()
+
+
+def test_catalog_errors(tmp_path):
+    with pytest.raises(ValueError, match="is not a directory"):
+        cp.Catalog(tmp_path / "missing")
+
+    (tmp_path / "bad.csdf").write_text("{not json")
+    index = str(tmp_path / "index.sqlite")
+    with cp.Catalog(tmp_path, index=index) as catalog:
+        assert catalog.scan() == 1
+        assert catalog.find() == []
+        assert list(catalog.errors()) == [str(tmp_path / "bad.csdf")]
+        # the file is not parsed again until it changes.
+        assert catalog.scan() == 0
+    assert os.path.exists(index)
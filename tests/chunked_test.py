@@ -0,0 +1,107 @@
+import io
+from os import path
+from os import remove
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+from csdmpy.dependent_variable import chunked
+from csdmpy.dependent_variable import region
+
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma", "bz2"])
+@pytest.mark.parametrize("dtype", ["<u1", "<i4", "<f8", "<c16"])
+def test_write_chunked(codec, dtype):
+    array = (np.arange(3 * 1001) % 17).astype(dtype).reshape(3, 1001)
+    file = io.BytesIO()
+    chunked.write_chunked(array, file, codec, chunk_size=1000)
+    assert chunked.is_chunked(file.getbuffer())
+    assert file.tell() < array.nbytes
+
+    reader = chunked.ChunkedReader(file)
+    assert reader.size == array.nbytes
+    assert reader.chunk_size == 1000 // array.itemsize * array.itemsize
+    assert np.array_equal(reader.read_array(dtype).reshape(3, 1001), array)
+
+    section = (slice(None), slice(10, 900, 7))
+    new = region.read_region(reader, dtype, array.shape, section)
+    assert np.array_equal(new, array[section])
+
+
+def test_chunked_errors():
+    error = "The value, `gzip`, is an invalid `compression`"
+    with pytest.raises(ValueError, match=error):
+        chunked.write_chunked(np.arange(10), io.BytesIO(), "gzip")
+
+    data = cp.as_csdm(np.arange(10.0))
+    data.y[0].encoding = "raw"
+    with pytest.raises(ValueError, match=error):
+        data.save("chunked_test.csdfe", compression="gzip")
+    assert not path.exists("chunked_test.csdfe")
+
+    with pytest.raises(ValueError, match="missing the chunk index"):
+        chunked.ChunkedReader(io.BytesIO(chunked.MAGIC + bytes(100)))
+
+
+def setup(compression):
+    array = np.zeros((2, 40, 30, 20), dtype=np.float32)
+    array[:, ::7, 3] = np.arange(20)
+    data = cp.as_csdm(array, quantity_type="vector_2")
+    data.y[0].encoding = "raw"
+    data.save("chunked_test.csdfe", compression=compression)
+    return data
+
+
+@pytest.mark.parametrize("compression", ["zlib", "lzma", "bz2"])
+def test_chunked_external(compression, monkeypatch):
+    # one chunk for every index of the slowest axis of the grid.
+    monkeypatch.setattr(chunked, "CHUNK_SIZE", 30 * 20 * 4)
+    data = setup(compression)
+    assert path.getsize("chunked_test_0.dat") < data.y[0].components.nbytes / 3
+    for mmap in [False, True]:
+        new = cp.load("chunked_test.csdfe", mmap=mmap)
+        assert np.array_equal(new.y[0].components, data.y[0].components)
+
+    # only the chunks of the region are decompressed.
+    decompressed = []
+    decompress = chunked.ChunkedReader.decompress
+
+    def spy(self, data, out):
+        decompressed.append(out.size)
+        return decompress(self, data, out)
+
+    monkeypatch.setattr(chunked.ChunkedReader, "decompress", spy)
+    new = cp.load("chunked_test.csdfe", region={2: 5, 1: slice(2, 8)})
+    assert np.array_equal(new.y[0].components, data.y[0].components[:, 5, 2:8])
+    assert len(decompressed) == 2
+
+    remove("chunked_test.csdfe")
+    remove("chunked_test_0.dat")
+
+
+def test_chunked_layout_metadata():
+    data = setup("zlib")
+    data.y[0].application = {"com.example.myApp": {"key": "value"}}
+    data.save("chunked_test.csdfe", compression="zlib")
+    # the codec is recorded for the readers unaware of the chunked binary files.
+    dv = cp.load_metadata("chunked_test.csdfe")["csdm"]["dependent_variables"][0]
+    assert dv["application"] == {
+        "com.example.myApp": {"key": "value"},
+        "csdmpy": {"layout": "chunked", "compression": "zlib"},
+    }
+    assert data.y[0].application == {"com.example.myApp": {"key": "value"}}
+
+    # the layout is not kept with the loaded application metadata.
+    new = cp.load("chunked_test.csdfe", application=True)
+    assert new.y[0].application == {"com.example.myApp": {"key": "value"}}
+    new.save("chunked_test.csdfe")
+    dv = cp.load_metadata("chunked_test.csdfe")["csdm"]["dependent_variables"][0]
+    assert dv["application"] == {"com.example.myApp": {"key": "value"}}
+
+    data.y[0].application = None
+    data.save("chunked_test.csdfe", compression="bz2")
+    new = cp.load("chunked_test.csdfe", application=True)
+    assert new.y[0].application is None
+    remove("chunked_test.csdfe")
+    remove("chunked_test_0.dat")
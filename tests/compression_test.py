@@ -0,0 +1,80 @@
+from os import remove
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+from csdmpy import compression
+
+
+def setup():
+    dims = [cp.Dimension(type="linear", count=20, increment="1 s")]
+    dvs = [
+        cp.as_dependent_variable(np.arange(20, dtype=np.float64), unit="T"),
+        cp.as_dependent_variable(np.arange(20, dtype=np.int32)),
+    ]
+    return cp.CSDM(dimensions=dims, dependent_variables=dvs)
+
+
+@pytest.mark.parametrize("extension", [".gz", ".xz", ".bz2"])
+@pytest.mark.parametrize("stream", [False, True])
+def test_compressed_csdf(extension, stream):
+    data = setup()
+    filename = "compression_test.csdf" + extension
+    data.save(filename)
+
+    assert compression.detect_compression(filename) == extension
+    new = cp.load(filename, stream=stream)
+    assert new == data
+    meta = cp.load_metadata(filename)
+    assert meta["csdm"]["dimensions"][0]["count"] == 20
+    remove(filename)
+
+
+def test_compressed_csdfe():
+    data = setup()
+    data.y[1].encoding = "raw"
+    data.save("compression_test.csdfe.xz")
+
+    # the binary file is named after the filename without the compression extension.
+    new = cp.load("compression_test.csdfe.xz")
+    assert np.array_equal(new.y[1].components, data.y[1].components)
+    remove("compression_test.csdfe.xz")
+    remove("compression_test_1.dat")
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_compressed_container(mmap):
+    data = setup()
+    data.save("compression_test.csdfb.gz")
+
+    assert compression.detect_compression("compression_test.csdfb.gz") == ".gz"
+    new = cp.load("compression_test.csdfb.gz", mmap=mmap)
+    for item, expected in zip(new.y, data.y):
+        assert np.array_equal(item.components, expected.components)
+        assert not isinstance(item.subtype._components.base, np.memmap)
+    del new
+    remove("compression_test.csdfb.gz")
+
+
+def test_detect_from_content():
+    # the format is detected from the magic bytes, irrespective of the filename.
+    data = setup()
+    data.save("compression_test.csdf.bz2")
+    assert compression.detect_compression("compression_test.csdf.bz2") == ".bz2"
+    with open("compression_test.csdf.bz2", "rb") as src:
+        with open("compression_test.csdf", "wb") as dst:
+            dst.write(src.read())
+    assert cp.load("compression_test.csdf") == data
+    remove("compression_test.csdf.bz2")
+    remove("compression_test.csdf")
+
+    data.save("compression_test.csdf")
+    assert compression.detect_compression("compression_test.csdf") is None
+    remove("compression_test.csdf")
+
+
+def test_strip_compression():
+    assert compression.strip_compression("a/file.csdf.gz") == "a/file.csdf"
+    assert compression.strip_compression("file.csdfe.XZ") == "file.csdfe"
+    assert compression.strip_compression("file.csdf") == "file.csdf"
@@ -0,0 +1,91 @@
+import json
+from os import remove
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+from csdmpy import container
+
+
+def setup():
+    dims = [cp.Dimension(type="linear", count=5, increment="1 s")]
+    dims += [cp.Dimension(type="monotonic", coordinates=["1 m", "2 m", "4 m"])]
+    dvs = [
+        cp.as_dependent_variable(np.arange(15, dtype=np.float32), unit="T"),
+        cp.as_dependent_variable(
+            (np.arange(30) + 1j * np.arange(30)).astype(np.complex64),
+            quantity_type="vector_2",
+        ),
+        cp.as_dependent_variable(np.arange(15, dtype=np.uint8)),
+    ]
+    data = cp.CSDM(dimensions=dims, dependent_variables=dvs, description="container")
+    data.y[1].encoding = "none"
+    data.y[2].encoding = "raw"
+    data.save("container_test.csdfb")
+    # the dependent variables are base64 encoded after a load.
+    for item in data.y:
+        item.encoding = "base64"
+    return data
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_container(mmap):
+    data = setup()
+    new = cp.load("container_test.csdfb", mmap=mmap)
+    assert new == data
+    for item, expected in zip(new.y, data.y):
+        assert item.components.dtype == expected.components.dtype
+        assert np.array_equal(item.components, expected.components)
+
+    components = new.y[1].subtype._components
+    assert isinstance(components.base, np.memmap) == mmap
+    assert components.flags.writeable != mmap
+    del new, components
+    remove("container_test.csdfb")
+
+
+def test_container_layout():
+    setup()
+    with open("container_test.csdfb", "rb") as file:
+        magic, size, count = container.PREAMBLE.unpack(
+            file.read(container.PREAMBLE.size)
+        )
+        table = [container.ENTRY.unpack(file.read(16)) for _ in range(count)]
+        header = json.loads(file.read(size))
+    remove("container_test.csdfb")
+
+    assert magic == container.MAGIC
+    assert count == 3
+    assert [offset % container.ALIGNMENT for offset, _ in table] == [0, 0, 0]
+    assert [size for _, size in table] == [15 * 4, 30 * 8, 15]
+    assert header["csdm"]["description"] == "container"
+    assert all(
+        "components" not in item for item in header["csdm"]["dependent_variables"]
+    )
+
+
+def test_container_round_trip():
+    data = setup()
+    meta = cp.load_metadata("container_test.csdfb")
+    assert meta["csdm"]["dependent_variables"][0]["numeric_type"] == "float32"
+
+    # .csdfb -> .csdf -> .csdfb
+    new = cp.load("container_test.csdfb")
+    new.save("container_test.csdf")
+    new = cp.load("container_test.csdf")
+    assert new == data
+    new.save("container_test.csdfb")
+    assert cp.load("container_test.csdfb") == data
+
+    for item in ["container_test.csdfb", "container_test.csdf"]:
+        remove(item)
+
+
+def test_container_empty():
+    data = cp.new("empty")
+    data.save("container_test.csdfb")
+    new = cp.load("container_test.csdfb")
+    remove("container_test.csdfb")
+    assert new.description == "empty"
+    assert len(new.dependent_variables) == 0
@@ -0,0 +1,66 @@
+import numpy as np
+
+import csdmpy as cp
+
+
+def setup():
+    data = cp.as_csdm(np.arange(20.0).reshape(4, 5), unit="T")
+    data.dimensions[0] = cp.Dimension(
+        type="linear", count=5, increment="2 s", label="time", application={"a": 1}
+    )
+    data.dimensions[1] = cp.Dimension(
+        type="monotonic", coordinates=["1 Hz", "2 Hz", "4 Hz", "8 Hz"]
+    )
+    data.y[0].component_labels = ["field"]
+    data.tags = ["one"]
+    return data
+
+
+def test_copy_shares_immutable_metadata():
+    data = setup()
+    new = data.copy()
+    assert new == data
+    assert new.y[0].subtype._unit is data.y[0].subtype._unit
+    assert new.x[0].subtype._increment is data.x[0].subtype._increment
+    assert new.x[1].subtype._coordinates is data.x[1].subtype._coordinates
+    assert not np.shares_memory(new.y[0].components, data.y[0].components)
+    assert new.y[0].subtype._numeric_type is not data.y[0].subtype._numeric_type
+
+
+def test_copy_is_independent():
+    data = setup()
+    new = data.copy()
+    new.y[0].components[0, 0, 0] = -1
+    new.y[0].component_labels[0] = "other"
+    new.y[0].numeric_type = "float32"
+    new.x[0].application["a"] = 2
+    new.x[0].label = "other"
+    new.tags.append("two")
+    new.x[0] *= 2
+    new.x[1] /= 2
+
+    assert data.y[0].components[0, 0, 0] == 0
+    assert data.y[0].component_labels == ["field"]
+    assert data.y[0].numeric_type == "float64"
+    assert data.x[0].application == {"a": 1}
+    assert data.x[0].label == "time"
+    assert data.tags == ["one"]
+    assert str(data.x[0].increment) == "2.0 s"
+    assert np.allclose(data.x[0].coordinates.value, np.arange(5) * 2)
+    assert np.allclose(data.x[1].coordinates.value, [1, 2, 4, 8])
+    assert np.allclose(new.x[0].coordinates.value, np.arange(5) * 4)
+    assert np.allclose(new.x[1].coordinates.value, [0.5, 1, 2, 4])
+
+
+def test_lazy_linear_coordinates():
+    dim = cp.Dimension(type="linear", count=5, increment="2 s")
+    assert dim.subtype._coordinates is None
+    assert np.allclose(dim.coordinates.value, np.arange(5) * 2)
+
+    dim.count = 3
+    assert dim.subtype._coordinates is None
+    assert np.allclose(dim.coordinates.value, np.arange(3) * 2)
+    dim.increment = "1 s"
+    assert np.allclose(dim.coordinates.value, np.arange(3))
+    assert dim[::2]._coordinates is None
+    assert np.allclose(dim[::2].coordinates.value, [0, 2])
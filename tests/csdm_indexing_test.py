@@ -145,3 +145,42 @@ def test_index_8():
     error = "Fancy indexing using tuples or lists may result in"
     with pytest.raises(NotImplementedError, match=f".*{error}.*"):
         _ = a_obj[(1, 3, 9), 10]
+
+
+def test_index_linear():
+    for index in [slice(3, 28, 4), slice(None, None, -3), slice(-2, 1, -5)]:
+        l_test = a_obj[:, :, index]
+        expected = d2.coordinates[index]
+        new = l_test.dimensions[2]
+        assert new.type == "linear"
+        assert new.count == expected.size
+        assert np.allclose(new.coordinates.to("ms").value, expected.to("ms").value)
+        assert new.label == "t3"
+        assert new.application == {"blah": "blah"}
+        # the components are a view of the components of the sliced object.
+        assert np.shares_memory(l_test.y[0].components, a_obj.y[0].components)
+        assert np.allclose(l_test.y[0].components, array[index])
+        save_and_load(l_test)
+
+    # the sliced dimension does not share the mutable metadata.
+    l_test = a_obj[:, :, 2:10]
+    l_test.dimensions[2].application["blah"] = "new"
+    l_test.dimensions[2] *= 2
+    assert a_obj.dimensions[2].application == {"blah": "blah"}
+    assert str(a_obj.dimensions[2].increment) == "2.4 ms"
+    assert str(a_obj.dimensions[2].coordinates_offset) == "-5.0 ms"
+
+    fft = cp.as_csdm(np.arange(8.0))
+    fft.dimensions[0] = cp.Dimension(
+        type="linear", count=8, increment="1 Hz", complex_fft=True
+    )
+    new = fft[1::2].dimensions[0]
+    assert not new.complex_fft
+    assert np.allclose(new.coordinates.value, [-3, -1, 1, 3])
+
+
+def test_index_out_of_bounds():
+    with pytest.raises(IndexError, match="out of bounds"):
+        _ = a_obj[10]
+    with pytest.raises(IndexError, match="out of bounds"):
+        _ = a_obj[0, 0, -31]
@@ -646,6 +646,22 @@ def test_neg_to_pos_inc1():
     )
 
 
+def test_neg_to_pos_inc_complex_fft():
+    x = [cp.LinearDimension(count=8, increment="-1 Hz", complex_fft=True)]
+    y = [cp.as_dependent_variable(array=[np.random.rand(8)])]
+    obj = cp.CSDM(dimensions=x, dependent_variables=y)
+
+    new_obj = obj.to_positive_inc()
+    assert new_obj.x[0].complex_fft
+    np.testing.assert_allclose(
+        new_obj.x[0].coordinates.value[::-1], obj.x[0].coordinates.value
+    )
+    new_obj = cp.parse_dict(new_obj.to_dict())
+    np.testing.assert_allclose(
+        new_obj.x[0].coordinates.value[::-1], obj.x[0].coordinates.value
+    )
+
+
 def test_neg_to_pos_inc2():
     x = [
         cp.MonotonicDimension(coordinates=["1", "-10", "-100"]),
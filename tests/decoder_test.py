@@ -0,0 +1,90 @@
+import base64
+
+import numpy as np
+import pytest
+
+from csdmpy.dependent_variable import decoder
+from csdmpy.dependent_variable.decoder import Decoder
+from csdmpy.utils import QuantityType
+
+
+@pytest.mark.parametrize("chunk_size", [4, 12, 400, decoder.BASE64_CHUNK_SIZE])
+@pytest.mark.parametrize("dtype", ["<u1", "<i4", "<f8", "<c8"])
+def test_decode_base64(chunk_size, dtype, monkeypatch):
+    monkeypatch.setattr(decoder, "BASE64_CHUNK_SIZE", chunk_size)
+    array = (np.random.rand(3, 101) * 100).astype(dtype)
+    components = [base64.b64encode(item).decode("utf-8") for item in array]
+
+    decoded = Decoder("base64", QuantityType("vector_3"), components, dtype)
+    assert decoded.dtype == np.dtype(dtype)
+    assert decoded.flags.c_contiguous
+    assert np.array_equal(decoded, array)
+
+
+@pytest.mark.parametrize("chunk_size", [4, 12, decoder.BASE64_CHUNK_SIZE])
+def test_decode_base64_wrapped(chunk_size, monkeypatch, tmp_path):
+    import csdmpy as cp
+
+    monkeypatch.setattr(decoder, "BASE64_CHUNK_SIZE", chunk_size)
+    array = np.random.rand(2, 101)
+    # base64 wrapped at 76 characters per line.
+    components = [base64.encodebytes(item.tobytes()).decode("utf-8") for item in array]
+    decoded = Decoder("base64", QuantityType("vector_2"), components, "<f8")
+    assert np.array_equal(decoded, array)
+
+    data = cp.as_csdm(array, quantity_type="vector_2")
+    data.save(str(tmp_path / "wrapped.csdf"))
+    text = (tmp_path / "wrapped.csdf").read_text()
+    for item in array:
+        encoded = base64.b64encode(item).decode("utf-8")
+        wrapped = base64.encodebytes(item.tobytes()).decode("utf-8")
+        text = text.replace(encoded, wrapped.replace("\n", "\\n"))
+    (tmp_path / "wrapped.csdf").write_text(text)
+    assert "\\n" in text
+    assert np.array_equal(
+        cp.load(str(tmp_path / "wrapped.csdf")).y[0].components, array
+    )
+
+
+def test_decode_base64_error():
+    components = [
+        base64.b64encode(np.arange(4.0)).decode("utf-8"),
+        base64.b64encode(np.arange(5.0)).decode("utf-8"),
+    ]
+    error = "The base64 encoded components have different lengths"
+    with pytest.raises(ValueError, match=error):
+        Decoder("base64", QuantityType("vector_2"), components, "<f8")
+
+    error = "buffer size must be a multiple of element size"
+    with pytest.raises(ValueError, match=error):
+        Decoder("base64", QuantityType("scalar"), components[1:], "<c16")
+
+
+@pytest.mark.parametrize("dtype", ["<c8", "<c16"])
+def test_decode_none_complex(dtype):
+    array = (np.random.rand(2, 7) + 1j * np.random.rand(2, 7)).astype(dtype)
+    components = array.view(array.real.dtype).tolist()
+
+    decoded = Decoder("none", QuantityType("vector_2"), components, dtype)
+    assert decoded.dtype == np.dtype(dtype)
+    assert np.array_equal(decoded, array)
+
+
+@pytest.mark.parametrize("encoding", ["none", "base64"])
+def test_ravel_data_complex(encoding):
+    import csdmpy as cp
+
+    array = np.random.rand(2, 3, 4) + 1j * np.random.rand(2, 3, 4)
+    data = cp.as_csdm(array, quantity_type="vector_2")
+    data.y[0].encoding = encoding
+
+    raveled = data.y[0].subtype.ravel_data()
+    assert raveled.shape == (2, 24)
+    assert np.shares_memory(raveled, data.y[0].components)
+
+    assert np.array_equal(cp.loads(data.dumps()).y[0].components, array)
+    # non C-contiguous components
+    transpose = data.T
+    expected = transpose.y[0].components
+    assert not expected.flags.c_contiguous
+    assert np.array_equal(cp.loads(transpose.dumps()).y[0].components, expected)
@@ -0,0 +1,588 @@
+import asyncio
+import functools
+import gzip
+import hashlib
+import io
+import os
+import threading
+import time
+from concurrent import futures
+from http.server import SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+import numpy as np
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import csdmpy as cp
+from csdmpy.dependent_variable import async_http
+from csdmpy.dependent_variable import download
+from csdmpy.dependent_variable import external
+
+
+class Handler(SimpleHTTPRequestHandler):
+    """Serve the files of a directory, with single byte range requests, and record
+    the requests."""
+
+    ranges = True
+    fail = None
+    # the maximum size of the partial content responses.
+    short = None
+
+    def __init__(self, *args, requests=None, **kwargs):
+        self.requests = requests
+        super().__init__(*args, **kwargs)
+
+    def end_headers(self):
+        self.send_header("Accept-Ranges", "bytes")
+        super().end_headers()
+
+    def send_head(self):
+        byte_range = self.headers.get("Range")
+        if byte_range is None:
+            self.requests.append((self.command, self.path))
+            return super().send_head()
+
+        self.requests.append((self.command, self.path, byte_range))
+        if byte_range == self.fail:
+            self.send_error(500)
+            return None
+        filename = self.translate_path(self.path)
+        if not self.ranges or not os.path.isfile(filename):
+            return super().send_head()
+
+        with open(filename, "rb") as file:
+            content = file.read()
+        start, stop = byte_range[len("bytes=") :].split("-")
+        body = content[int(start) : int(stop) + 1][: self.short]
+        self.send_response(206)
+        self.send_header("Content-Range", f"bytes {start}-{stop}/{len(content)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """Yield the url of a local http server of the `www` directory, along with the
+    list of requests to the server."""
+    monkeypatch.setenv("CSDMPY_CACHE_DIR", str(tmp_path / "cache"))
+    (tmp_path / "www").mkdir()
+    log = []
+    handler = functools.partial(Handler, directory=str(tmp_path / "www"), requests=log)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", tmp_path, log
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def write(tmp_path, name, data, **kwargs):
+    data.save(str(tmp_path / "www" / name), **kwargs)
+
+
+def test_download_cache(server):
+    url, tmp_path, log = server
+    data = cp.as_csdm(np.arange(10.0))
+    write(tmp_path, "test.csdf", data)
+
+    new = cp.load(f"{url}/test.csdf")
+    assert np.array_equal(new.y[0].components, data.y[0].components)
+    assert ("GET", "/test.csdf") in log
+    cached = os.listdir(tmp_path / "cache")
+    assert len(cached) == 2
+    assert not os.path.exists("test.csdf")
+
+    # cache hit
+    log.clear()
+    new = cp.load(f"{url}/test.csdf")
+    assert log == [("HEAD", "/test.csdf")]
+    assert os.listdir(tmp_path / "cache") == cached
+
+    # the remote file has changed
+    data = cp.as_csdm(np.arange(100.0))
+    write(tmp_path, "test.csdf", data)
+    log.clear()
+    new = cp.load(f"{url}/test.csdf")
+    assert ("GET", "/test.csdf") in log
+    assert np.array_equal(new.y[0].components, data.y[0].components)
+
+
+def test_download_cache_offline(server, monkeypatch):
+    url, tmp_path, _ = server
+    data = cp.as_csdm(np.arange(10.0))
+    write(tmp_path, "test.csdf", data)
+    cache = download.DownloadCache(str(tmp_path / "cache2"))
+    filename = cache.get(f"{url}/test.csdf")
+
+    def unreachable(*args, **kwargs):
+        raise requests.ConnectionError()
+
+    monkeypatch.setattr(requests.Session, "head", unreachable)
+    assert cache.get(f"{url}/test.csdf") == filename
+    with pytest.raises(requests.ConnectionError):
+        cache.get(f"{url}/missing.csdf")
+
+
+def test_aload_remote(server, monkeypatch):
+    url, tmp_path, log = server
+    data = [cp.as_csdm(np.arange(10.0) * i) for i in range(8)]
+    for i, item in enumerate(data):
+        write(tmp_path, f"test_{i}.csdf", item)
+    remote = cp.as_csdm(np.arange(10.0))
+    remote.y[0].encoding = "raw"
+    text = open(remote_csdfe(url, tmp_path, remote)).read()
+    (tmp_path / "www" / "remote.csdfe").write_text(text)
+
+    active, counts = [], []
+    send_head = Handler.send_head
+
+    def slow(self):
+        active.append(1)
+        counts.append(len(active))
+        time.sleep(0.1)
+        active.pop()
+        return send_head(self)
+
+    def blocking(*args, **kwargs):
+        raise AssertionError("blocking request")
+
+    async def main(executor):
+        files = [f"{url}/test_{i}.csdf" for i in range(8)]
+        return await asyncio.gather(*[cp.aload(f, executor=executor) for f in files])
+
+    with monkeypatch.context() as patch:
+        # the downloads do not run in the threads of the executor.
+        patch.setattr(requests.Session, "request", blocking)
+        patch.setattr(Handler, "send_head", slow)
+        with futures.ThreadPoolExecutor(1) as executor:
+            new = asyncio.run(main(executor))
+        for item, expected in zip(new, data):
+            assert np.array_equal(item.y[0].components, expected.y[0].components)
+        # the downloads are concurrent, beyond the thread of the executor.
+        assert max(counts) > 1
+
+        # a cache hit.
+        log.clear()
+        assert asyncio.run(cp.aload(f"{url}/test_0.csdf")).y[0].components.sum() == 0
+        assert log == [("HEAD", "/test_0.csdf")]
+
+    # the components_url of the remote file are fetched in the executor.
+    new = asyncio.run(cp.aload(f"{url}/remote.csdfe"))
+    assert np.array_equal(new.y[0].components, remote.y[0].components)
+
+
+def test_async_http(server):
+    url, tmp_path, log = server
+    (tmp_path / "www" / "sub").mkdir()
+    (tmp_path / "www" / "sub" / "test.dat").write_bytes(bytes(range(10)))
+
+    async def get(url):
+        file = io.BytesIO()
+        response = await async_http.request("GET", url, file, timeout=10)
+        return response, file.getvalue()
+
+    # the redirect of a directory to the url with the trailing slash.
+    response, content = asyncio.run(get(f"{url}/sub"))
+    assert response.status_code == 200
+    assert response.url == f"{url}/sub/"
+    assert b"test.dat" in content
+    response, content = asyncio.run(get(f"{url}/sub/test.dat"))
+    assert content == bytes(range(10))
+    assert response.size == 10
+    response, content = asyncio.run(get(f"{url}/missing.dat"))
+    with pytest.raises(requests.HTTPError, match="404"):
+        response.raise_for_status()
+    assert content == b""
+
+    with pytest.raises(requests.ConnectionError):
+        asyncio.run(get("http://127.0.0.1:1/test.dat"))
+    cache = download.DownloadCache(str(tmp_path / "cache2"))
+    with pytest.raises(requests.ConnectionError):
+        asyncio.run(cache.aget("http://127.0.0.1:1/test.dat"))
+
+
+@pytest.mark.parametrize("encoding", ["chunked", "gzip"])
+def test_async_http_body(encoding):
+    content = os.urandom(100000)
+    headers = CaseInsensitiveDict({"Content-Length": str(len(content))})
+    body = content
+    if encoding == "chunked":
+        headers = CaseInsensitiveDict({"Transfer-Encoding": "chunked"})
+        body = b"".join(
+            b"%x;ext=1\r\n%b\r\n"
+            % (len(content[i : i + 30000]), content[i : i + 30000])
+            for i in range(0, len(content), 30000)
+        )
+        body += b"0\r\n\r\n"
+    else:
+        body = gzip.compress(content)
+        headers = CaseInsensitiveDict({"Content-Encoding": "gzip"})
+
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(body)
+        reader.feed_eof()
+        file = io.BytesIO()
+        size = await async_http.read_body(reader, headers, file, timeout=10)
+        return size, file.getvalue()
+
+    size, new = asyncio.run(read())
+    assert new == content
+    assert size == (len(content) if encoding == "chunked" else len(body))
+
+
+def test_download_cache_without_validators(server, monkeypatch):
+    url, tmp_path, log = server
+    (tmp_path / "www" / "test.dat").write_bytes(bytes(10))
+    cache = download.DownloadCache(str(tmp_path / "cache2"))
+
+    # the HEAD request of a GET only url fails.
+    def head(*args, **kwargs):
+        response = requests.Response()
+        response.status_code = 405
+        return response
+
+    monkeypatch.setattr(requests.Session, "head", head)
+    with open(cache.get(f"{url}/test.dat"), "rb") as file:
+        assert file.read() == bytes(10)
+
+    # the cached file is not reused.
+    (tmp_path / "www" / "test.dat").write_bytes(bytes(range(10)))
+    log.clear()
+    with open(cache.get(f"{url}/test.dat"), "rb") as file:
+        assert file.read() == bytes(range(10))
+    assert log == [("GET", "/test.dat")]
+    assert len(os.listdir(tmp_path / "cache2")) == 2
+
+
+def test_download_cache_errors(server):
+    url, tmp_path, _ = server
+    cache = download.DownloadCache(str(tmp_path / "cache2"))
+    with pytest.raises(requests.HTTPError):
+        cache.get(f"{url}/missing.csdf")
+    assert os.listdir(tmp_path / "cache2") == []
+
+
+def test_download_cache_eviction(server):
+    url, tmp_path, _ = server
+    for i in range(4):
+        (tmp_path / "www" / f"{i}.dat").write_bytes(bytes(1000))
+
+    cache = download.DownloadCache(str(tmp_path / "cache2"), max_size=2500)
+    files = [cache.get(f"{url}/{i}.dat") for i in range(3)]
+    assert [os.path.isfile(item) for item in files] == [False, True, True]
+
+    os.utime(files[1], (0, 0))
+    files.append(cache.get(f"{url}/3.dat"))
+    assert [os.path.isfile(item) for item in files] == [False, False, True, True]
+
+    # a single file larger than the cache is kept
+    cache.max_size = 10
+    assert os.path.isfile(cache.get(f"{url}/0.dat"))
+
+
+def test_remote_components(server, monkeypatch):
+    url, tmp_path, log = server
+    dvs = [cp.as_dependent_variable(np.arange(10.0) * i) for i in range(3)]
+    dims = [cp.Dimension(type="linear", count=10, increment="1 s")]
+    data = cp.CSDM(dimensions=dims, dependent_variables=dvs)
+    for item in data.y:
+        item.encoding = "raw"
+    write(tmp_path, "test.csdfe", data)
+
+    text = (tmp_path / "www" / "test.csdfe").read_text()
+    text = text.replace("file:./", f"{url}/")
+    (tmp_path / "test.csdfe").write_text(text)
+
+    # the components of the dependent variables are fetched concurrently.
+    barrier = threading.Barrier(3, timeout=10)
+
+    def fetch_array(source, dtype):
+        barrier.wait()
+        return download.fetch_array(source, dtype)
+
+    monkeypatch.setattr(external, "fetch_array", fetch_array)
+    new = cp.load(str(tmp_path / "test.csdfe"))
+    for item, expected in zip(new.y, data.y):
+        assert np.array_equal(item.components, expected.components)
+    assert sorted(log) == [("GET", f"/test_{i}.dat") for i in range(3)]
+
+
+def test_session():
+    assert download.session() is download.session()
+    adapter = download.session().get_adapter("http://127.0.0.1")
+    assert adapter._pool_maxsize == download.MAX_CONNECTIONS
+
+
+@pytest.mark.parametrize("dtype", ["<u1", "<f4", "<c16"])
+def test_fetch_array(server, monkeypatch, dtype):
+    url, tmp_path, _ = server
+    array = (np.random.rand(1001) * 100).astype(dtype)
+    (tmp_path / "www" / "test.dat").write_bytes(array.tobytes())
+
+    monkeypatch.setattr(download, "READ_CHUNK_SIZE", 64)
+    for source in [f"{url}/test.dat", (tmp_path / "www" / "test.dat").as_uri()]:
+        new = download.fetch_array(source, dtype)
+        assert new.dtype == np.dtype(dtype)
+        assert new.flags.writeable
+        assert np.array_equal(new, array)
+
+    error = "buffer size must be a multiple of element size"
+    (tmp_path / "www" / "test.dat").write_bytes(bytes(7))
+    if dtype != "<u1":
+        with pytest.raises(ValueError, match=error):
+            download.fetch_array(f"{url}/test.dat", dtype)
+
+
+def test_read_array_error():
+    error = "Expecting 16 bytes from the url"
+    with pytest.raises(ValueError, match=error):
+        download.read_array(io.BytesIO(bytes(8)), 16, np.dtype("<f8"))
+    with pytest.raises(ValueError, match=error):
+        download.read_array(io.BytesIO(bytes(24)), 16, np.dtype("<f8"))
+
+
+def remote_csdfe(url, tmp_path, data, **kwargs):
+    """Save the data to the server, and return the path of a local copy of the
+    .csdfe file with the http components_url."""
+    write(tmp_path, "test.csdfe", data, **kwargs)
+    text = (tmp_path / "www" / "test.csdfe").read_text()
+    (tmp_path / "test.csdfe").write_text(text.replace("file:./", f"{url}/"))
+    return str(tmp_path / "test.csdfe")
+
+
+@pytest.mark.parametrize("ranges", [True, False])
+def test_range_requests(server, monkeypatch, ranges):
+    url, tmp_path, log = server
+    monkeypatch.setattr(Handler, "ranges", ranges)
+    array = np.random.rand(40, 30, 20)
+    data = cp.as_csdm(array)
+    data.y[0].encoding = "raw"
+    filename = remote_csdfe(url, tmp_path, data)
+
+    # a single trace along the first dimension.
+    new = cp.load(filename, region={1: 3, 2: 5})
+    assert np.array_equal(new.y[0].components[0], array[5, 3])
+    gets = [item for item in log if item[0] == "GET"]
+    assert len(gets) == 1
+    assert gets[0] == ("GET", "/test_0.dat", "bytes=24480-24639")
+
+    # the runs of a lazy slice are fetched concurrently.
+    log.clear()
+    monkeypatch.setattr(download, "RANGE_OVERHEAD", 1000)
+    new = cp.load(filename, lazy=True)[::2, 4, ::13]
+    assert np.array_equal(new.y[0].components[0], array[::13, 4, ::2])
+    gets = [item for item in log if item[0] == "GET"]
+    assert len(gets) == 4
+
+
+def test_range_requests_tiled(server):
+    url, tmp_path, log = server
+    array = np.random.rand(40, 30, 20)
+    data = cp.as_csdm(array)
+    data.y[0].encoding = "raw"
+    filename = remote_csdfe(url, tmp_path, data, tiles=10)
+
+    # the magic bytes, the footer, the tile index, and the two 10x10x10 tiles of the
+    # trace.
+    new = cp.load(filename, lazy=True)[:, 4, 5]
+    assert np.array_equal(new.y[0].components[0], array[5, 4])
+    gets = [item for item in log if item[0] == "GET"]
+    assert len(gets) == 4
+    ranges = [item[2].replace("bytes=", "").split("-") for item in gets]
+    size = sum(int(stop) - int(start) + 1 for start, stop in ranges)
+    assert 2 * 8000 < size < array.nbytes / 10
+
+
+def test_range_requests_fallback(server):
+    url, tmp_path, log = server
+    array = np.random.rand(5, 4)
+    data = cp.as_csdm(array)
+    data.y[0].encoding = "raw"
+    filename = remote_csdfe(url, tmp_path, data)
+
+    # a remote file inconsistent with the grid is fetched in full.
+    (tmp_path / "www" / "test_0.dat").write_bytes(array[:4].tobytes())
+    with pytest.raises(ValueError):
+        cp.load(filename, region={1: 0})
+    assert ("GET", "/test_0.dat") in log
+
+
+def test_coalesce():
+    runs = [(100, 10), (0, 10), (12, 8), (50, 10)]
+    assert download.coalesce(runs, 2) == [(0, 20), (50, 60), (100, 110)]
+    assert download.coalesce(runs, 39) == [(0, 60), (100, 110)]
+    assert download.coalesce([], 40) == []
+
+
+def test_remote_file(server):
+    url, tmp_path, log = server
+    content = bytes(range(256)) * 4
+    (tmp_path / "www" / "test.dat").write_bytes(content)
+
+    file = download.RemoteFile(f"{url}/test.dat")
+    assert file.size == 1024
+    buffer = bytearray(16)
+    file.seek(1000)
+    assert file.readinto(buffer) == 16
+    assert bytes(buffer) == content[1000:1016]
+    assert file.tell() == 1016
+    # the end of the content
+    assert file.readinto(buffer) == 8
+    assert bytes(buffer[:8]) == content[1016:]
+    assert log[-1] == ("GET", "/test.dat", "bytes=1016-1031")
+
+
+def test_remote_file_short_response(server, monkeypatch):
+    url, tmp_path, log = server
+    content = bytes(range(256)) * 4
+    (tmp_path / "www" / "test.dat").write_bytes(content)
+
+    file = download.RemoteFile(f"{url}/test.dat")
+    monkeypatch.setattr(Handler, "short", 5)
+    buffer = bytearray(16)
+    file.seek(100)
+    assert file.readinto(buffer) == 5
+    assert bytes(buffer[:5]) == content[100:105]
+    # the next read requests the remaining bytes.
+    assert file.readinto(buffer) == 5
+    assert bytes(buffer[:5]) == content[105:110]
+
+    monkeypatch.setattr(Handler, "short", 0)
+    file.seek(500)
+    with pytest.raises(ValueError, match="no bytes of .* at the offset 500"):
+        file.readinto(buffer)
+
+
+@pytest.fixture
+def parallel(monkeypatch):
+    monkeypatch.setattr(download, "PARALLEL_MIN_SIZE", 1000)
+    monkeypatch.setattr(download, "PARALLEL_CHUNK_SIZE", 100)
+
+
+def test_parallel_download(server, parallel):
+    url, tmp_path, log = server
+    content = os.urandom(1050)
+    (tmp_path / "www" / "test.dat").write_bytes(content)
+    (tmp_path / "www" / "small.dat").write_bytes(content[:999])
+
+    cache = download.DownloadCache(str(tmp_path / "cache2"))
+    with open(cache.get(f"{url}/test.dat"), "rb") as file:
+        assert file.read() == content
+    gets = sorted(item[2] for item in log if item[0] == "GET")
+    assert len(gets) == 11
+    assert "bytes=1000-1049" in gets
+    assert len(os.listdir(tmp_path / "cache2")) == 2
+
+    log.clear()
+    cache.get(f"{url}/small.dat")
+    assert ("GET", "/small.dat") in log
+
+
+def test_parallel_download_resume(server, parallel, monkeypatch):
+    url, tmp_path, log = server
+    content = os.urandom(1050)
+    (tmp_path / "www" / "test.dat").write_bytes(content)
+
+    cache = download.DownloadCache(str(tmp_path / "cache2"))
+    monkeypatch.setattr(Handler, "fail", "bytes=500-599")
+    with pytest.raises(requests.HTTPError):
+        cache.get(f"{url}/test.dat")
+    files = sorted(item.split(".", 1)[1] for item in os.listdir(tmp_path / "cache2"))
+    assert files == ["dat.part", "dat.part.json"]
+
+    # only the missing range is downloaded.
+    log.clear()
+    monkeypatch.setattr(Handler, "fail", None)
+    with open(cache.get(f"{url}/test.dat"), "rb") as file:
+        assert file.read() == content
+    assert [item for item in log if item[0] == "GET"] == [
+        ("GET", "/test.dat", "bytes=500-599")
+    ]
+    assert len(os.listdir(tmp_path / "cache2")) == 2
+
+
+def test_parallel_download_fallback(server, parallel, monkeypatch):
+    url, tmp_path, log = server
+    content = os.urandom(1050)
+    (tmp_path / "www" / "test.dat").write_bytes(content)
+
+    # the server ignores the Range requests.
+    monkeypatch.setattr(Handler, "ranges", False)
+    cache = download.DownloadCache(str(tmp_path / "cache2"))
+    with open(cache.get(f"{url}/test.dat"), "rb") as file:
+        assert file.read() == content
+    assert ("GET", "/test.dat") in log
+    assert len(os.listdir(tmp_path / "cache2")) == 2
+
+
+def test_parallel_download_concurrent(server, parallel):
+    url, tmp_path, log = server
+    content = os.urandom(1050)
+    (tmp_path / "www" / "test.dat").write_bytes(content)
+
+    # the second download waits for the first, and finds the file in the cache.
+    cache = download.DownloadCache(str(tmp_path / "cache2"))
+    barrier = threading.Barrier(2, timeout=10)
+
+    def get():
+        barrier.wait()
+        return cache.get(f"{url}/test.dat")
+
+    with futures.ThreadPoolExecutor(max_workers=2) as pool:
+        files = list(pool.map(lambda _: get(), range(2)))
+    assert files[0] == files[1]
+    with open(files[0], "rb") as file:
+        assert file.read() == content
+    assert len([item for item in log if item[0] == "GET"]) == 11
+    assert len(os.listdir(tmp_path / "cache2")) == 2
+
+
+def test_parallel_download_lock(tmp_path):
+    # a waiter on a removed lock file retries with the new lock file.
+    filename = str(tmp_path / "test.lock")
+    order = []
+
+    def hold(name):
+        with download.lock(filename):
+            order.append(name)
+            time.sleep(0.05)
+            order.append(name)
+
+    threads = [threading.Thread(target=hold, args=(i,)) for i in range(4)]
+    for item in threads:
+        item.start()
+    for item in threads:
+        item.join()
+    assert all(order[i] == order[i + 1] for i in range(0, 8, 2))
+    assert not os.path.exists(filename)
+
+
+def test_parallel_download_corrupt(server, parallel, monkeypatch):
+    url, tmp_path, _ = server
+    content = os.urandom(1050)
+    (tmp_path / "www" / "test.dat").write_bytes(content)
+    validators = download.DownloadCache.validators
+
+    def etag(checksum):
+        def wrapper(source):
+            return dict(validators(source), ETag=f'"{checksum}"')
+
+        return staticmethod(wrapper)
+
+    cache = download.DownloadCache(str(tmp_path / "cache2"))
+    monkeypatch.setattr(download.DownloadCache, "validators", etag("0" * 32))
+    with pytest.raises(ValueError, match="md5 checksum differs from the ETag"):
+        cache.get(f"{url}/test.dat")
+    assert os.listdir(tmp_path / "cache2") == []
+
+    checksum = hashlib.md5(content).hexdigest()
+    monkeypatch.setattr(download.DownloadCache, "validators", etag(checksum))
+    with open(cache.get(f"{url}/test.dat"), "rb") as file:
+        assert file.read() == content
@@ -0,0 +1,46 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+from csdmpy.dependent_variable import encoder
+
+
+def setup(dtype, encoding):
+    array = (np.random.rand(3, 5, 41) * 100).astype(dtype)
+    data = cp.as_csdm(array, quantity_type="vector_3", unit="T")
+    data = cp.CSDM(dimensions=data.x, dependent_variables=[data.y[0], data.y[0].copy()])
+    data.y[0].encoding = encoding
+    data.y[1].encoding = "none" if encoding == "base64" else "base64"
+    data.y[1].components = np.asfortranarray(data.y[1].components)[:, ::-1]
+    return data
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 2**16])
+@pytest.mark.parametrize("dtype", ["<u1", "<i4", "<f4", "<f8", "<c8", "<c16"])
+@pytest.mark.parametrize("encoding", ["base64", "none"])
+@pytest.mark.parametrize("indent", [None, 0, 2])
+def test_dump(chunk_size, dtype, encoding, indent, monkeypatch):
+    monkeypatch.setattr(encoder, "TEXT_CHUNK_SIZE", chunk_size)
+    monkeypatch.setattr(encoder, "BASE64_CHUNK_SIZE", 3 * chunk_size)
+    data = setup(dtype, encoding)
+    kwargs = dict(ensure_ascii=False, sort_keys=False, indent=indent, allow_nan=False)
+
+    expected = json.dumps(data._dict(), **kwargs)
+    output = io.StringIO()
+    encoder.dump(data._dict(stream=True), output, **kwargs)
+    assert output.getvalue() == expected
+
+
+def test_save_output_device():
+    data = setup("<f8", "base64")
+    data.description = 'A "csdmpy-base64-0123456789abcdef0123456789abcdef" token'
+    output = io.StringIO()
+    data.save(output_device=output)
+
+    new = cp.loads(output.getvalue())
+    assert new.description == data.description
+    assert np.array_equal(new.y[0].components, data.y[0].components)
+    assert np.array_equal(new.y[1].components, data.y[1].components)
@@ -0,0 +1,64 @@
+from os import remove
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+
+
+def setup(encoding):
+    array = np.arange(2 * 5 * 4, dtype=np.float32).reshape(2, 5, 4)
+    data = cp.as_csdm(array, quantity_type="vector_2", unit="T")
+    data.y[0].encoding = encoding
+    return data
+
+
+@pytest.mark.parametrize("encoding", ["base64", "none"])
+def test_lazy_internal(encoding):
+    data = setup(encoding)
+    data.save("lazy_test.csdf")
+    new = cp.load("lazy_test.csdf", lazy=True)
+    remove("lazy_test.csdf")
+
+    assert new.shape == (4, 5)
+    assert new.dimensions == data.dimensions
+    assert new.y[0].subtype.is_lazy()
+    assert new.y[0].numeric_type == "float32"
+
+    assert np.allclose(new.y[0].components, data.y[0].components)
+    assert not new.y[0].subtype.is_lazy()
+    assert new.y[0].components.shape == (2, 5, 4)
+
+
+def test_lazy_external():
+    data = setup("raw")
+    data.save("lazy_test.csdfe")
+    new = cp.load("lazy_test.csdfe", lazy=True)
+    assert new.y[0].subtype.is_lazy()
+
+    # the external file is not read until the components are accessed.
+    remove("lazy_test_0.dat")
+    assert new.shape == (4, 5)
+    with pytest.raises(Exception):
+        _ = new.y[0].components
+
+    data.save("lazy_test.csdfe")
+    new = cp.load("lazy_test.csdfe", lazy=True)
+    new.y[0].numeric_type = "float64"
+    assert np.allclose(new.y[0].components, data.y[0].components)
+    assert new.y[0].numeric_type == "float64"
+
+    remove("lazy_test.csdfe")
+    remove("lazy_test_0.dat")
+
+
+def test_lazy_copy():
+    data = setup("base64")
+    data.save("lazy_test.csdf")
+    new = cp.load("lazy_test.csdf", lazy=True)
+    remove("lazy_test.csdf")
+
+    copy = new.copy()
+    assert copy.y[0].subtype.is_lazy()
+    assert np.allclose(copy.y[0].components, data.y[0].components)
+    assert new.y[0].subtype.is_lazy()
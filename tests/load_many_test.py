@@ -0,0 +1,89 @@
+import os
+from os import remove
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+
+
+def setup():
+    filenames = []
+    for i, size in enumerate([10, 5000, 20]):
+        data = cp.as_csdm(np.random.rand(2, size), quantity_type="vector_2", unit="T")
+        data.y[0].encoding = "base64" if i != 2 else "raw"
+        data.save(f"load_many_test_{i}.csdfe")
+        filenames.append(f"load_many_test_{i}.csdfe")
+    return filenames
+
+
+def teardown(filenames):
+    for item in filenames:
+        remove(item)
+    remove("load_many_test_2_0.dat")
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_load_many(executor):
+    filenames = setup()
+    expected = [cp.load(item) for item in filenames]
+    files = filenames[:1] + ["load_many_test_missing.csdf"] + filenames[1:]
+
+    result = cp.load_many(files, workers=2, executor=executor)
+    assert len(result) == 4
+    assert isinstance(result[1], FileNotFoundError)
+    for new, data in zip(result[:1] + result[2:], expected):
+        assert new == data
+        assert np.array_equal(new.y[0].components, data.y[0].components)
+
+    result = cp.load_many(files, executor=executor, as_completed=True)
+    result = dict(result)
+    assert sorted(result.keys()) == [0, 1, 2, 3]
+    assert isinstance(result[1], FileNotFoundError)
+    assert result[3] == expected[2]
+
+    result = cp.load_many(filenames[:1], executor=executor, region={0: 3})
+    assert np.array_equal(result[0].y[0].components, expected[0].y[0].components[:, 3])
+    teardown(filenames)
+
+
+def test_load_many_shared_memory():
+    filenames = setup()
+    data = cp.load(filenames[1])
+    obj, shared = cp._load_to_shared_memory(filenames[1])
+    assert len(shared) == 1
+    assert obj.y[0].components.size == 0
+
+    new = cp._from_shared_memory(obj, shared)
+    assert np.array_equal(new.y[0].components, data.y[0].components)
+    with pytest.raises(FileNotFoundError):
+        cp._from_shared_memory(obj, shared)
+    teardown(filenames)
+
+
+@pytest.mark.skipif(
+    cp.shared_memory is None or not os.path.isdir("/dev/shm"),
+    reason="requires the posix shared memory",
+)
+def test_load_many_closed():
+    filenames = setup()
+    files = [filenames[1]] * 4
+    before = set(os.listdir("/dev/shm"))
+    # the shared memory of the files loaded after the break is released.
+    for i, result in cp.load_many(
+        files, workers=4, executor="process", as_completed=True
+    ):
+        assert result.y[0].components.size == 10000
+        break
+    assert set(os.listdir("/dev/shm")) - before == set()
+
+    results = cp.load_many(files, executor="process", as_completed=True)
+    results.close()
+    assert set(os.listdir("/dev/shm")) - before == set()
+    teardown(filenames)
+
+
+def test_load_many_errors():
+    error = "The value, `fork`, is an invalid `executor`."
+    with pytest.raises(ValueError, match=error):
+        cp.load_many([], executor="fork")
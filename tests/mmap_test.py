@@ -0,0 +1,52 @@
+from os import remove
+
+import numpy as np
+
+import csdmpy as cp
+
+
+def setup():
+    array = np.arange(2 * 5 * 4, dtype=np.float64).reshape(2, 5, 4)
+    data = cp.as_csdm(array, quantity_type="vector_2", unit="T")
+    data.y[0].encoding = "raw"
+    data.save("mmap_test.csdfe")
+    return data
+
+
+def teardown():
+    remove("mmap_test.csdfe")
+    remove("mmap_test_0.dat")
+
+
+def test_mmap():
+    data = setup()
+    new = cp.load("mmap_test.csdfe", mmap=True)
+    components = new.y[0].components
+
+    assert not components.flags.writeable
+    assert isinstance(components.base, np.memmap)
+    assert components.shape == (2, 5, 4)
+    assert np.allclose(components, data.y[0].components)
+    assert new.dimensions == data.dimensions
+
+    # slicing and reduction
+    sub = new[1:3, 2]
+    assert np.allclose(sub.y[0].components, data.y[0].components[:, 2, 1:3])
+    assert np.allclose(new.sum(axis=0).y[0].components, data.y[0].components.sum(-1))
+
+    # save
+    new.y[0].encoding = "base64"
+    new.save("mmap_test.csdf")
+    assert np.allclose(cp.load("mmap_test.csdf").y[0].components, components)
+    remove("mmap_test.csdf")
+
+    del new, components, sub
+    teardown()
+
+
+def test_no_mmap():
+    _ = setup()
+    new = cp.load("mmap_test.csdfe")
+    assert not isinstance(new.y[0].components.base, np.memmap)
+    del new
+    teardown()
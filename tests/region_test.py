@@ -0,0 +1,88 @@
+import io
+from os import remove
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+from csdmpy.dependent_variable import region
+
+SECTIONS = [
+    (slice(None), slice(None), slice(None), slice(None)),
+    (0, slice(1, 3), slice(None), slice(2, 5)),
+    (slice(None), 2, slice(None, None, 2), slice(None)),
+    (slice(None), slice(None, None, -1), 1, slice(5, 0, -3)),
+    (1, -1, -2, -1),
+    (slice(None), slice(3, 3), slice(None), slice(None)),
+]
+
+
+@pytest.mark.parametrize("section", SECTIONS)
+@pytest.mark.parametrize("read_overhead", [0, 2**14, 2**40])
+@pytest.mark.parametrize("buffer_size", [0, 2**26])
+def test_read_region(section, read_overhead, buffer_size, monkeypatch):
+    monkeypatch.setattr(region, "READ_OVERHEAD", read_overhead)
+    monkeypatch.setattr(region, "MAX_BUFFER_SIZE", buffer_size)
+    array = np.random.rand(2, 4, 5, 6) + 1j * np.random.rand(2, 4, 5, 6)
+    file = io.BytesIO(array.tobytes())
+
+    components = region.read_region(file, array.dtype, array.shape, section)
+    assert components.shape == array[section].shape
+    assert np.array_equal(components, array[section])
+
+
+def test_read_region_errors():
+    array = np.arange(10.0).reshape(2, 5)
+    with pytest.raises(IndexError, match="index 5 is out of bounds for axis 1"):
+        region.read_region(io.BytesIO(array.tobytes()), "<f8", (2, 5), (0, 5))
+
+    error = "Expecting 40 bytes from the binary file, found 32."
+    with pytest.raises(ValueError, match=error):
+        file = io.BytesIO(array[:, :2].tobytes())
+        region.read_region(file, "<f8", (2, 5), (0, slice(None)))
+
+
+def setup():
+    array = np.arange(2 * 6 * 5 * 4, dtype=np.float32).reshape(2, 6, 5, 4)
+    data = cp.as_csdm(array, quantity_type="vector_2", unit="T")
+    data.dimensions[1] = cp.MonotonicDimension(
+        coordinates=["1 s", "2 s", "4 s", "8 s", "16 s"]
+    )
+    data.y[0].encoding = "raw"
+    data.save("region_test.csdfe")
+    return data
+
+
+def teardown():
+    remove("region_test.csdfe")
+    remove("region_test_0.dat")
+
+
+def test_load_region():
+    data = setup()
+    new = cp.load("region_test.csdfe", region={0: slice(1, 3), -1: 4})
+    expected = data[1:3, :, 4]
+
+    assert new.shape == (2, 5)
+    assert new.dimensions == expected.dimensions
+    assert new.dimensions[1].type == "monotonic"
+    assert np.array_equal(new.y[0].components, expected.y[0].components)
+    assert new.y[0].components.base.nbytes == new.y[0].components.nbytes
+
+    with pytest.raises(IndexError, match="The dimension index 3 is out of range"):
+        cp.load("region_test.csdfe", region={3: 1})
+    teardown()
+
+
+def test_lazy_getitem():
+    data = setup()
+    new = cp.load("region_test.csdfe", lazy=True)
+    sub = new[::-2, 1:4, 3]
+    assert new.y[0].subtype.is_lazy()
+    assert np.array_equal(sub.y[0].components, data[::-2, 1:4, 3].y[0].components)
+
+    # the external file is not read again after the components are decoded.
+    _ = new.y[0].components
+    teardown()
+    sub = new[:, 2]
+    assert np.array_equal(sub.y[0].components, data.y[0].components[:, :, 2])
@@ -0,0 +1,144 @@
+import base64
+import io
+import json
+from glob import glob
+from os import path
+from os import remove
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+from csdmpy import scanner
+
+
+def setup(dtype, encoding, indent=0):
+    array = (np.random.rand(3, 5, 41) * 100).astype(dtype)
+    data = cp.as_csdm(array, quantity_type="vector_3", unit="T")
+    data = cp.CSDM(dimensions=data.x, dependent_variables=[data.y[0], data.y[0].copy()])
+    data.y[0].encoding = encoding
+    data.y[1].encoding = "none" if encoding == "base64" else "base64"
+    data.save("scanner_test.csdf", indent=indent)
+    return data
+
+
+@pytest.mark.parametrize("read_size", [1, 7, 2**20])
+@pytest.mark.parametrize("dtype", ["<u1", "<i4", "<f4", "<f8", "<c8", "<c16"])
+@pytest.mark.parametrize("encoding", ["base64", "none"])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_scan(read_size, dtype, encoding, indent, monkeypatch):
+    monkeypatch.setattr(scanner, "READ_SIZE", read_size)
+    data = setup(dtype, encoding, indent)
+
+    new = cp.load("scanner_test.csdf", stream=True)
+    assert new == cp.load("scanner_test.csdf")
+    assert new.y[0].numeric_type == data.y[0].numeric_type
+    assert np.array_equal(new.y[0].components, data.y[0].components)
+    assert np.array_equal(new.y[1].components, data.y[1].components)
+    remove("scanner_test.csdf")
+
+
+def test_scan_unordered_keys():
+    # the components precede the numeric_type, and are parsed with the json module.
+    dictionary = setup("<f8", "base64").dict()
+    remove("scanner_test.csdf")
+    dv = dictionary["csdm"]["dependent_variables"][0]
+    dictionary["csdm"]["dependent_variables"][0] = {
+        "components": dv.pop("components"),
+        **dv,
+    }
+    string = json.dumps(dictionary)
+    dv = scanner.scan(io.StringIO(string))["csdm"]["dependent_variables"][0]
+    assert dv == json.loads(string)["csdm"]["dependent_variables"][0]
+
+
+@pytest.mark.parametrize("read_size", [1, 7, 2**20])
+def test_scan_escaped_base64(read_size, monkeypatch):
+    monkeypatch.setattr(scanner, "READ_SIZE", read_size)
+    data = setup("<f8", "base64")
+    remove("scanner_test.csdf")
+    dictionary = data.dict()
+    dv = dictionary["csdm"]["dependent_variables"][0]
+    # line-wrapped base64, with the escaped solidus and a unicode escape.
+    dv["components"] = [
+        base64.encodebytes(item.tobytes()).decode("utf-8")
+        for item in data.y[0].components
+    ]
+    string = json.dumps(dictionary).replace("/", "\\/")
+    string = string.replace('"components": ["', '"components": ["\\u0020')
+    assert "\\n" in string
+
+    dv = scanner.scan(io.StringIO(string))["csdm"]["dependent_variables"][0]
+    assert np.array_equal(dv["components"], data.y[0].components.reshape(3, -1))
+    assert np.array_equal(cp.loads(string).y[0].components, data.y[0].components)
+
+    error = "Invalid"
+    with pytest.raises(json.JSONDecodeError, match=error):
+        scanner.scan(io.StringIO(string.replace('\\n"', '\\u00"', 1)))
+
+
+def test_scan_errors():
+    dictionary = setup("<f8", "base64").dict()
+    remove("scanner_test.csdf")
+    dv = dictionary["csdm"]["dependent_variables"][0]
+
+    components = dv["components"]
+    dv["components"] = components[:2]
+    error = "The quantity_type, 'vector_3', requires exactly 3 component"
+    with pytest.raises(Exception, match=error):
+        scanner.scan(io.StringIO(json.dumps(dictionary)))
+
+    dv["components"] = components[:2] + [components[2][:-8]]
+    error = "The encoded components have different lengths"
+    with pytest.raises(ValueError, match=error):
+        scanner.scan(io.StringIO(json.dumps(dictionary)))
+
+    dv["components"] = components
+    with pytest.raises(json.JSONDecodeError):
+        scanner.scan(io.StringIO(json.dumps(dictionary)[:-10]))
+
+    with pytest.raises(json.JSONDecodeError, match="Extra data"):
+        scanner.scan(io.StringIO(json.dumps(dictionary) + "{}"))
+
+
+@pytest.mark.parametrize(
+    "file_", sorted(glob(path.join("tests", "file_read", "test_files", "*.csdfe")))
+)
+def test_scan_test_files(file_):
+    with pytest.raises(Exception) as error:
+        cp.load(file_)
+    with pytest.raises(error.type, match=str(error.value)[:30]):
+        cp.load(file_, stream=True)
+
+
+@pytest.mark.parametrize("encoding", ["base64", "none", "raw"])
+def test_load_metadata(encoding):
+    data = setup("<f8", encoding, indent=2)
+    data.description = 'An escaped \\" quote [with brackets] {and braces}'
+    data.y[1].description = "A second \\\\"
+    data.save("scanner_test.csdfe")
+    with open("scanner_test.csdfe") as f:
+        expected = json.load(f)
+    for dv in expected["csdm"]["dependent_variables"]:
+        dv.pop("components", None)
+
+    if encoding == "raw":
+        # the external files are not opened
+        remove("scanner_test_0.dat")
+    assert cp.load_metadata("scanner_test.csdfe") == expected
+    remove("scanner_test.csdf")
+    remove("scanner_test.csdfe")
+
+
+@pytest.mark.parametrize("read_size", [1, 2, 2**20])
+def test_scan_skip_components(read_size, monkeypatch):
+    monkeypatch.setattr(scanner, "READ_SIZE", read_size)
+    components = ['a\\"]b\\', [1, [2, "]"]], {"c": "}"}]
+    dv = {"components": components, "name": "x"}
+    string = json.dumps({"csdm": {"dependent_variables": [dv, {"name": "y"}]}})
+
+    dictionary = scanner.scan(io.StringIO(string), components=False)
+    dvs = [{"name": "x"}, {"name": "y"}]
+    assert dictionary == {"csdm": {"dependent_variables": dvs}}
+    dictionary = scanner.scan(io.StringIO(string))
+    assert dictionary["csdm"]["dependent_variables"][0]["components"] == components
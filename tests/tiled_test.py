@@ -0,0 +1,110 @@
+import io
+from os import path
+from os import remove
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+from csdmpy.dependent_variable import tiled
+
+sections = [
+    (slice(None), slice(None), slice(None)),
+    (1, slice(2, 19, 3), slice(None)),
+    (slice(None), 7, slice(None, None, -2)),
+    (-1, slice(None), 11),
+    (0, slice(5, 5), 3),
+]
+
+
+@pytest.mark.parametrize("codec", [None, "zlib", "lzma"])
+@pytest.mark.parametrize("dtype", ["<u1", "<i4", "<c16"])
+def test_write_tiled(codec, dtype):
+    array = (np.arange(2 * 19 * 13) % 23).astype(dtype).reshape(2, 19, 13)
+    file = io.BytesIO()
+    tiled.write_tiled(array, file, [1, 8, 5], codec)
+    assert tiled.is_tiled(file.getbuffer())
+    file.seek(0)
+    assert tiled.is_tiled(file)
+    assert not tiled.is_tiled(io.BytesIO(array.tobytes()))
+
+    reader = tiled.TiledReader(file)
+    assert reader.shape == array.shape
+    assert reader.tiles == [1, 8, 5]
+    assert len(reader.offsets) == 2 * 3 * 3
+    assert np.array_equal(reader.read_array(dtype), array.ravel())
+    for section in sections:
+        assert np.array_equal(reader.region(dtype, section), array[section])
+
+
+def test_tiled_errors():
+    with pytest.raises(ValueError, match="is an invalid `tiles`"):
+        tiled.check_tiles([4, 0], 2)
+    with pytest.raises(ValueError, match="is an invalid `tiles`"):
+        tiled.check_tiles([4, 4, 4], 2)
+    assert tiled.check_tiles(4, 3) == [4, 4, 4]
+
+    data = cp.as_csdm(np.arange(10.0))
+    data.y[0].encoding = "raw"
+    with pytest.raises(ValueError, match="is an invalid `tiles`"):
+        data.save("tiled_test.csdfe", tiles=[2, 2])
+    assert not path.exists("tiled_test.csdfe")
+
+    with pytest.raises(ValueError, match="missing the tile index"):
+        tiled.TiledReader(io.BytesIO(tiled.MAGIC + bytes(100)))
+
+    file = io.BytesIO()
+    tiled.write_tiled(np.arange(10.0)[None], file, [1, 4])
+    with pytest.raises(ValueError, match="Expecting a dtype of 8 bytes"):
+        tiled.TiledReader(file).region(np.float32, (0, slice(None)))
+
+
+def setup(compression):
+    array = np.random.rand(2, 40, 30, 20).astype(np.float32)
+    data = cp.as_csdm(array, quantity_type="vector_2")
+    data.y[0].encoding = "raw"
+    data.save("tiled_test.csdfe", compression=compression, tiles=[8, 10, 16])
+    return data
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_tiled_external(compression, monkeypatch):
+    data = setup(compression)
+    components = data.y[0].components
+    dv = cp.load_metadata("tiled_test.csdfe")["csdm"]["dependent_variables"][0]
+    layout = {"layout": "tiled", "compression": compression}
+    assert dv["application"] == {"csdmpy": layout}
+    assert cp.load("tiled_test.csdfe", application=True).y[0].application is None
+    for mmap in [False, True]:
+        new = cp.load("tiled_test.csdfe", mmap=mmap)
+        assert np.array_equal(new.y[0].components, components)
+
+    # only the tiles intersected by the slice are read.
+    count = []
+    read = tiled.TiledReader.read
+
+    def spy(self, number):
+        count.append(number)
+        return read(self, number)
+
+    monkeypatch.setattr(tiled.TiledReader, "read", spy)
+    new = cp.load("tiled_test.csdfe", lazy=True)
+    # the grid of tiles is (2, 3, 3, 3), along the components and dimensions 2, 1,
+    # and 0.
+    for index, expected, tiles in [
+        ((slice(None), 4, 7), components[:, 7, 4], 2 * 3),
+        ((4, slice(None), 7), components[:, 7, :, 4], 2 * 3),
+        ((4, 7, slice(None)), components[:, :, 7, 4], 2 * 3),
+        ((slice(None), slice(None), 25), components[:, 25], 2 * 3 * 3),
+        ((slice(0, 8), slice(None, None, -3), 0), components[:, 0, ::-3, :8], 2 * 3),
+    ]:
+        count.clear()
+        assert np.array_equal(new[index].y[0].components, expected)
+        assert len(count) == tiles
+    assert new.y[0].subtype.is_lazy()
+
+    new = cp.load("tiled_test.csdfe", region={0: 3, 2: slice(10, 20)})
+    assert np.array_equal(new.y[0].components, components[:, 10:20, :, 3])
+
+    remove("tiled_test.csdfe")
+    remove("tiled_test_0.dat")
@@ -0,0 +1,148 @@
+import numpy as np
+import pytest
+
+import csdmpy as cp
+from csdmpy.dependent_variable import virtual
+
+# the components, of shape (p, N_2, N_1, N_0), split along dimension 1.
+FULL = np.random.rand(2, 3, 10, 4)
+RUNS = [(0, 4), (4, 7), (7, 10)]
+
+
+def setup(tmp_path, offsets=None, encoding="raw"):
+    files = []
+    for i, (start, stop) in enumerate(RUNS):
+        data = cp.as_csdm(FULL[:, :, start:stop], quantity_type="vector_2", unit="T")
+        data.dimensions[1] = cp.Dimension(
+            type="linear",
+            count=stop - start,
+            increment="2 s",
+            coordinates_offset=f"{2 * start if offsets is None else offsets[i]} s",
+            label="time",
+        )
+        data.y[0].encoding = encoding
+        files.append(str(tmp_path / f"virtual_test_{i}.csdfe"))
+        data.save(files[-1])
+    return files
+
+
+def test_open_virtual(tmp_path):
+    files = setup(tmp_path)
+    data = cp.open_virtual(files, dimension=1)
+    assert data.x[1].type == "linear"
+    assert data.x[1].count == 10
+    assert data.x[1].label == "time"
+    assert np.allclose(data.x[1].coordinates.value, np.arange(10) * 2)
+    assert data.y[0].unit == cp.ScalarQuantity("T").quantity.unit
+    assert data.y[0].subtype.is_lazy()
+
+    for index in [
+        (slice(None), slice(2, 9, 3)),
+        (1, slice(None, None, -1), 2),
+        (slice(None), 5),
+        (slice(None), -1, 0),
+        (slice(None), slice(5, 5)),
+    ]:
+        expected = FULL[(slice(None),) + tuple(reversed_index(index))]
+        assert np.allclose(data[index].y[0].components, expected)
+    assert data.y[0].subtype.is_lazy()
+    assert all(item.is_lazy() for item in data.y[0].subtype._array.parts)
+
+    assert np.allclose(data.y[0].components, FULL)
+
+
+def reversed_index(index):
+    index = tuple(index) + (slice(None),) * (3 - len(index))
+    return index[::-1]
+
+
+def test_virtual_reads(tmp_path, monkeypatch):
+    data = cp.open_virtual(setup(tmp_path), dimension=1)
+    reads = []
+    read = virtual.VirtualComponents.read
+
+    def spy(self, i, section):
+        reads.append(i)
+        return read(self, i, section)
+
+    monkeypatch.setattr(virtual.VirtualComponents, "read", spy)
+    # only the files spanned by the slice are read.
+    assert np.allclose(data[:, 5].y[0].components, FULL[:, :, 5])
+    assert reads == [1]
+    reads.clear()
+    assert np.allclose(data[0, 3:8].y[0].components, FULL[:, :, 3:8, 0])
+    assert reads == [0, 1, 2]
+
+
+@pytest.mark.parametrize("func", [np.sum, np.prod, np.max, np.min, np.mean])
+def test_virtual_reductions(tmp_path, func):
+    data = cp.open_virtual(setup(tmp_path), dimension=1)
+    for axis in [0, 1, (1, 2)]:
+        new = func(data, axis=axis)
+        axes = [-1 - item for item in np.atleast_1d(axis)]
+        assert np.allclose(new.y[0].components, func(FULL, axis=tuple(axes)))
+    assert np.allclose(func(data).value, func(FULL))
+    assert data.y[0].subtype.is_lazy()
+
+    # the other reductions read the components.
+    assert np.allclose(np.var(data, axis=1).y[0].components, np.var(FULL, axis=-2))
+
+
+def test_virtual_complex_fft(tmp_path):
+    files = []
+    for i in range(2):
+        data = cp.as_csdm(np.arange(4.0) + 4 * i)
+        data.dimensions[0] = cp.Dimension(
+            type="linear", count=4, increment="1 Hz", complex_fft=True
+        )
+        data.x[0].coordinates_offset = f"{4 * i} Hz"
+        files.append(str(tmp_path / f"virtual_fft_{i}.csdf"))
+        data.save(files[-1])
+
+    data = cp.open_virtual(files, dimension=0)
+    assert data.x[0].type == "linear"
+    assert not data.x[0].complex_fft
+    assert np.allclose(data.x[0].coordinates.value, np.arange(-2, 6))
+    assert np.allclose(data.y[0].components, [np.arange(8.0)])
+
+
+def test_virtual_monotonic_labeled(tmp_path):
+    # the spacing does not continue across the files.
+    data = cp.open_virtual(setup(tmp_path, offsets=[0, 100, 200]), dimension=1)
+    assert data.x[1].type == "monotonic"
+    expected = [0, 2, 4, 6, 100, 102, 104, 200, 202, 204]
+    assert np.allclose(data.x[1].coordinates.to("s").value, expected)
+    assert np.allclose(data[:, 4:6].y[0].components, FULL[:, :, 4:6])
+
+    with pytest.raises(ValueError, match="not strictly monotonic"):
+        cp.open_virtual(setup(tmp_path, offsets=[0, 4, 0]), dimension=1)
+
+    files = []
+    for i, labels in enumerate([["a", "b"], ["c"]]):
+        data = cp.CSDM(
+            dimensions=[cp.Dimension(type="labeled", labels=labels)],
+            dependent_variables=[
+                cp.as_dependent_variable(np.arange(len(labels), dtype=float) + i)
+            ],
+        )
+        files.append(str(tmp_path / f"virtual_labeled_{i}.csdf"))
+        data.save(files[-1])
+    data = cp.open_virtual(files, dimension=0)
+    assert data.x[0].labels.tolist() == ["a", "b", "c"]
+    assert np.allclose(data.y[0].components, [[0, 1, 1]])
+
+
+def test_virtual_errors(tmp_path):
+    files = setup(tmp_path)
+    with pytest.raises(ValueError, match="at least one file"):
+        cp.open_virtual([], dimension=0)
+    with pytest.raises(IndexError, match="out of range"):
+        cp.open_virtual(files, dimension=3)
+    with pytest.raises(ValueError, match="dimension at index 1 of"):
+        cp.open_virtual(files, dimension=0)
+
+    other = cp.as_csdm(FULL[:, :, :3].astype(np.float32), quantity_type="vector_2")
+    other.dimensions[1] = cp.Dimension(type="linear", count=3, increment="2 s")
+    other.save(str(tmp_path / "other.csdf"))
+    with pytest.raises(ValueError, match="`numeric_type` of the dependent variable"):
+        cp.open_virtual(files + [str(tmp_path / "other.csdf")], dimension=1)
@@ -0,0 +1,126 @@
+import warnings
+from os import path
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+from csdmpy.dependent_variable import external
+
+
+def setup(tmp_path, dimension=None):
+    dims = [cp.Dimension(type="linear", count=4, increment="1 Hz")]
+    dims += [dimension or cp.Dimension(type="linear", count=2, increment="1 s")]
+    dvs = [
+        cp.as_dependent_variable(np.arange(8, dtype=np.float32), unit="T"),
+        cp.as_dependent_variable(np.arange(8) * (1 + 1j)),
+    ]
+    data = cp.CSDM(dimensions=dims, dependent_variables=dvs)
+    return data, str(tmp_path / "writer_test.csdfe")
+
+
+def test_append(tmp_path):
+    data, filename = setup(tmp_path)
+    with cp.AppendWriter(filename, data, flush_interval=3600) as writer:
+        assert writer.append([np.full(4, 8), np.full(4, 8j)]) == 3
+        # the header is flushed at most every flush_interval seconds.
+        assert cp.load(filename).x[1].count == 2
+        assert writer.append([np.full((2, 4), 9), np.full((2, 4), 9j)]) == 5
+        writer.flush()
+        assert cp.load(filename).x[1].count == 5
+    # the encoding of the CSDM object is unchanged.
+    assert data.y[0].encoding == "base64"
+
+    new = cp.load(filename)
+    assert new.x[1].count == 5
+    expected = np.concatenate([data.y[0].components[0], np.full((1, 4), 8)])
+    expected = np.concatenate([expected, np.full((2, 4), 9)])
+    assert np.array_equal(new.y[0].components[0], expected)
+    assert new.y[1].components.dtype == np.complex128
+    assert np.array_equal(new.y[1].components[0, 2:], 1j * expected[2:])
+
+    # the slices are appended to an existing dataset.
+    with cp.AppendWriter(filename) as writer:
+        writer.append([np.zeros(4), np.zeros(4)])
+    new = cp.load(filename)
+    assert new.x[1].count == 6
+    assert path.getsize(str(tmp_path / "writer_test_0.dat")) == 6 * 4 * 4
+
+
+def test_append_concurrent_load(tmp_path, monkeypatch):
+    data, filename = setup(tmp_path)
+    with cp.AppendWriter(filename, data, flush_interval=3600) as writer:
+        # the slices exceed the write buffer of the binary files.
+        writer.append([np.full((4096, 4), 8), np.full((4096, 4), 8j)])
+        # the binary files are larger than the grid of the header.
+        assert path.getsize(str(tmp_path / "writer_test_0.dat")) > 2 * 4 * 4
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            new = cp.load(filename)
+            assert np.array_equal(new.y[0].components, data.y[0].components)
+            new = cp.load(filename, mmap=True)
+            assert np.array_equal(new.y[1].components, data.y[1].components)
+
+            # only the bytes of the region are read.
+            def decode(*args):
+                raise AssertionError("full decode")
+
+            monkeypatch.setattr(external.ExternalDataset, "_decode", decode)
+            new = cp.load(filename, region={1: 1})
+            assert np.array_equal(new.y[0].components, data.y[0].components[:, 1])
+
+
+def test_append_crash(tmp_path):
+    data, filename = setup(tmp_path)
+    writer = cp.AppendWriter(filename, data, flush_interval=3600)
+    writer.append([np.ones(4), np.ones(4)])
+    writer.flush()
+    writer.append([np.ones((3, 4)), np.ones((3, 4))])
+    for file in writer.files:
+        file.flush()
+    # the slices after the last flush of the header are discarded on open.
+    assert path.getsize(str(tmp_path / "writer_test_0.dat")) == 6 * 4 * 4
+    with cp.AppendWriter(filename) as writer:
+        assert writer.count == 3
+    assert path.getsize(str(tmp_path / "writer_test_0.dat")) == 3 * 4 * 4
+    assert cp.load(filename).x[1].count == 3
+
+
+def test_append_monotonic_labeled(tmp_path):
+    dimension = cp.Dimension(type="monotonic", coordinates=["1 s", "2 s"])
+    data, filename = setup(tmp_path, dimension)
+    with cp.AppendWriter(filename, data) as writer:
+        writer.append([np.ones((2, 4)), np.ones((2, 4))], coordinates=[4, 8])
+        writer.append([np.ones(4), np.ones(4)], coordinates=["16000 ms"])
+        with pytest.raises(ValueError, match="Expecting 1 coordinates"):
+            writer.append([np.ones(4), np.ones(4)])
+    new = cp.load(filename)
+    assert np.allclose(new.x[1].coordinates.to("s").value, [1, 2, 4, 8, 16])
+
+    data, filename = setup(tmp_path, cp.Dimension(type="labeled", labels=["a", "b"]))
+    with cp.AppendWriter(filename, data) as writer:
+        writer.append([np.ones(4), np.ones(4)], labels=["c"])
+    assert cp.load(filename).x[1].labels.tolist() == ["a", "b", "c"]
+
+
+def test_append_errors(tmp_path):
+    data, filename = setup(tmp_path)
+    with cp.AppendWriter(filename, data) as writer:
+        with pytest.raises(ValueError, match="Expecting the components of 2"):
+            writer.append(np.ones(4))
+        with pytest.raises(ValueError, match="with a multiple of 4 points"):
+            writer.append([np.ones(5), np.ones(5)])
+
+    data.save(filename)
+    with pytest.raises(ValueError, match="an `external` dependent variable"):
+        cp.AppendWriter(filename)
+
+    vector = cp.as_csdm(np.ones((2, 4, 3)), quantity_type="vector_2")
+    with pytest.raises(ValueError, match="with a single component"):
+        cp.AppendWriter(filename, vector)
+
+    data.y[0].encoding = "raw"
+    data.y[1].encoding = "raw"
+    data.save(filename, compression="zlib")
+    with pytest.raises(ValueError, match="Appending to the chunked or tiled"):
+        cp.AppendWriter(filename)